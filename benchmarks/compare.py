@@ -0,0 +1,74 @@
+from argparse import ArgumentParser, Namespace
+from json import load
+from sys import exit
+from typing import Any, Dict, List, Tuple
+
+from utils.cli.constants import BenchmarkHelpMessage
+
+
+def load_results(results_filepath: str) -> Dict[str, Dict[str, Any]]:
+    with open(results_filepath, mode="r", encoding="utf-8") as results_file:
+        results: Dict[str, Dict[str, Any]] = load(results_file)["results"]
+    return results
+
+
+# A benchmark regresses when the candidate takes more than (1 + threshold) times as long as the baseline,
+#   and improves when it takes less than (1 - threshold) times as long.
+def compare_results(baseline_results: Dict[str, Dict[str, Any]], candidate_results: Dict[str, Dict[str, Any]],
+                    threshold: float) -> List[Tuple[str, str, str]]:
+    comparisons: List[Tuple[str, str, str]] = []
+    for benchmark_name in sorted(set(baseline_results) | set(candidate_results)):
+        if benchmark_name not in candidate_results:
+            comparisons.append((benchmark_name, "MISSING", "only in the baseline"))
+            continue
+        elif benchmark_name not in baseline_results:
+            comparisons.append((benchmark_name, "NEW", "only in the candidate"))
+            continue
+
+        baseline_result: Dict[str, Any] = baseline_results[benchmark_name]
+        candidate_result: Dict[str, Any] = candidate_results[benchmark_name]
+        if "error" in candidate_result:
+            # Benchmarks that already failed in the baseline are reported, but are not counted against the candidate.
+            comparisons.append(
+                (benchmark_name, "BROKEN" if "error" in baseline_result else "ERROR", candidate_result["error"])
+            )
+            continue
+        elif "error" in baseline_result:
+            comparisons.append((benchmark_name, "FIXED", f"{candidate_result['seconds']:.4f}s"))
+            continue
+
+        ratio: float = candidate_result["seconds"] / baseline_result["seconds"] \
+            if baseline_result["seconds"] > 0 else 1.0
+        if ratio > 1 + threshold:
+            status: str = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "IMPROVEMENT"
+        else:
+            status = "UNCHANGED"
+        comparisons.append(
+            (benchmark_name, status,
+             f"{baseline_result['seconds']:.4f}s -> {candidate_result['seconds']:.4f}s ({ratio:.2f}x)")
+        )
+    return comparisons
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("baseline", type=str, help=BenchmarkHelpMessage.BASELINE.value)
+    parser.add_argument("candidate", type=str, help=BenchmarkHelpMessage.CANDIDATE.value)
+    parser.add_argument("--threshold", type=float, default=0.15, help=BenchmarkHelpMessage.THRESHOLD.value)
+    args: Namespace = parser.parse_args()
+
+    if args.threshold < 0:
+        raise ValueError("An invalid threshold was supplied. Please supply a value of at least 0.")
+
+    benchmark_comparisons: List[Tuple[str, str, str]] = compare_results(
+        load_results(args.baseline), load_results(args.candidate), args.threshold
+    )
+    name_width: int = max((len(benchmark_name) for benchmark_name, _, _ in benchmark_comparisons), default=0)
+    for benchmark_name, benchmark_status, benchmark_detail in benchmark_comparisons:
+        print(f"{benchmark_name:<{name_width}}  {benchmark_status:<11}  {benchmark_detail}")
+
+    # A nonzero exit status signals that at least one benchmark regressed or started to fail.
+    if any(benchmark_status in ("REGRESSION", "ERROR") for _, benchmark_status, _ in benchmark_comparisons):
+        exit(1)
@@ -0,0 +1,170 @@
+from random import Random
+from typing import Callable, Dict, List, Tuple
+
+
+WORDS: List[str] = [
+    "the", "a", "of", "and", "to", "in", "bed", "legs", "stretch", "guest", "iron", "host", "road", "Attica",
+    "Procrustes", "Theseus", "travellers", "measured", "length", "fit", "cut", "short", "long", "night", "don't",
+    "wasn't", "he's", "it's", "e.g.", "U.S.", "co-operate", "well-known", "12", "3.5", "1,000"
+]
+PUNCTUATION: List[str] = [",", ".", ";", ":", "!", "?"]
+QUOTES: List[Tuple[str, str]] = [('"', '"'), ("'", "'"), ("«", "»"), ("“", "”")]
+
+# The kinds of noise that a revised target commonly differs from its source by.
+PUNCTUATION_SWAPS: Dict[str, List[str]] = {
+    ",": [";", ":", ""], ".": ["!", ";", ""], ";": [",", "."], ":": [",", ";"], "!": ["."], "?": ["."],
+    "-": ["–", ""]
+}
+QUOTE_ENCODINGS: Dict[str, List[str]] = {
+    '"': ["“", "”", "``", "''", "&quot;"], "'": ["’", "‘", "`"], "«": ['"', "<<", "“"],
+    "»": ['"', ">>", "”"], "“": ['"', "``"], "”": ['"', "''"]
+}
+WHITESPACE_CHANGES: List[str] = [" ", "  ", "\t", " \u00a0 "]
+
+PHRASE_LABELS: List[str] = ["NP", "VP", "PP", "ADJP", "SBAR"]
+TAG_LABELS: List[str] = ["DT", "NN", "NNS", "NNP", "VB", "VBD", "IN", "JJ", "RB", "CD", "PRP"]
+XML_TAGS: List[str] = ["p", "s", "hi", "name", "note"]
+
+
+def generate_sentence(random: Random, length: int) -> List[str]:
+    tokens: List[str] = []
+    while len(" ".join(tokens)) < length:
+        token: str = random.choice(WORDS)
+        if random.random() < 0.1:
+            opening_quote, closing_quote = random.choice(QUOTES)
+            token = f"{opening_quote}{token}{closing_quote}"
+        if random.random() < 0.15:
+            token += random.choice(PUNCTUATION)
+        tokens.append(token)
+    return tokens
+
+
+def split_token(token: str, random: Random) -> str:
+    # Clitics and punctuation are split off as a tokenizer would; other tokens are split at random.
+    if "'" in token[1:]:
+        clitic_index: int = token.index("'", 1)
+        return f"{token[:clitic_index]} {token[clitic_index:]}"
+    elif len(token) > 1 and not token[-1].isalnum():
+        return f"{token[:-1]} {token[-1]}"
+    elif len(token) > 3:
+        split_index: int = random.randrange(1, len(token) - 1)
+        return f"{token[:split_index]} {token[split_index:]}"
+    return token
+
+
+def swap_punctuation(token: str, random: Random) -> str:
+    return "".join(
+        random.choice(PUNCTUATION_SWAPS[character]) if character in PUNCTUATION_SWAPS else character
+        for character in token
+    )
+
+
+def encode_quotes(token: str, random: Random) -> str:
+    return "".join(
+        random.choice(QUOTE_ENCODINGS[character]) if character in QUOTE_ENCODINGS else character
+        for character in token
+    )
+
+
+def change_whitespace(token: str, random: Random) -> str:
+    return f"{random.choice(WHITESPACE_CHANGES)}{token}{random.choice(WHITESPACE_CHANGES)}"
+
+
+NOISE_FUNCTIONS: Dict[str, Callable] = {
+    "punctuation": swap_punctuation,
+    "quotes": encode_quotes,
+    "tokenization": split_token,
+    "whitespace": change_whitespace
+}
+
+
+# Each token is changed with probability noise_level, by one of the noise functions chosen at random.
+def add_noise(text: str, noise_level: float, random: Random) -> str:
+    noise_names: List[str] = sorted(NOISE_FUNCTIONS)
+    noisy_tokens: List[str] = []
+    for token in text.split(" "):
+        if random.random() < noise_level:
+            token = NOISE_FUNCTIONS[random.choice(noise_names)](token, random)
+        noisy_tokens.append(token)
+    return " ".join(noisy_tokens)
+
+
+def generate_word_pair(random: Random, line_length: int, noise_level: float) -> Tuple[str, str]:
+    source_words: List[str] = generate_sentence(random, line_length)
+    other_words: List[str] = generate_sentence(random, line_length)
+    links: List[str] = sorted(
+        {f"{random.randrange(len(source_words))}-{random.randrange(len(other_words))}"
+         for _ in range(len(source_words))}
+    )
+    source_line: str = f"{' '.join(source_words)}\t{' '.join(other_words)}\t{' '.join(links)}"
+    return source_line, add_noise(" ".join(source_words), noise_level, random)
+
+
+def escape_xml(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def generate_xml_element(random: Random, line_length: int, depth: int) -> Tuple[str, str]:
+    # Both the markup and the plain text it contains are returned, since the latter is what the target revises.
+    tag: str = random.choice(XML_TAGS)
+    text: str = " ".join(generate_sentence(random, max(1, line_length // 4)))
+    markup_parts: List[str] = [f'<{tag} n="{random.randrange(100)}">{escape_xml(text)}']
+    text_parts: List[str] = [text]
+    while depth > 0 and sum(len(part) for part in text_parts) < line_length:
+        child_markup, child_text = generate_xml_element(random, line_length // 2, depth - 1)
+        tail: str = " ".join(generate_sentence(random, max(1, line_length // 8)))
+        markup_parts.append(f" {child_markup} {escape_xml(tail)}")
+        text_parts.append(f" {child_text} {tail}")
+    markup_parts.append(f"</{tag}>")
+    return "".join(markup_parts), "".join(text_parts)
+
+
+def generate_xml_pair(random: Random, line_length: int, noise_level: float) -> Tuple[str, str]:
+    markup, text = generate_xml_element(random, line_length, 2)
+    return f"<doc>{markup}</doc>", add_noise(text, noise_level, random)
+
+
+def generate_tree(random: Random, leaves: List[str], depth: int) -> str:
+    if depth == 0 or len(leaves) == 1:
+        return " ".join(f"({random.choice(TAG_LABELS)} {leaf})" for leaf in leaves)
+
+    split_index: int = random.randrange(1, len(leaves))
+    return f"({random.choice(PHRASE_LABELS)} {generate_tree(random, leaves[:split_index], depth - 1)}) " \
+           f"{generate_tree(random, leaves[split_index:], depth - 1)}"
+
+
+def generate_tree_pair(random: Random, line_length: int, noise_level: float) -> Tuple[str, str]:
+    leaves: List[str] = generate_sentence(random, line_length)
+    return f"(ROOT (S {generate_tree(random, leaves, 4)}))", add_noise(" ".join(leaves), noise_level, random)
+
+
+CORPUS_GENERATORS: Dict[str, Callable] = {
+    "tree": generate_tree_pair,
+    "word": generate_word_pair,
+    "xml": generate_xml_pair
+}
+
+
+def get_corpus_generator(mode_name: str) -> Callable:
+    try:
+        corpus_generator: Callable = CORPUS_GENERATORS[mode_name]
+    except KeyError:
+        raise ValueError(f"The mode <{mode_name}> has no corpus generator.")
+    return corpus_generator
+
+
+# With the file zipper, XML documents are wrapped in a single root and each file holds one pair.
+def write_corpus(source_filepath: str, target_filepath: str, mode_name: str, zipper_name: str, pair_count: int,
+                 line_length: int, noise_level: float, seed: int):
+    random: Random = Random(seed)
+    corpus_generator: Callable = get_corpus_generator(mode_name)
+    pairs: List[Tuple[str, str]] = [corpus_generator(random, line_length, noise_level) for _ in range(pair_count)]
+    with open(source_filepath, mode="w", encoding="utf-8") as source_file, \
+            open(target_filepath, mode="w", encoding="utf-8") as target_file:
+        if zipper_name == "file":
+            source_file.write("<corpus>\n" + "\n".join(source_line for source_line, _ in pairs) + "\n</corpus>\n")
+            target_file.write("\n".join(target_line for _, target_line in pairs) + "\n")
+        else:
+            for source_line, target_line in pairs:
+                source_file.write(f"{source_line}\n")
+                target_file.write(f"{target_line}\n")
@@ -0,0 +1,230 @@
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from json import dump
+from os import path
+from platform import platform, python_version
+from subprocess import CalledProcessError, check_output
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple, Type, Union
+
+from numpy import __version__ as numpy_version
+from numpy.typing import NDArray
+
+from benchmarks.corpora import write_corpus
+from procrustes import align_files, get_alignment_type, get_entry_size
+from utils.algorithms.batched_edit_distance import DEFAULT_BUCKET_WIDTH
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.cost_functions import get_cost_function
+from utils.algorithms.options.engines import get_engine
+from utils.algorithms.wavefront_edit_distance import calculate_wavefront_edit_distance
+from utils.algorithms.wf_edit_distance import calculate_minimum_edit_distance, collect_alignment_path
+from utils.cli.constants import BenchmarkHelpMessage
+from utils.incremental.previous_run import describe_settings
+from utils.modes.alignment import Alignment
+from utils.zipping.interface import get_zip_function
+
+
+# The debug cost function prints every move it is asked about, so it is left out by default.
+DEFAULT_COST_FUNCTIONS: List[str] = ["dual", "lcs", "levenshtein", "procrustes-levenshtein"]
+STAGES: List[str] = ["edit_distance", "alignment_path", "projection", "align_files"]
+
+
+class BenchmarkCase:
+    """ A synthetic corpus of one mode, read with one zipper, and the number and length of its pairs. """
+    def __init__(self, mode_name: str, zipper_name: str, pair_count: int, line_length: int):
+        self.mode_name: str = mode_name
+        self.zipper_name: str = zipper_name
+        self.pair_count: int = pair_count
+        self.line_length: int = line_length
+
+    @property
+    def name(self) -> str:
+        return f"{self.mode_name}-{self.zipper_name}"
+
+
+# Whole-file pairs are kept small, since the edit distance stage fills their chart one cell at a time.
+BENCHMARK_CASES: Dict[str, BenchmarkCase] = {
+    benchmark_case.name: benchmark_case for benchmark_case in [
+        BenchmarkCase("tree", "line", 200, 80),
+        BenchmarkCase("word", "line", 200, 80),
+        BenchmarkCase("xml", "file", 2, 80),
+        BenchmarkCase("xml", "line", 200, 80)
+    ]
+}
+
+
+def get_benchmark_case(case_name: str) -> BenchmarkCase:
+    try:
+        benchmark_case: BenchmarkCase = BENCHMARK_CASES[case_name]
+    except KeyError:
+        raise ValueError(f"The benchmark case <{case_name}> is not recognized.")
+    return benchmark_case
+
+
+def time_repeatedly(function: Callable, repeats: int) -> Tuple[List[float], Any]:
+    timings: List[float] = []
+    result: Any = None
+    for _ in range(repeats):
+        start_time: float = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start_time)
+    return timings, result
+
+
+def get_revision() -> Union[str, None]:
+    try:
+        revision: Union[str, None] = check_output(
+            ["git", "rev-parse", "HEAD"], cwd=path.dirname(path.abspath(__file__)), text=True
+        ).strip()
+    except (CalledProcessError, FileNotFoundError):
+        revision = None
+    return revision
+
+
+# Since the original (sequential) edit distance fills its chart one cell at a time, it is only timed on the first
+#   sample_size pairs of the corpus. Paths are collected from (and projected with) the same charts as the wavefront
+#   engine fills for every pair, and the last stage runs the whole corpus through align_files with the default engine.
+def run_benchmark_case(benchmark_case: BenchmarkCase, cost_function_name: str, corpus_directory: str,
+                       sample_size: int, repeats: int) -> Dict[str, List[float]]:
+    alignment_type: Type[Alignment] = get_alignment_type(benchmark_case.mode_name)
+    alignment_kwargs: Dict[str, Any] = {"is_flipped": False, "segmentation_function": None}
+    zip_function: Callable = get_zip_function(benchmark_case.zipper_name)
+    cost_function, data_type = get_cost_function(cost_function_name)
+    source_filepath: str = path.join(corpus_directory, f"{benchmark_case.name}.source")
+    target_filepath: str = path.join(corpus_directory, f"{benchmark_case.name}.target")
+
+    with open(source_filepath, mode="r", encoding="utf-8") as source_file, \
+            open(target_filepath, mode="r", encoding="utf-8") as target_file:
+        line_pairs: List[Tuple[str, str]] = list(zip_function(source_file, target_file))
+    source_texts: List[str] = [
+        "".join(alignment_type(source_line, **alignment_kwargs).get_characters())   # type: ignore
+        for source_line, _ in line_pairs
+    ]
+    target_texts: List[str] = [" ".join(target_line.split()) for _, target_line in line_pairs]
+    data_types: List[str] = [
+        data_type + get_entry_size(data_type, source_text, target_text)
+        for source_text, target_text in zip(source_texts, target_texts)
+    ]
+
+    def fill_charts() -> List[Tuple[NDArray[float], NDArray[int]]]:
+        return [
+            calculate_minimum_edit_distance(source_text, target_text, cost_function, full_data_type)
+            for source_text, target_text, full_data_type in
+            zip(source_texts[:sample_size], target_texts[:sample_size], data_types[:sample_size])
+        ]
+
+    def collect_paths() -> List[AlignmentPath]:
+        return [collect_alignment_path(chart, pointer_table) for chart, pointer_table in charts]
+
+    def project_lines() -> List[str]:
+        projections: List[str] = []
+        for (source_line, _), target_text, alignment_path in zip(line_pairs, target_texts, alignment_paths):
+            source_label: Alignment = alignment_type(source_line, **alignment_kwargs)   # type: ignore
+            source_label.project(target_text, alignment_path)
+            projections.append(f"{source_label}")
+        return projections
+
+    def align_corpus() -> Any:
+        alignment_engine: Callable = get_engine("auto")
+        return align_files(
+            source_filepath, target_filepath, path.join(corpus_directory, f"{benchmark_case.name}.output"),
+            alignment_type, alignment_kwargs, batch_size=0, bucket_width=DEFAULT_BUCKET_WIDTH, cache=None,
+            cost_function=cost_function, data_type=data_type, engine=alignment_engine, previous_runs=None,
+            profile=False, settings=describe_settings(
+                alignment_type, alignment_kwargs, cost_function, alignment_engine, zip_function
+            ), statistics=False, stream=False, verbose=False, word_streams=None, write_index=False,
+            zipper=zip_function
+        )
+
+    stage_timings: Dict[str, List[float]] = {}
+    stage_timings["edit_distance"], _ = time_repeatedly(fill_charts, repeats)
+    charts: List[Tuple[NDArray[float], NDArray[int]]] = [
+        calculate_wavefront_edit_distance(source_text, target_text, cost_function, full_data_type)
+        for source_text, target_text, full_data_type in zip(source_texts, target_texts, data_types)
+    ]
+    stage_timings["alignment_path"], alignment_paths = time_repeatedly(collect_paths, repeats)
+    stage_timings["projection"], _ = time_repeatedly(project_lines, repeats)
+    stage_timings["align_files"], _ = time_repeatedly(align_corpus, repeats)
+    return stage_timings
+
+
+# Each benchmark records the fastest of its timings, which is the least affected by other activity on the machine,
+#   along with all of them. A case that fails is recorded with its error rather than stopping the run.
+def run_benchmarks(case_names: List[str], cost_function_names: List[str], noise_level: float, sample_size: int,
+                   repeats: int, seed: int) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    with TemporaryDirectory() as corpus_directory:
+        for case_name in case_names:
+            benchmark_case: BenchmarkCase = get_benchmark_case(case_name)
+            write_corpus(
+                path.join(corpus_directory, f"{case_name}.source"), path.join(corpus_directory, f"{case_name}.target"),
+                benchmark_case.mode_name, benchmark_case.zipper_name, benchmark_case.pair_count,
+                benchmark_case.line_length, noise_level, seed
+            )
+            for cost_function_name in cost_function_names:
+                try:
+                    stage_timings: Dict[str, List[float]] = run_benchmark_case(
+                        benchmark_case, cost_function_name, corpus_directory, sample_size, repeats
+                    )
+                except Exception as error:
+                    for stage in STAGES:
+                        results[f"{case_name}/{cost_function_name}/{stage}"] = {
+                            "error": f"{type(error).__name__}: {error}"
+                        }
+                    continue
+
+                for stage in STAGES:
+                    results[f"{case_name}/{cost_function_name}/{stage}"] = {
+                        "seconds": min(stage_timings[stage]),
+                        "timings": stage_timings[stage]
+                    }
+
+    return {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "revision": get_revision(),
+            "platform": platform(),
+            "python": python_version(),
+            "numpy": numpy_version,
+            "settings": {
+                "cases": case_names,
+                "cost_functions": cost_function_names,
+                "noise_level": noise_level,
+                "sample_size": sample_size,
+                "repeats": repeats,
+                "seed": seed
+            }
+        },
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("output", type=str, help=BenchmarkHelpMessage.OUTPUT.value)
+    parser.add_argument(
+        "--cases", type=str, nargs="+", default=sorted(BENCHMARK_CASES), help=BenchmarkHelpMessage.CASES.value
+    )
+    parser.add_argument(
+        "--cost-functions", type=str, nargs="+", default=DEFAULT_COST_FUNCTIONS,
+        help=BenchmarkHelpMessage.COST_FUNCTIONS.value
+    )
+    parser.add_argument("--noise", type=float, default=0.2, help=BenchmarkHelpMessage.NOISE.value)
+    parser.add_argument("--repeats", type=int, default=5, help=BenchmarkHelpMessage.REPEATS.value)
+    parser.add_argument("--sample-size", type=int, default=10, help=BenchmarkHelpMessage.SAMPLE_SIZE.value)
+    parser.add_argument("--seed", type=int, default=0, help=BenchmarkHelpMessage.SEED.value)
+    args: Namespace = parser.parse_args()
+
+    if args.repeats < 1:
+        raise ValueError("An invalid number of repeats was supplied. Please supply a value greater than 0.")
+    elif args.sample_size < 1:
+        raise ValueError("An invalid sample size was supplied. Please supply a value greater than 0.")
+    elif not 0 <= args.noise <= 1:
+        raise ValueError("An invalid noise level was supplied. Please supply a value between 0 and 1.")
+
+    benchmark_results: Dict[str, Any] = run_benchmarks(
+        args.cases, args.cost_functions, args.noise, args.sample_size, args.repeats, args.seed
+    )
+    with open(args.output, mode="w", encoding="utf-8") as results_file:
+        dump(benchmark_results, results_file, indent=2)
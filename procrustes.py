@@ -1,25 +1,49 @@
 #!/usr/bin/env python
 
 from argparse import ArgumentParser, Namespace
+from collections import Counter, deque
+from contextlib import ExitStack
 from functools import partial
+from json import dump
 from os import listdir, path
-from multiprocessing import Pool
-from sys import stderr
-from typing import Any, Callable, Dict, List, TextIO, Tuple, Type, Union
+from multiprocessing.pool import AsyncResult, Pool
+from sys import stderr, stdout
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple, Type, Union
 
 from natsort import natsorted
 from numpy import finfo, iinfo
 
+from utils.algorithms.alignment_cache import AlignmentCache
+from utils.algorithms.anchored_alignment import DEFAULT_ANCHOR_LENGTH
+from utils.algorithms.batched_edit_distance import DEFAULT_BUCKET_WIDTH, MAX_BATCHED_CHART_AREA, align_batch, \
+    bucket_pairs
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
 from utils.algorithms.data_structures.exceptions import EditFailure
-from utils.algorithms.options.cost_functions import ENTRY_SIZES, get_cost_function
-from utils.algorithms.wf_edit_distance import calculate_minimum_edit_distance, collect_alignment_path
+from utils.algorithms.fast_paths import FAST_PATHS, align_with_fast_paths, complete_trimmed_path, \
+    create_identity_path, measure_common_ends
+from utils.algorithms.options.cost_functions import ENTRY_SIZES, compile_cost_model, get_cost_function
+from utils.algorithms.options.engines import ENGINES, configure_engine, get_engine
+from utils.algorithms.planner import parse_memory_size
+from utils.algorithms.windowed_alignment import DEFAULT_WINDOW_LENGTH
 from utils.cli.constants import HelpMessage
+from utils.incremental.previous_run import INDEX_SUFFIX, PreviousRun, ProjectionIndex, describe_settings, \
+    merge_chunk_results
 from utils.modes.alignment import Alignment
 from utils.modes.tree import TreeAlignment
 from utils.modes.word import WordAlignment
 from utils.modes.xml import XMLAlignment
+from utils.profiling.phase_profiler import PhaseProfiler, activate_profiler, measure_iteration, measure_phase
 from utils.segmentation.interface import get_segmentation_function
-from utils.zipping.interface import get_zip_function
+from utils.streaming.xml_stream import project_xml_stream
+from utils.zipping.interface import get_zip_function, zip_by_file, zip_word_streams
+
+
+# By default, the on-disk alignment cache is trimmed back to this size.
+DEFAULT_CACHE_SIZE: str = "1G"
+
+# When files are split into chunks, each worker has at most this many chunks waiting for it (or for the writer).
+PENDING_CHUNKS_PER_PROCESS: int = 2
 
 
 def get_alignment_type(alignment_name: str) -> Type[Alignment]:
@@ -43,48 +67,488 @@ def gather_filepaths(directory_path: str, file_iterator_path: str) -> List[str]:
     return filepaths
 
 
-def align_files(source_filepath: str, target_filepath: str, output_filepath: Union[str, None],
-                alignment_type: Type[Alignment], alignment_kwargs: Dict[str, Any], **kwargs):
-    source_file: TextIO = open(source_filepath, mode="r", encoding="utf-8")
-    target_file: TextIO = open(target_filepath, mode="r", encoding="utf-8")
-    output_file: TextIO = open(output_filepath, mode="w+", encoding="utf-8") if output_filepath is not None else None
+def project_line(source_label: Alignment, revised_target_line: str, line_alignment: AlignmentPath, **kwargs) -> str:
+    if kwargs["verbose"] is True:
+        print(f"SOURCE LABEL: {source_label}\n", file=stderr)
+        print(f"SOURCE LABEL CHARACTERS: {source_label.get_characters()}\n", file=stderr)
+        print(f"TARGET LINE: {revised_target_line}\n", file=stderr)
+        for source_index, target_index in line_alignment:
+            source_match: str = source_label.get_characters()[source_index]
+            target_match: str = revised_target_line[target_index]
+            print(f"[{source_match}]-[{target_match}]", file=stderr)
 
-    zip_function: Callable = kwargs["zipper"]
-    ed_cost_function: Callable = kwargs["cost_function"]
+    with measure_phase("projection"):
+        source_label.project(revised_target_line, line_alignment)
+        if source_label.get_characters() != revised_target_line:
+            raise EditFailure(f'{source_label.get_characters()} != {revised_target_line}')
+    with measure_phase("serialization"):
+        projection: str = f"{source_label}"
+    return projection
+
+
+# When profiling, each line also records the chart type it was given and the cost of the path that was found.
+def record_path_cost(source: Sequence[str], destination: str, line_alignment: AlignmentPath, full_data_type: str,
+                     line_statistics: Dict[str, Any], **kwargs):
+    line_statistics["data_type"] = full_data_type
+    line_statistics["edit_cost"] = compile_cost_model(
+        kwargs["cost_function"], source, destination, "float64"
+    ).measure_path_cost(source, destination, line_alignment)
+
+
+# Identical lines are never cached, since aligning them is cheaper than looking them up.
+def look_up_alignment(source: Sequence[str], destination: str, alignment_engine: Callable,
+                      line_statistics: Dict[str, Any], **kwargs) -> Tuple[Union[str, None], Union[AlignmentPath, None]]:
+    alignment_cache: Union[AlignmentCache, None] = kwargs["cache"]
+    if alignment_cache is None or "".join(source) == destination:
+        return None, None
+
+    cache_key: str = AlignmentCache.make_key(source, destination, kwargs["cost_function"], alignment_engine)
+    cached_alignment: Union[AlignmentPath, None] = alignment_cache.get(cache_key)
+    if cached_alignment is not None:
+        line_statistics["cache"] = "hit"
+        line_statistics["fast_path"] = "cached"
+    else:
+        line_statistics["cache"] = "miss"
+    return cache_key, cached_alignment
+
+
+# The pair is looked up in the cache (if any) before it goes through the fast paths and the engine.
+def align_text_pair(source: Sequence[str], destination: str, full_data_type: str, line_statistics: Dict[str, Any],
+                    **kwargs) -> AlignmentPath:
+    alignment_engine: Callable = kwargs["engine"]
+    cache_key, line_alignment = look_up_alignment(source, destination, alignment_engine, line_statistics, **kwargs)
+    if line_alignment is None:
+        with measure_phase("fill"):
+            line_alignment = align_with_fast_paths(
+                source, destination, kwargs["cost_function"], full_data_type, alignment_engine,
+                statistics=line_statistics
+            )
+        if cache_key is not None:
+            kwargs["cache"].put(cache_key, line_alignment)
+    return line_alignment
+
+
+def align_line(line_index: int, source_line: str, target_line: str, alignment_type: Type[Alignment],
+               alignment_kwargs: Dict[str, Any], **kwargs) -> Tuple[str, Dict[str, Any]]:
     data_type_base: str = kwargs["data_type"]
-    for line_index, (source_line, target_line) in enumerate(zip_function(source_file, target_file)):
+
+    with measure_phase("parsing"):
         source_label = alignment_type(source_line, **alignment_kwargs)   # type: ignore
-        revised_target_line: str = " ".join(target_line.split())
+    revised_target_line: str = " ".join(target_line.split())
 
-        data_type_size: str = get_entry_size(data_type_base, source_label.get_characters(), revised_target_line)
-        full_data_type: str = data_type_base + data_type_size
+    data_type_size: str = get_entry_size(data_type_base, source_label.get_characters(), revised_target_line)
+    full_data_type: str = data_type_base + data_type_size
 
-        d_table, pointer_table = calculate_minimum_edit_distance(
-            source_label.get_characters(), revised_target_line, ed_cost_function, full_data_type
+    line_statistics: Dict[str, Any] = {
+        "source_length": len(source_label.get_characters()),
+        "target_length": len(revised_target_line)
+    }
+    line_alignment: AlignmentPath = align_text_pair(
+        source_label.get_characters(), revised_target_line, full_data_type, line_statistics, **kwargs
+    )
+    if kwargs["profile"] is True:
+        record_path_cost(
+            source_label.get_characters(), revised_target_line, line_alignment, full_data_type, line_statistics,
+            **kwargs
         )
-        line_alignment: List[Tuple[int, int]] = collect_alignment_path(d_table, pointer_table)
+    return project_line(source_label, revised_target_line, line_alignment, **kwargs), line_statistics
 
-        if kwargs["verbose"] is True:
-            print(f"SOURCE LABEL: {source_label}\n", file=stderr)
-            print(f"SOURCE LABEL CHARACTERS: {source_label.get_characters()}\n", file=stderr)
-            print(f"TARGET LINE: {revised_target_line}\n", file=stderr)
-            for source_index, target_index in line_alignment:
-                source_match: str = source_label.get_characters()[source_index]
-                target_match: str = revised_target_line[target_index]
-                print(f"[{source_match}]-[{target_match}]", file=stderr)
 
-        source_label.project(revised_target_line, line_alignment)
-        if source_label.get_characters() != revised_target_line:
-            raise EditFailure(f'{source_label.get_characters()} != {revised_target_line}')
+# Rather than going through the engine one by one, the lines' trimmed middle sections are bucketed by length
+#   and aligned batch_size at a time by the batched kernel; the fast paths otherwise apply as they do in align_line.
+#   Lines whose charts would be too large to batch go through the engine, just as they would without batching.
+def align_lines_in_batches(line_chunk: List[Tuple[int, str, str]], alignment_type: Type[Alignment],
+                           alignment_kwargs: Dict[str, Any], **kwargs) -> List[Tuple[int, str, Dict[str, Any]]]:
+    ed_cost_function: Callable = kwargs["cost_function"]
+    data_type_base: str = kwargs["data_type"]
+    batch_size: int = kwargs["batch_size"]
+
+    source_labels: List[Alignment] = []
+    source_texts: List[str] = []
+    target_texts: List[str] = []
+    chunk_statistics: List[Dict[str, Any]] = []
+    line_alignments: List[Union[AlignmentPath, None]] = []
+    trimmed_lengths: Dict[int, Tuple[int, int]] = {}
+    batch_data_types: Dict[int, str] = {}
+    cache_keys: Dict[int, str] = {}
+    for chunk_position, (_, source_line, target_line) in enumerate(line_chunk):
+        with measure_phase("parsing"):
+            source_label = alignment_type(source_line, **alignment_kwargs)   # type: ignore
+        source_labels.append(source_label)
+        source_texts.append("".join(source_label.get_characters()))
+        target_texts.append(" ".join(target_line.split()))
+        chunk_statistics.append({
+            "source_length": len(source_texts[-1]),
+            "target_length": len(target_texts[-1])
+        })
+        if (len(source_texts[-1]) + 1) * (len(target_texts[-1]) + 1) > MAX_BATCHED_CHART_AREA:
+            line_alignments.append(align_text_pair(
+                source_texts[-1], target_texts[-1],
+                data_type_base + get_entry_size(data_type_base, source_texts[-1], target_texts[-1]),
+                chunk_statistics[-1], **kwargs
+            ))
+            continue
+
+        cache_key, cached_alignment = look_up_alignment(
+            source_texts[-1], target_texts[-1], align_batch, chunk_statistics[-1], **kwargs
+        )
+        if cached_alignment is not None:
+            line_alignments.append(cached_alignment)
+        elif source_texts[-1] == target_texts[-1]:
+            chunk_statistics[-1]["fast_path"] = "identical"
+            line_alignments.append(create_identity_path(0, len(source_texts[-1])))
+        else:
+            if cache_key is not None:
+                cache_keys[chunk_position] = cache_key
+            trimmed_lengths[chunk_position] = measure_common_ends(source_texts[-1], target_texts[-1])
+            line_alignments.append(None)
 
+    trimmed_positions: List[int] = list(trimmed_lengths)
+    middle_sources: List[str] = []
+    middle_targets: List[str] = []
+    for chunk_position in trimmed_positions:
+        prefix_length, suffix_length = trimmed_lengths[chunk_position]
+        source_text: str = source_texts[chunk_position]
+        target_text: str = target_texts[chunk_position]
+        middle_sources.append(source_text[prefix_length:(len(source_text) - suffix_length)])
+        middle_targets.append(target_text[prefix_length:(len(target_text) - suffix_length)])
+
+    for bucket in bucket_pairs(middle_sources, middle_targets, kwargs["bucket_width"]):
+        for batch_start in range(0, len(bucket), batch_size):
+            batch: List[int] = bucket[batch_start:(batch_start + batch_size)]
+            batch_positions: List[int] = [trimmed_positions[middle_index] for middle_index in batch]
+            full_data_type: str = data_type_base + get_entry_size(
+                data_type_base, max((source_texts[chunk_position] for chunk_position in batch_positions), key=len),
+                max((target_texts[chunk_position] for chunk_position in batch_positions), key=len)
+            )
+            with measure_phase("fill"):
+                middle_paths: List[AlignmentPath] = align_batch(
+                    [middle_sources[middle_index] for middle_index in batch],
+                    [middle_targets[middle_index] for middle_index in batch], ed_cost_function, full_data_type
+                )
+            for middle_index, chunk_position, middle_path in zip(batch, batch_positions, middle_paths):
+                prefix_length, suffix_length = trimmed_lengths[chunk_position]
+                batch_data_types[chunk_position] = full_data_type
+                chunk_statistics[chunk_position]["engine"] = "batched"
+                chunk_statistics[chunk_position]["cells"] = \
+                    (len(middle_sources[middle_index]) + 1) * (len(middle_targets[middle_index]) + 1)
+                line_alignments[chunk_position] = complete_trimmed_path(
+                    source_texts[chunk_position], target_texts[chunk_position], ed_cost_function, full_data_type,
+                    prefix_length, suffix_length, middle_path, chunk_statistics[chunk_position]
+                )
+                if chunk_position in cache_keys:
+                    kwargs["cache"].put(cache_keys[chunk_position], line_alignments[chunk_position])
+
+    chunk_results: List[Tuple[int, str, Dict[str, Any]]] = []
+    for chunk_position, (line_index, _, _) in enumerate(line_chunk):
+        if kwargs["profile"] is True:
+            line_data_type: str = batch_data_types.get(chunk_position) or data_type_base + get_entry_size(
+                data_type_base, source_texts[chunk_position], target_texts[chunk_position]
+            )
+            record_path_cost(
+                source_texts[chunk_position], target_texts[chunk_position], line_alignments[chunk_position],
+                line_data_type, chunk_statistics[chunk_position], **kwargs
+            )
+        projection: str = project_line(
+            source_labels[chunk_position], target_texts[chunk_position], line_alignments[chunk_position], **kwargs
+        )
+        chunk_results.append((line_index, projection, chunk_statistics[chunk_position]))
+    return chunk_results
+
+
+def align_chunk(line_chunk: List[Tuple[int, str, str]], alignment_type: Type[Alignment],
+                alignment_kwargs: Dict[str, Any], **kwargs) -> List[Tuple[int, str, Dict[str, Any]]]:
+    if kwargs["batch_size"] > 0:
+        return align_lines_in_batches(line_chunk, alignment_type, alignment_kwargs, **kwargs)
+
+    chunk_results: List[Tuple[int, str, Dict[str, Any]]] = []
+    for line_index, source_line, target_line in line_chunk:
+        projection, line_statistics = \
+            align_line(line_index, source_line, target_line, alignment_type, alignment_kwargs, **kwargs)
+        chunk_results.append((line_index, projection, line_statistics))
+    return chunk_results
+
+
+def write_projection(output_file: Union[TextIO, None], line_index: int, projection: str,
+                     line_statistics: Dict[str, Any], fast_path_counts: Counter,
+                     profiler: Union[PhaseProfiler, None] = None,
+                     projection_index: Union[ProjectionIndex, None] = None, **kwargs):
+    fast_path_counts[line_statistics["fast_path"]] += 1
+    if "cache" in line_statistics:
+        fast_path_counts[f"cache_{line_statistics['cache']}"] += 1
+    if kwargs["statistics"] is True:
+        print(f"STATISTICS (LINE {line_index}): {format_statistics(line_statistics)}", file=stderr)
+
+    if profiler is not None:
+        profiler.record_line(line_statistics)
+    with measure_phase("write", profiler):
         if output_file is not None:
-            output_file.write(f"{source_label}")
+            output_file.write(f"{projection}\n")
+            if projection_index is not None:
+                projection_index.record(line_index, projection)
         else:
-            print(f"PROJECTION: {source_label}")
+            print(f"PROJECTION: {projection}")
+
+
+# Besides its counts of fast paths, each file returns its profile (when profiling), keyed by its target.
+def align_files(source_filepath: str, target_filepath: str, output_filepath: Union[str, None],
+                alignment_type: Type[Alignment], alignment_kwargs: Dict[str, Any], **kwargs) -> \
+        Tuple[Counter, Dict[str, Dict[str, Any]]]:
+    if kwargs["stream"] is True:
+        return stream_files(source_filepath, target_filepath, output_filepath, alignment_kwargs, **kwargs)
+
+    # The previous run is read before the output is opened, in case the output overwrites it.
+    previous_run: Union[PreviousRun, None] = open_previous_run(target_filepath, **kwargs)
+    output_file: TextIO = open(output_filepath, mode="w+", encoding="utf-8") if output_filepath is not None else None
+    projection_index: Union[ProjectionIndex, None] = open_projection_index(output_filepath, **kwargs)
+    word_streams: Union[Tuple[str, str, Union[str, None]], None] = find_word_streams(target_filepath, **kwargs)
+    text_file: Union[TextIO, None] = open_text_output(word_streams)
+    profiler: Union[PhaseProfiler, None] = PhaseProfiler() if kwargs["profile"] is True else None
+    previous_profiler: Union[PhaseProfiler, None] = activate_profiler(profiler)
+
+    # Without batching, every line is aligned as soon as it is read.
+    chunk_size: int = max(1, kwargs["batch_size"])
+    fast_path_counts: Counter = Counter()
+    line_chunks: Iterator[List[Tuple[int, str, str]]] = \
+        chunk_file_lines(source_filepath, target_filepath, chunk_size, kwargs["zipper"], word_streams)
+    for line_chunk in measure_iteration(line_chunks, "zipping", profiler):
+        write_projected_text(text_file, line_chunk)
+        index_line_chunk(projection_index, line_chunk)
+        reused_results, line_chunk = split_reused_lines(line_chunk, previous_run)
+        aligned_results: List[Tuple[int, str, Dict[str, Any]]] = \
+            align_chunk(line_chunk, alignment_type, alignment_kwargs, **kwargs)
+        for line_index, projection, line_statistics in merge_chunk_results(reused_results, aligned_results):
+            write_projection(
+                output_file, line_index, projection, line_statistics, fast_path_counts, profiler, projection_index,
+                **kwargs
+            )
+
+    for opened_file in (output_file, text_file, projection_index):
+        if opened_file is not None:
+            opened_file.close()
+    activate_profiler(previous_profiler)
+    return fast_path_counts, {target_filepath: profiler.to_dict()} if profiler is not None else {}
+
+
+# In streaming mode, each file holds a single XML document, which is parsed, aligned, projected, and written out
+#   a piece at a time; its statistics cover the whole document.
+def stream_files(source_filepath: str, target_filepath: str, output_filepath: Union[str, None],
+                 alignment_kwargs: Dict[str, Any], **kwargs) -> Tuple[Counter, Dict[str, Dict[str, Any]]]:
+    data_type_base: str = kwargs["data_type"]
+    profiler: Union[PhaseProfiler, None] = PhaseProfiler() if kwargs["profile"] is True else None
+    previous_profiler: Union[PhaseProfiler, None] = activate_profiler(profiler)
+
+    def get_window_data_type(source_window: str, target_window: str) -> str:
+        return data_type_base + get_entry_size(data_type_base, source_window, target_window)
+
+    document_statistics: Dict[str, Any] = {"engine": "streaming"}
+    with open(source_filepath, mode="r", encoding="utf-8") as source_file, \
+            open(target_filepath, mode="r", encoding="utf-8") as target_file:
+        if output_filepath is not None:
+            output_file: TextIO = open(output_filepath, mode="w+", encoding="utf-8")
+        else:
+            output_file = stdout
+            output_file.write("PROJECTION: ")
+        project_xml_stream(
+            source_file, target_file, output_file, kwargs["cost_function"], get_window_data_type, kwargs["engine"],
+            kwargs["window_length"], alignment_kwargs["segmentation_function"], document_statistics
+        )
+        output_file.write("\n")
+        if output_filepath is not None:
+            output_file.close()
+
+    fast_path_counts: Counter = Counter({"none": 1})
+    if kwargs["statistics"] is True:
+        print(f"STATISTICS (LINE 0): {format_statistics(document_statistics)}", file=stderr)
+    if profiler is not None:
+        profiler.record_line(document_statistics)
+    activate_profiler(previous_profiler)
+    return fast_path_counts, {target_filepath: profiler.to_dict()} if profiler is not None else {}
+
+
+def open_previous_run(target_filepath: str, **kwargs) -> Union[PreviousRun, None]:
+    previous_filepath: Union[str, None] = \
+        kwargs["previous_runs"].get(target_filepath) if kwargs["previous_runs"] is not None else None
+    if previous_filepath is None:
+        return None
+    return PreviousRun(previous_filepath, kwargs["settings"])
+
 
-    source_file.close()
-    target_file.close()
-    output_file.close()
+# Outputs written to a file are indexed on request (or when aligning incrementally), so that a later run can reuse
+#   their projections (see --previous-output).
+def open_projection_index(output_filepath: Union[str, None], **kwargs) -> Union[ProjectionIndex, None]:
+    if output_filepath is None or kwargs["write_index"] is False:
+        return None
+    return ProjectionIndex(output_filepath, kwargs["settings"])
+
+
+def index_line_chunk(projection_index: Union[ProjectionIndex, None], line_chunk: List[Tuple[int, str, str]]):
+    if projection_index is not None:
+        projection_index.add_chunk(line_chunk)
+
+
+# With separate word streams, each target is matched with the other side's text and the links (in the same order as
+#   its source), along with where the projected side's text should be written, if anywhere.
+def find_word_streams(target_filepath: str, **kwargs) -> Union[Tuple[str, str, Union[str, None]], None]:
+    return kwargs["word_streams"].get(target_filepath) if kwargs["word_streams"] is not None else None
+
+
+def open_text_output(word_streams: Union[Tuple[str, str, Union[str, None]], None]) -> Union[TextIO, None]:
+    if word_streams is None or word_streams[2] is None:
+        return None
+    return open(word_streams[2], mode="w+", encoding="utf-8")
+
+
+# The links of each projection refer to the target's words, so its text is written as it is read, one line per pair,
+#   with its whitespace normalized just as it is for alignment.
+def write_projected_text(text_file: Union[TextIO, None], line_chunk: List[Tuple[int, str, str]]):
+    if text_file is not None:
+        text_file.write("".join(f"{' '.join(target_line.split())}\n" for _, _, target_line in line_chunk))
+
+
+def split_reused_lines(line_chunk: List[Tuple[int, str, str]], previous_run: Union[PreviousRun, None]) -> \
+        Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Tuple[int, str, str]]]:
+    if previous_run is None:
+        return [], line_chunk
+    return previous_run.split_chunk(line_chunk)
+
+
+# With separate word streams, each source line is made up of the fields read in lockstep from the source,
+#   the other side's text, and the links.
+def chunk_file_lines(source_filepath: str, target_filepath: str, chunk_size: int, zip_function: Callable,
+                     word_streams: Union[Tuple[str, str, Union[str, None]], None] = None) -> \
+        Iterator[List[Tuple[int, str, str]]]:
+    with open(source_filepath, mode="r", encoding="utf-8") as source_file, \
+            open(target_filepath, mode="r", encoding="utf-8") as target_file, ExitStack() as stream_stack:
+        source_lines: Iterable[Union[str, Tuple[str, str, str]]] = source_file
+        if word_streams is not None:
+            other_file, links_file = [
+                stream_stack.enter_context(open(stream_filepath, mode="r", encoding="utf-8"))
+                for stream_filepath in word_streams[:2]
+            ]
+            source_lines = zip_word_streams(source_file, other_file, links_file)
+
+        line_chunk: List[Tuple[int, str, str]] = []
+        for line_index, (source_line, target_line) in enumerate(zip_function(source_lines, target_file)):
+            line_chunk.append((line_index, source_line, target_line))
+            if len(line_chunk) == chunk_size:
+                yield line_chunk
+                line_chunk = []
+        if len(line_chunk) > 0:
+            yield line_chunk
+
+
+# In a pool worker, each chunk is profiled on its own, and its profile travels back to the main process with it.
+def align_profiled_chunk(line_chunk: List[Tuple[int, str, str]], alignment_type: Type[Alignment],
+                         alignment_kwargs: Dict[str, Any], **kwargs) -> \
+        Tuple[List[Tuple[int, str, Dict[str, Any]]], Union[Dict[str, Any], None]]:
+    profiler: Union[PhaseProfiler, None] = PhaseProfiler() if kwargs["profile"] is True else None
+    previous_profiler: Union[PhaseProfiler, None] = activate_profiler(profiler)
+    try:
+        chunk_results: List[Tuple[int, str, Dict[str, Any]]] = \
+            align_chunk(line_chunk, alignment_type, alignment_kwargs, **kwargs)
+    finally:
+        activate_profiler(previous_profiler)
+    return chunk_results, profiler.to_dict() if profiler is not None else None
+
+
+# Every file's lines are split into chunks, and the chunks of all files are sent to the same pool, so that small files
+#   and large files share its workers. Results are consumed in the order in which chunks were submitted,
+#   which keeps each output in line order, and at most max_pending_chunks are awaited at any one time.
+def align_files_in_chunks(combined_filepaths: List[Tuple[str, str, Union[str, None]]], pool: Pool, chunk_size: int,
+                          max_pending_chunks: int, alignment_type: Type[Alignment], alignment_kwargs: Dict[str, Any],
+                          **kwargs) -> Tuple[Counter, Dict[str, Dict[str, Any]]]:
+    fast_path_counts: Counter = Counter()
+    file_profilers: Dict[str, PhaseProfiler] = {}
+    pending_chunks: Deque[
+        Tuple[Union[TextIO, None], Union[ProjectionIndex, None], Union[PhaseProfiler, None],
+              List[Tuple[int, str, Dict[str, Any]]], Union[AsyncResult, None]]
+    ] = deque()
+
+    def consume_chunk():
+        output_file, projection_index, file_profiler, reused_results, chunk_result = pending_chunks.popleft()
+        if chunk_result is None:
+            # This marks the end of a file, all of whose chunks have now been written.
+            for opened_file in (output_file, projection_index):
+                if opened_file is not None:
+                    opened_file.close()
+            return
+
+        aligned_results, chunk_profile = chunk_result.get()
+        if chunk_profile is not None:
+            file_profiler.merge(chunk_profile)
+        for line_index, projection, line_statistics in merge_chunk_results(reused_results, aligned_results):
+            write_projection(
+                output_file, line_index, projection, line_statistics, fast_path_counts, file_profiler,
+                projection_index, **kwargs
+            )
+
+    chunk_aligner: Callable = partial(align_profiled_chunk, alignment_type=alignment_type,
+                                      alignment_kwargs=alignment_kwargs, **kwargs)
+    for source_filepath, target_filepath, output_filepath in combined_filepaths:
+        # Previous runs are read by the main process, so that only the changed lines are sent to the workers.
+        previous_run: Union[PreviousRun, None] = open_previous_run(target_filepath, **kwargs)
+        output_file: Union[TextIO, None] = \
+            open(output_filepath, mode="w+", encoding="utf-8") if output_filepath is not None else None
+        projection_index: Union[ProjectionIndex, None] = open_projection_index(output_filepath, **kwargs)
+        word_streams: Union[Tuple[str, str, Union[str, None]], None] = find_word_streams(target_filepath, **kwargs)
+        text_file: Union[TextIO, None] = open_text_output(word_streams)
+        file_profiler: Union[PhaseProfiler, None] = None
+        if kwargs["profile"] is True:
+            file_profiler = file_profilers.setdefault(target_filepath, PhaseProfiler())
+
+        line_chunks: Iterator[List[Tuple[int, str, str]]] = \
+            chunk_file_lines(source_filepath, target_filepath, chunk_size, kwargs["zipper"], word_streams)
+        for line_chunk in measure_iteration(line_chunks, "zipping", file_profiler):
+            while len(pending_chunks) >= max_pending_chunks:
+                consume_chunk()
+            write_projected_text(text_file, line_chunk)
+            index_line_chunk(projection_index, line_chunk)
+            reused_results, line_chunk = split_reused_lines(line_chunk, previous_run)
+            pending_chunks.append((
+                output_file, projection_index, file_profiler, reused_results,
+                pool.apply_async(chunk_aligner, (line_chunk,))
+            ))
+        pending_chunks.append((output_file, projection_index, file_profiler, [], None))
+        if text_file is not None:
+            text_file.close()
+
+    while len(pending_chunks) > 0:
+        consume_chunk()
+    return fast_path_counts, {
+        target_filepath: file_profiler.to_dict() for target_filepath, file_profiler in file_profilers.items()
+    }
+
+
+def format_statistics(statistics: Dict[str, Any]) -> str:
+    return ", ".join(f"{name}={value}" for name, value in statistics.items())
+
+
+def format_fast_path_counts(fast_path_counts: Counter) -> str:
+    return ", ".join(f"{fast_path}={fast_path_counts[fast_path]}" for fast_path in FAST_PATHS)
+
+
+def format_cache_counts(fast_path_counts: Counter) -> str:
+    return f"hits={fast_path_counts['cache_hit']}, misses={fast_path_counts['cache_miss']}"
+
+
+def format_throughput(line_count: int, elapsed_time: float) -> str:
+    lines_per_second: float = line_count / elapsed_time if elapsed_time > 0 else 0.0
+    return f"{line_count} lines in {elapsed_time:.2f} seconds ({lines_per_second:.1f} lines per second)"
+
+
+# The run's profile merges those of its files; its fast paths and total time are included alongside.
+def write_profile(profile_filepath: str, file_profiles: Dict[str, Dict[str, Any]], run_counts: Counter,
+                  elapsed_time: float):
+    run_profiler: PhaseProfiler = PhaseProfiler()
+    for file_profile in file_profiles.values():
+        run_profiler.merge(file_profile)
+    run_profile: Dict[str, Any] = run_profiler.to_dict()
+    run_profile["files"] = len(file_profiles)
+    run_profile["fast_paths"] = {fast_path: run_counts[fast_path] for fast_path in FAST_PATHS}
+    run_profile["wall_seconds"] = round(elapsed_time, 6)
+    with open(profile_filepath, mode="w", encoding="utf-8") as profile_file:
+        dump({"run": run_profile, "files": file_profiles}, profile_file, indent=2)
 
 
 def get_entry_size(base_type: str, source_text: str, target_text: str) -> str:
@@ -111,19 +575,56 @@ if __name__ == "__main__":
     parser: ArgumentParser = ArgumentParser()
     parser.add_argument("source", type=str, help=HelpMessage.SOURCE.value)
     parser.add_argument("target", type=str, help=HelpMessage.TARGET.value)
+    parser.add_argument(
+        "--anchor-length", type=int, default=DEFAULT_ANCHOR_LENGTH, help=HelpMessage.ANCHOR_LENGTH.value
+    )
+    parser.add_argument("--batch-size", type=int, default=0, help=HelpMessage.BATCH_SIZE.value)
+    parser.add_argument(
+        "--bucket-width", type=int, default=DEFAULT_BUCKET_WIDTH, help=HelpMessage.BUCKET_WIDTH.value
+    )
+    parser.add_argument("--cache-dir", type=str, default=None, help=HelpMessage.CACHE_DIR.value)
+    parser.add_argument(
+        "--cache-size", type=parse_memory_size, default=DEFAULT_CACHE_SIZE, help=HelpMessage.CACHE_SIZE.value
+    )
+    parser.add_argument("--chunk-size", type=int, default=0, help=HelpMessage.CHUNK_SIZE.value)
     parser.add_argument(
         "--cost-function", type=get_cost_function, default="procrustes-levenshtein",
         help=HelpMessage.COST_FUNCTION.value
     )
+    parser.add_argument("--engine", type=get_engine, default="auto", help=HelpMessage.ENGINE.value)
     parser.add_argument("--flip", action="store_true", default=False, help=HelpMessage.FLIP.value)
+    parser.add_argument("--links", type=str, default=None, help=HelpMessage.LINKS.value)
+    parser.add_argument("--memory-budget", type=parse_memory_size, default=None, help=HelpMessage.MEMORY_BUDGET.value)
     parser.add_argument("--mode", "-m", type=get_alignment_type, default=WordAlignment, help=HelpMessage.MODE.value)
+    parser.add_argument("--other-side", type=str, default=None, help=HelpMessage.OTHER_SIDE.value)
     parser.add_argument("--output", type=str, default=None, help=HelpMessage.OUTPUT.value)
+    parser.add_argument("--output-text", type=str, default=None, help=HelpMessage.OUTPUT_TEXT.value)
+    parser.add_argument("--previous-output", type=str, default=None, help=HelpMessage.PREVIOUS_OUTPUT.value)
     parser.add_argument("--processes", type=int, default=1, help=HelpMessage.PROCESSES.value)
+    parser.add_argument("--profile", type=str, default=None, help=HelpMessage.PROFILE.value)
     parser.add_argument("--segmenter", type=get_segmentation_function, default=None, help=HelpMessage.SEGMENTER.value)
+    parser.add_argument("--statistics", action="store_true", default=False, help=HelpMessage.STATISTICS.value)
+    parser.add_argument("--stream", action="store_true", default=False, help=HelpMessage.STREAM.value)
     parser.add_argument("--verbose", action="store_true", default=False, help=HelpMessage.VERBOSE.value)
+    parser.add_argument(
+        "--window-length", type=int, default=DEFAULT_WINDOW_LENGTH, help=HelpMessage.WINDOW_LENGTH.value
+    )
+    parser.add_argument("--write-index", action="store_true", default=False, help=HelpMessage.WRITE_INDEX.value)
     parser.add_argument("--zipper", type=get_zip_function, default="line", help=HelpMessage.ZIPPER.value)
     args: Namespace = parser.parse_args()
 
+    # The numeric options are checked before anything (such as the alignment cache) is set up with them.
+    if args.chunk_size < 0:
+        raise ValueError("An invalid chunk size was supplied. Please supply a value of at least 0.")
+    elif args.batch_size < 0:
+        raise ValueError("An invalid batch size was supplied. Please supply a value of at least 0.")
+    elif args.bucket_width < 1:
+        raise ValueError("An invalid bucket width was supplied. Please supply a value greater than 0.")
+    elif args.anchor_length < 1:
+        raise ValueError("An invalid anchor length was supplied. Please supply a value greater than 0.")
+    elif args.processes < 1:
+        raise ValueError("An invalid number of processes was supplied. Please supply a value greater than 0.")
+
     if not path.exists(args.source):
         raise ValueError(f"The given source path, <{args.source}>, does not exist.")
     elif not path.exists(args.target):
@@ -144,6 +645,76 @@ if __name__ == "__main__":
         raise ValueError("Invalid combination of source and target filepaths.")
 
     combined_filepaths: List[Tuple[str, str, str]] = list(zip(source_filepaths, target_filepaths, output_filepaths))
+
+    # In incremental mode, each target is matched with the output of the previous run, whose index identifies
+    #   the pair (and the settings) behind each of its projections.
+    previous_runs: Union[Dict[str, str], None] = None
+    if args.previous_output is not None:
+        if not path.exists(args.previous_output):
+            raise ValueError(f"The given previous output, <{args.previous_output}>, does not exist.")
+
+        if path.isfile(args.target):
+            previous_filepaths: List[str] = [args.previous_output]
+        else:
+            previous_filepaths = gather_filepaths(args.previous_output, args.target)
+        # Files that were not part of the previous run are aligned in full.
+        previous_runs = {
+            target_filepath: previous_filepath
+            for target_filepath, previous_filepath in zip(target_filepaths, previous_filepaths)
+            if path.isfile(previous_filepath)
+        }
+        for previous_filepath in previous_runs.values():
+            if not path.isfile(f"{previous_filepath}{INDEX_SUFFIX}"):
+                raise ValueError(f"The previous output, <{previous_filepath}>, has no index, "
+                                 f"<{previous_filepath}{INDEX_SUFFIX}>, to match its projections with their pairs.")
+
+    # With separate word streams, each source is read along with the other side's text and the links; like the output,
+    #   the projected text (if requested) is matched to the target.
+    word_streams: Union[Dict[str, Tuple[str, str, Union[str, None]]], None] = None
+    if (args.links is None) != (args.other_side is None):
+        raise ValueError("Separate word streams require both --links and --other-side.")
+    elif args.links is None and args.output_text is not None:
+        raise ValueError("The --output-text option requires separate word streams (--links and --other-side).")
+    elif args.links is not None:
+        if args.mode is not WordAlignment or args.zipper is not zip:
+            raise ValueError("Separate word streams require --mode word and --zipper line.")
+        elif previous_runs is not None or args.write_index is True:
+            raise ValueError("Separate word streams cannot be combined with --previous-output or --write-index.")
+        for stream_path in (args.other_side, args.links):
+            if not path.exists(stream_path):
+                raise ValueError(f"The given word stream path, <{stream_path}>, does not exist.")
+
+        if path.isfile(args.source):
+            stream_filepaths: List[Tuple[str, str, Union[str, None]]] = \
+                [(args.other_side, args.links, args.output_text)]
+        else:
+            text_filepaths: List[Union[str, None]] = gather_filepaths(args.output_text, args.target) \
+                if args.output_text is not None else [None] * len(target_filepaths)
+            stream_filepaths = list(zip(
+                gather_filepaths(args.other_side, args.other_side), gather_filepaths(args.links, args.links),
+                text_filepaths
+            ))
+        word_streams = dict(zip(target_filepaths, stream_filepaths))
+
+    # Streaming applies to whole XML documents, which are neither split into chunks nor compared to previous runs.
+    if args.stream is True:
+        if args.mode is not XMLAlignment or args.zipper is not zip_by_file:
+            raise ValueError("Streaming alignment requires --mode xml and --zipper file.")
+        elif args.chunk_size > 0 or previous_runs is not None or args.write_index is True:
+            raise ValueError("Streaming alignment cannot be combined with --chunk-size, --previous-output, "
+                             "or --write-index.")
+
+    # A memory budget is honored by planning each alignment; the default engine plans whenever one is given, while
+    #   the others (like the batched kernel) would ignore it.
+    if args.memory_budget is not None:
+        if args.engine is ENGINES["auto"]:
+            args.engine = ENGINES["planned"]
+        elif args.engine is not ENGINES["planned"]:
+            raise ValueError("A memory budget requires --engine planned (or auto, which then plans each alignment).")
+
+        if args.batch_size > 0:
+            raise ValueError("A memory budget cannot be combined with --batch-size.")
+
     alignment_class: Type[Alignment] = args.mode
     alignment_class_kwargs: Dict[str, Any] = {
         "is_flipped": args.flip,
@@ -151,21 +722,73 @@ if __name__ == "__main__":
     }
 
     cost_function, data_type = args.cost_function
+    alignment_engine: Callable = configure_engine(
+        args.engine, anchor_length=args.anchor_length, memory_budget=args.memory_budget,
+        window_length=args.window_length
+    )
+    alignment_cache: Union[AlignmentCache, None] = \
+        AlignmentCache(args.cache_dir, args.cache_size) if args.cache_dir is not None else None
     other_kwargs: Dict[str, Any] = {
+        "batch_size": args.batch_size,
+        "bucket_width": args.bucket_width,
+        "cache": alignment_cache,
         "cost_function": cost_function,
         "data_type": data_type,
+        "engine": alignment_engine,
+        "previous_runs": previous_runs,
+        "profile": args.profile is not None,
+        "settings": describe_settings(
+            alignment_class, alignment_class_kwargs, cost_function, alignment_engine, args.zipper,
+            is_batched=args.batch_size > 0
+        ),
+        "statistics": args.statistics,
+        "stream": args.stream,
         "verbose": args.verbose,
+        "window_length": args.window_length,
+        "word_streams": word_streams,
+        # An incremental run's output is indexed in turn, so that the next run can build on it.
+        "write_index": args.write_index is True or previous_runs is not None,
         "zipper": args.zipper
     }
 
-    if args.processes > 1:
+    start_time: float = perf_counter()
+    if args.processes > 1 and args.chunk_size > 0:
+        with Pool(processes=args.processes) as pool:
+            file_results: List[Tuple[Counter, Dict[str, Dict[str, Any]]]] = [
+                align_files_in_chunks(
+                    combined_filepaths, pool, args.chunk_size, PENDING_CHUNKS_PER_PROCESS * args.processes,
+                    alignment_class, alignment_class_kwargs, **other_kwargs
+                )
+            ]
+    elif args.processes > 1:
         with Pool(processes=args.processes) as pool:
             aligner_partial = partial(
                 align_files, alignment_type=alignment_class, alignment_kwargs=alignment_class_kwargs, **other_kwargs
             )
-            pool.starmap(aligner_partial, combined_filepaths)
-    elif args.processes == 1:
-        for source_path, target_path, output_path in combined_filepaths:
-            align_files(source_path, target_path, output_path, alignment_class, alignment_class_kwargs, **other_kwargs)
+            file_results = pool.starmap(aligner_partial, combined_filepaths)
     else:
-        raise ValueError("An invalid number of processes was supplied. Please supply a value greater than 0.")
+        file_results = []
+        for source_path, target_path, output_path in combined_filepaths:
+            file_results.append(
+                align_files(
+                    source_path, target_path, output_path, alignment_class, alignment_class_kwargs, **other_kwargs
+                )
+            )
+
+    elapsed_time: float = perf_counter() - start_time
+    run_counts: Counter = sum((file_counts for file_counts, _ in file_results), Counter())
+    if args.statistics is True:
+        print(f"FAST PATHS: {format_fast_path_counts(run_counts)}", file=stderr)
+        if alignment_cache is not None:
+            print(f"CACHE: {format_cache_counts(run_counts)}", file=stderr)
+        line_count: int = sum(run_counts[fast_path] for fast_path in FAST_PATHS)
+        print(f"THROUGHPUT: {format_throughput(line_count, elapsed_time)}", file=stderr)
+
+    if args.profile is not None:
+        file_profiles: Dict[str, Dict[str, Any]] = {}
+        for _, result_profiles in file_results:
+            file_profiles.update(result_profiles)
+        write_profile(args.profile, file_profiles, run_counts, elapsed_time)
+
+    if alignment_cache is not None:
+        alignment_cache.close()
@@ -0,0 +1,156 @@
+from functools import partial
+from random import Random
+from typing import Callable, Dict, List, Tuple
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from utils.algorithms.anchored_alignment import align_by_anchors
+from utils.algorithms.batched_edit_distance import align_batch
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.fast_paths import align_with_fast_paths
+from utils.algorithms.options.cost_functions import COST_FUNCTIONS
+from utils.algorithms.options.engines import ENGINES
+
+
+# Every engine is checked against the sequential engine, which fills the chart one cell at a time with the cost
+#   function itself; the pairs are short enough for it, but are often near-copies of one another, as they are in use.
+#   Some are shifted copies, whose paths lie outside the banded engine's first band.
+REFERENCE_ENGINE: Callable = ENGINES["sequential"]
+UNIT_COST_FUNCTIONS: List[str] = ["lcs", "levenshtein"]
+
+
+def generate_text(random: Random, length: int) -> str:
+    return "".join(random.choice("abc .") for _ in range(length))
+
+
+def revise_text(random: Random, text: str) -> str:
+    characters: List[str] = list(text)
+    for _ in range(random.randint(0, max(1, len(text) // 4))):
+        position: int = random.randint(0, len(characters))
+        step: float = random.random()
+        if step < 0.4:
+            characters.insert(position, random.choice("abc .d"))
+        elif position < len(characters) and step < 0.7:
+            del characters[position]
+        elif position < len(characters):
+            characters[position] = random.choice("abc .d")
+    return "".join(characters)
+
+
+def generate_pairs(random: Random, pair_count: int, max_length: int) -> List[Tuple[str, str]]:
+    pairs: List[Tuple[str, str]] = []
+    for _ in range(pair_count):
+        source: str = generate_text(random, random.randint(0, max_length))
+        step: float = random.random()
+        if step < 0.1:
+            destination: str = source
+        elif step < 0.2:
+            destination = generate_text(random, random.randint(0, max_length))
+        elif step < 0.3:
+            # Text that moves from one end to the other takes the path far from the main diagonal.
+            shift: int = random.randint(10, 20)
+            destination = source[shift:] + generate_text(random, shift)
+        else:
+            destination = revise_text(random, source)
+        pairs.append((source, destination))
+    return pairs
+
+
+class TestEngines(TestCase):
+    # The reference paths are computed once, for every pair under every cost function, and shared by the tests.
+    @classmethod
+    def setUpClass(cls):
+        random: Random = Random(1)
+        cls.pairs: List[Tuple[str, str]] = generate_pairs(random, 150, 60)
+        # The debug cost function is levenshtein's, with a line printed for every call.
+        cls.cost_function_names: List[str] = [
+            cost_function_name for cost_function_name in COST_FUNCTIONS if cost_function_name != "debug"
+        ]
+        cls.reference_paths: Dict[Tuple[str, int], AlignmentPath] = {}
+        for cost_function_name in cls.cost_function_names:
+            cost_function, data_type = cls.get_cost_function(cost_function_name)
+            for pair_index, (source, destination) in enumerate(cls.pairs):
+                cls.reference_paths[(cost_function_name, pair_index)] = \
+                    REFERENCE_ENGINE(source, destination, cost_function, data_type)
+
+    @staticmethod
+    def get_cost_function(cost_function_name: str) -> Tuple[Callable, str]:
+        cost_function, data_type_base = COST_FUNCTIONS[cost_function_name]
+        return cost_function, data_type_base + "32"
+
+    def assert_matches_reference(self, engine: Callable, cost_function_names: List[str]):
+        for cost_function_name in cost_function_names:
+            cost_function, data_type = self.get_cost_function(cost_function_name)
+            for pair_index, (source, destination) in enumerate(self.pairs):
+                with self.subTest(cost_function=cost_function_name, source=source, destination=destination):
+                    self.assertEqual(
+                        self.reference_paths[(cost_function_name, pair_index)],
+                        engine(source, destination, cost_function, data_type)
+                    )
+
+    def test_wavefront(self):
+        self.assert_matches_reference(ENGINES["wavefront"], self.cost_function_names)
+
+    def test_bit_parallel(self):
+        self.assert_matches_reference(ENGINES["bit-parallel"], UNIT_COST_FUNCTIONS)
+
+    def test_hirschberg(self):
+        # The base case is made tiny, so that even these short pairs are divided (several times over).
+        with patch("utils.algorithms.linear_space_edit_distance.BASE_CASE_AREA", 16):
+            self.assert_matches_reference(ENGINES["hirschberg"], self.cost_function_names)
+
+    def test_compact(self):
+        self.assert_matches_reference(ENGINES["compact"], self.cost_function_names)
+
+    def test_banded(self):
+        self.assert_matches_reference(ENGINES["banded"], self.cost_function_names)
+
+    def test_banded_within_memory_budget(self):
+        # A budget this small only holds the first bands of short pairs; the others go to the linear-space engine.
+        self.assert_matches_reference(
+            partial(ENGINES["banded"], memory_budget=2000), self.cost_function_names
+        )
+
+    def test_auto(self):
+        self.assert_matches_reference(ENGINES["auto"], self.cost_function_names)
+
+    # Anchors are exact matches that the full chart need not align to each other, so the anchored engine is checked
+    #   against the same anchors with the reference engine aligning the gaps between them, and (with anchors too long
+    #   to be found) against the reference engine itself.
+    def test_anchored(self):
+        for anchor_length in (3, 6):
+            anchored_engine: Callable = partial(ENGINES["anchored"], anchor_length=anchor_length)
+            reference_engine: Callable = \
+                partial(align_by_anchors, gap_engine=REFERENCE_ENGINE, anchor_length=anchor_length)
+            for cost_function_name in self.cost_function_names:
+                cost_function, data_type = self.get_cost_function(cost_function_name)
+                for source, destination in self.pairs:
+                    with self.subTest(cost_function=cost_function_name, source=source, destination=destination):
+                        self.assertEqual(
+                            reference_engine(source, destination, cost_function, data_type),
+                            anchored_engine(source, destination, cost_function, data_type)
+                        )
+
+        self.assert_matches_reference(
+            partial(ENGINES["anchored"], anchor_length=64), self.cost_function_names
+        )
+
+    def test_batched(self):
+        sources: List[str] = [source for source, _ in self.pairs]
+        destinations: List[str] = [destination for _, destination in self.pairs]
+        for cost_function_name in self.cost_function_names:
+            cost_function, data_type = self.get_cost_function(cost_function_name)
+            alignment_paths: List[AlignmentPath] = align_batch(sources, destinations, cost_function, data_type)
+            for pair_index, alignment_path in enumerate(alignment_paths):
+                with self.subTest(cost_function=cost_function_name, pair_index=pair_index):
+                    self.assertEqual(self.reference_paths[(cost_function_name, pair_index)], alignment_path)
+
+    def test_fast_paths(self):
+        for engine_name in ("sequential", "auto"):
+            self.assert_matches_reference(
+                partial(align_with_fast_paths, engine=ENGINES[engine_name]), self.cost_function_names
+            )
+
+
+if __name__ == "__main__":
+    main()
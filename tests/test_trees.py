@@ -0,0 +1,407 @@
+from itertools import zip_longest
+from random import Random
+from re import compile, finditer
+from typing import Dict, List, Tuple
+from unittest import TestCase, main
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.data_structures.exceptions import RootDeletedException
+from utils.algorithms.data_structures.tree import Tree
+from utils.modes.tree import TreeAlignment
+from utils.serialization.tree_printer import format_tree
+
+
+class BaselinePrettyPrinter:
+    """ The printer that trees were drawn with before the layout was computed in one pass. """
+    def __init__(self):
+        self.roots = []
+        self.lines = []  # (left margin, string)
+
+    def width(self):
+        if len(self.lines) == 0:
+            return 0
+        else:
+            return max(left + len(string) for (left, string) in self.lines)
+
+    def root(self, string):
+        if len(self.roots) == 0:
+            self.roots = [len(string) // 2]
+            self.lines[0:0] = [(0, string)]
+            return
+
+        newroot = (self.roots[0] + self.roots[-1]) // 2
+        nodeline = (newroot - (len(string) - 1) // 2, string)
+
+        if nodeline[0] < 0:
+            shift = -nodeline[0]
+            nodeline = (0, string)
+            self.lines = [(left + shift, s) for (left, s) in self.lines]
+            self.roots = [r + shift for r in self.roots]
+            # Unlike before, the junction (and the root) move along with a shifted label.
+            newroot += shift
+
+        if len(self.roots) == 1:
+            edgeline = (self.roots[0], '│')
+            self.lines[0:0] = [nodeline, edgeline]
+        elif len(self.roots) > 1:
+            top = ['─'] * (self.roots[-1] - self.roots[0] + 1)
+            top[0] = '┌'
+            for i in range(1, len(self.roots) - 1):
+                top[self.roots[i] - self.roots[0]] = '┬'
+            top[self.roots[-1] - self.roots[0]] = '┐'
+            # Unlike before, the junction is kept on the edge.
+            i = min(max(newroot - self.roots[0], 0), len(top) - 1)
+            top[i] = {'─': '┴', '┬': '┼', '┌': '├', '┐': '┤'}[top[i]]
+            edgeline = (self.roots[0], ''.join(top))
+            self.roots = [newroot]
+            self.lines[0:0] = [nodeline, edgeline]
+
+    def append(self, other):
+        w = self.width()
+
+        # How close can we put them without a collision?
+        minspace = None
+        for (sline, oline) in zip(self.lines, other.lines):
+            sleft, sstring = sline
+            oleft, ostring = oline
+            space = w - sleft - len(sstring) + oleft
+            if minspace is None or space < minspace:
+                minspace = space
+        if minspace is None:
+            minspace = 0
+
+        if w > 0:
+            offset = -minspace + 1
+        else:
+            offset = 0
+        offset = max(-1, offset)
+
+        new = []
+        for (sline, oline) in zip_longest(self.lines, other.lines, fillvalue=None):
+            if sline is None:
+                oleft, ostring = oline
+                new.append((w + offset + oleft, ostring))
+            elif oline is None:
+                new.append(sline)
+            else:
+                sleft, sstring = sline
+                sright = w - sleft - len(sstring)
+                oleft, ostring = oline
+                new.append((sleft, sstring + ' ' * (sright + offset + oleft) + ostring))
+        self.lines = new
+        self.roots.extend([w + offset + r for r in other.roots])
+
+    def __str__(self):
+        ret = []
+        for (left, string) in self.lines:
+            ret.append(' ' * left + string)
+        return '\n'.join(ret)
+
+
+class BaselineNode:
+    """ The nodes that trees were made of before they were transformed as a CompactTree. """
+    def __init__(self, label, children=None):
+        self.label = label
+        self.children = children or []
+        for (i, child) in enumerate(self.children):
+            if child.parent is not None:
+                child.detach()
+            child.parent = self
+            child.order = i
+        self.parent = None
+        self.order = 0
+
+    def _pretty_print(self):
+        p = BaselinePrettyPrinter()
+        for child in self.children:
+            p.append(child._pretty_print())
+        p.root(self.label)
+        return p
+
+    def _subtree_str(self):
+        if len(self.children) != 0:
+            return "(%s %s)" % (self.label, " ".join(child._subtree_str() for child in self.children))
+        else:
+            return '%s' % self.label
+
+    def insert_child(self, i, child):
+        if child.parent is not None:
+            child.detach()
+        child.parent = self
+        self.children[i:i] = [child]
+        for j in range(i, len(self.children)):
+            self.children[j].order = j
+
+    def append_child(self, child):
+        if child.parent is not None:
+            child.detach()
+        child.parent = self
+        self.children.append(child)
+        child.order = len(self.children) - 1
+
+    def delete_child(self, i):
+        self.children[i].parent = None
+        self.children[i].order = 0
+        self.children[i:i + 1] = []
+        for j in range(i, len(self.children)):
+            self.children[j].order = j
+
+    def detach(self):
+        if self.parent is None:
+            raise RootDeletedException
+        self.parent.delete_child(self.order)
+
+    def delete_clean(self):
+        parent = self.parent
+        self.detach()
+        if len(parent.children) == 0:
+            parent.delete_clean()
+
+    def bottom_up(self):
+        for child in self.children:
+            for node in child.bottom_up():
+                yield node
+        yield self
+
+    def leaves(self):
+        if len(self.children) == 0:
+            yield self
+        else:
+            for child in self.children:
+                for leaf in child.leaves():
+                    yield leaf
+
+
+class BaselineTree:
+    """ The recursive parser and node-based transformations of trees, as they were before. """
+    def __init__(self, root):
+        self.root = root
+
+    def __str__(self):
+        return self.root._subtree_str()
+
+    interior_node = compile(r"\s*\(([^\s)]*)")
+    close_brace = compile(r"\s*\)")
+    leaf_node = compile(r'\s*([^\s)]+)')
+
+    @staticmethod
+    def _scan_tree(s):
+        result = BaselineTree.interior_node.match(s)
+        if result is not None:
+            label = result.group(1)
+            pos = result.end()
+            children = []
+            (child, length) = BaselineTree._scan_tree(s[pos:])
+            while child is not None:
+                children.append(child)
+                pos += length
+                (child, length) = BaselineTree._scan_tree(s[pos:])
+
+            result = BaselineTree.close_brace.match(s[pos:])
+            if result is not None:
+                pos += result.end()
+                return BaselineNode(label, children), pos
+            else:
+                return None, 0
+        else:
+            result = BaselineTree.leaf_node.match(s)
+            if result is not None:
+                pos = result.end()
+                label = result.group(1)
+                return BaselineNode(label, []), pos
+            else:
+                return None, 0
+
+    @staticmethod
+    def from_str(s):
+        s = s.strip()
+        (tree, n) = BaselineTree._scan_tree(s)
+        return BaselineTree(tree)
+
+    def is_attached(self, node):
+        while node.parent is not None:
+            node = node.parent
+        return node is self.root
+
+    def remove_empty(self):
+        nodes = list(self.root.bottom_up())
+        for node in nodes:
+            # Unlike before, nodes that were already removed along with an empty ancestor are skipped; removing them
+            #   again raised RootDeletedException, which discarded the whole tree.
+            if node.label == '-NONE-' and self.is_attached(node):
+                try:
+                    node.delete_clean()
+                except RootDeletedException:
+                    self.root = None
+
+    def remove_unit(self):
+        nodes = list(self.root.bottom_up())
+        for node in nodes:
+            if len(node.children) == 1:
+                child = node.children[0]
+                if len(child.children) > 0:
+                    node.label = "%s_%s" % (node.label, child.label)
+                    child.detach()
+                    for grandchild in list(child.children):
+                        node.append_child(grandchild)
+
+    def restore_unit(self):
+        def visit(node):
+            children = [visit(child) for child in node.children]
+            labels = node.label.split('_')
+            node = BaselineNode(labels[-1], children)
+            for label in reversed(labels[:-1]):
+                node = BaselineNode(label, [node])
+            return node
+        self.root = visit(self.root)
+
+    def binarize_right(self):
+        nodes = list(self.root.bottom_up())
+        for node in nodes:
+            if len(node.children) > 2:
+                children = list(node.children)
+                children.reverse()
+                vlabel = node.label + "*"
+                prev = children[0]
+                for child in children[1:-1]:
+                    prev = BaselineNode(vlabel, [child, prev])
+                node.append_child(prev)
+
+    def binarize_left(self):
+        nodes = list(self.root.bottom_up())
+        for node in nodes:
+            if len(node.children) > 2:
+                vlabel = node.label + "*"
+                children = list(node.children)
+                prev = children[0]
+                for child in children[1:-1]:
+                    prev = BaselineNode(vlabel, [prev, child])
+                node.insert_child(0, prev)
+
+    def unbinarize(self):
+        def visit(node):
+            children = sum([visit(child) for child in node.children], [])
+            if node.label.endswith('*'):
+                return children
+            else:
+                return [BaselineNode(node.label, children)]
+        roots = visit(self.root)
+        assert len(roots) == 1
+        self.root = roots[0]
+
+
+TRANSFORMATIONS: List[str] = [
+    "binarize_left", "binarize_right", "remove_empty", "remove_unit", "restore_unit", "unbinarize"
+]
+
+
+# Before projection was implemented, it was specified as follows: each source character receives the slice of the
+#   target that ends just after the last target character aligned to it or before it (the final character receives the
+#   rest), each target token goes to the leaf in whose slice it starts, and the tree is then rebuilt around its leaves'
+#   tokens. This spells that out one character, token, and node at a time.
+def project_tree(source_line: str, revised_target_line: str, character_pairs: List[Tuple[int, int]]) -> str:
+    tree: BaselineTree = BaselineTree.from_str(source_line)
+    leaves: List[BaselineNode] = list(tree.root.leaves())
+    source_length: int = len(" ".join(leaf.label for leaf in leaves))
+    aligned_ends: Dict[int, int] = {source_index: target_index + 1 for source_index, target_index in character_pairs}
+    target_ends: List[int] = []
+    for source_index in range(source_length):
+        target_ends.append(max(aligned_ends.get(source_index, 0), target_ends[-1] if source_index > 0 else 0))
+    target_ends[-1] = len(revised_target_line)
+
+    leaf_starts: List[int] = []
+    character_index: int = 0
+    for leaf in leaves:
+        leaf_starts.append(target_ends[character_index - 1] if character_index > 0 else 0)
+        character_index += len(leaf.label) + 1
+    leaf_tokens: Dict[BaselineNode, List[str]] = {leaf: [] for leaf in leaves}
+    for token in finditer(r"\S+", revised_target_line):
+        leaf_index: int = max(index for index, leaf_start in enumerate(leaf_starts) if leaf_start <= token.start())
+        leaf_tokens[leaves[leaf_index]].append(token.group())
+
+    def visit(node: BaselineNode) -> List[BaselineNode]:
+        if len(node.children) == 0:
+            return [BaselineNode(token, []) for token in leaf_tokens[node]]
+        children: List[BaselineNode] = sum([visit(child) for child in node.children], [])
+        return [BaselineNode(node.label, children)] if len(children) > 0 else []
+
+    projected_roots: List[BaselineNode] = visit(tree.root)
+    return projected_roots[0]._subtree_str() if len(projected_roots) > 0 else ""
+
+
+class TestTrees(TestCase):
+    def generate_tree(self, random: Random, depth: int = 0) -> str:
+        if depth > 0 and (depth >= 5 or random.random() < 0.35):
+            return random.choice(["a", "bb", "ccc", "*T*", "don't", "«q»"])
+
+        label: str = random.choice(["S", "NP", "VP", "PP", "DT", "-NONE-", "NP-SBJ-1", "VERYLONGLABEL", ""])
+        child_count: int = random.choice([1, 1, 2, 3, 4, 6])
+        children: List[str] = [self.generate_tree(random, depth + 1) for _ in range(child_count)]
+        return "(%s %s)" % (label, " ".join(children))
+
+    def generate_path(self, random: Random, source_length: int, target_length: int) -> List[Tuple[int, int]]:
+        character_pairs: List[Tuple[int, int]] = []
+        source_index: int = 0
+        target_index: int = 0
+        while source_index < source_length and target_index < target_length:
+            step: float = random.random()
+            if step < 0.6:
+                character_pairs.append((source_index, target_index))
+            source_index += 1 if step < 0.8 else 0
+            target_index += 1 if step < 0.6 or step >= 0.8 else 0
+        return character_pairs
+
+    def test_parser(self):
+        random: Random = Random(23)
+        for _ in range(500):
+            tree_line: str = self.generate_tree(random)
+            # Whitespace around brackets and text after the first tree do not change the parse.
+            spaced_line: str = "  " + tree_line.replace(" ", random.choice([" ", "  ", "\t"])) + " (X y)"
+            with self.subTest(tree_line=spaced_line):
+                self.assertEqual(str(BaselineTree.from_str(spaced_line)), str(Tree.from_str(spaced_line)))
+
+    def test_transformations(self):
+        random: Random = Random(24)
+        for _ in range(500):
+            tree_line: str = self.generate_tree(random)
+            baseline_tree: BaselineTree = BaselineTree.from_str(tree_line)
+            tree: Tree = Tree.from_str(tree_line)
+            for transformation_name in random.sample(TRANSFORMATIONS, random.randint(1, len(TRANSFORMATIONS))):
+                getattr(baseline_tree, transformation_name)()
+                getattr(tree, transformation_name)()
+                if baseline_tree.root is None:
+                    self.assertIsNone(tree.root)
+                    break
+                with self.subTest(tree_line=tree_line, transformation=transformation_name):
+                    self.assertEqual(str(baseline_tree), str(tree))
+                    # Nodes taken from the tree agree with the compact tree that they were converted from.
+                    self.assertEqual(str(baseline_tree), tree.root._subtree_str())
+
+    def test_printer(self):
+        random: Random = Random(25)
+        for _ in range(500):
+            tree_line: str = self.generate_tree(random)
+            with self.subTest(tree_line=tree_line):
+                self.assertEqual(
+                    str(BaselineTree.from_str(tree_line).root._pretty_print()),
+                    format_tree(Tree.from_str(tree_line).root)
+                )
+
+    def test_projection(self):
+        random: Random = Random(26)
+        for _ in range(500):
+            tree_line: str = self.generate_tree(random)
+            tree_alignment: TreeAlignment = TreeAlignment(tree_line)
+            revised_target_line: str = " ".join(
+                random.choice(["a", "b", "bc", "ccc", "*T*", "do", "n't"]) for _ in range(random.randint(1, 12))
+            )
+            character_pairs: List[Tuple[int, int]] = self.generate_path(
+                random, len(tree_alignment.get_characters()), len(revised_target_line)
+            )
+            tree_alignment.project(revised_target_line, AlignmentPath.from_pairs(character_pairs))
+            with self.subTest(tree_line=tree_line, revised_target_line=revised_target_line):
+                self.assertEqual(project_tree(tree_line, revised_target_line, character_pairs), str(tree_alignment))
+
+
+if __name__ == "__main__":
+    main()
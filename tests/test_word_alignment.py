@@ -0,0 +1,181 @@
+from collections import defaultdict
+from random import Random
+from typing import Dict, List, Set, Tuple
+from unittest import TestCase, main
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.modes.word import WordAlignment
+
+
+class ReferenceWordAlignment:
+    """ Word mode spelled out one character at a time; each character keeps the list of its word's links. """
+    def __init__(self, source_line: str, is_flipped: bool = False):
+        self.is_flipped = is_flipped
+
+        fields = source_line.split("\t")
+        self.source_words = fields[0].split()
+        self.target_words = fields[1].split()
+        if is_flipped is True:
+            self.source_words, self.target_words = self.target_words, self.source_words
+
+        word_links: Dict[int, List[int]] = {}
+        for link in fields[2].split():
+            source_index, target_index = (int(index) for index in link.split("-", 1))
+            if is_flipped is True:
+                source_index, target_index = target_index, source_index
+            if target_index not in word_links.setdefault(source_index, []):
+                word_links[source_index].append(target_index)
+
+        self.source_characters = " ".join(self.source_words)
+        self.character_links: List[List[int]] = []
+        for source_index, source_word in enumerate(self.source_words):
+            if source_index > 0:
+                self.character_links.append([])
+            self.character_links.extend(word_links.get(source_index, []) for _ in source_word)
+
+    # Each word lists its characters' links in the order in which they first occur, from left to right.
+    def __str__(self):
+        alignment: List[Tuple[int, int]] = []
+        character_index: int = 0
+        for source_index, source_word in enumerate(self.source_words):
+            if source_index > 0:
+                character_index += 1
+            listed_links: List[int] = []
+            for links in self.character_links[character_index:(character_index + len(source_word))]:
+                listed_links.extend(link for link in links if link not in listed_links)
+            alignment.extend((source_index, target_index) for target_index in listed_links)
+            character_index += len(source_word)
+
+        links: str = " ".join(
+            "%s-%s" % ((source_index, target_index) if self.is_flipped is False else (target_index, source_index))
+            for source_index, target_index in alignment
+        )
+        if self.is_flipped is False:
+            return "%s\t%s\t%s" % (self.source_characters, " ".join(self.target_words), links)
+        return "%s\t%s\t%s" % (" ".join(self.target_words), self.source_characters, links)
+
+    def project(self, revised_target_line: str, character_alignment: List[Tuple[int, int]]):
+        character_links: List[List[int]] = [[] for _ in revised_target_line]
+        for source_character_index, target_character_index in character_alignment:
+            character_links[target_character_index] = self.character_links[source_character_index]
+        self.character_links = character_links
+        self.source_characters = revised_target_line
+        self.source_words = revised_target_line.split()
+
+
+# Before links were kept per word, each character held a set of them; every word still receives the same links,
+#   although they were written in the order in which each word's set happened to iterate.
+def collect_baseline_links(source_line: str, character_alignments: List[List[Tuple[int, int]]],
+                           revised_target_lines: List[str]) -> List[Set[Tuple[int, int]]]:
+    fields = source_line.split("\t")
+    source_words = fields[0].split()
+    alignment = defaultdict(set)
+    for a in fields[2].split():
+        source_index, target_index = a.split('-', 1)
+        alignment[int(source_index)].add(int(target_index))
+
+    character_sets = defaultdict(set)
+    character_index: int = 0
+    for source_index, source_word in enumerate(source_words):
+        if source_index > 0:
+            character_index += 1
+        for offset in range(len(source_word)):
+            character_sets[character_index + offset] |= alignment[source_index]
+        character_index += len(source_word)
+
+    for character_alignment, revised_target_line in zip(character_alignments, revised_target_lines):
+        projected_sets = defaultdict(set)
+        for source_character_index, target_character_index in character_alignment:
+            projected_sets[target_character_index] |= character_sets[source_character_index]
+        character_sets = projected_sets
+        source_words = revised_target_line.split()
+
+    word_links: List[Set[Tuple[int, int]]] = []
+    character_index = 0
+    for source_index, source_word in enumerate(source_words):
+        if source_index > 0:
+            character_index += 1
+        word_links.append({
+            (source_index, target_index)
+            for offset in range(len(source_word)) for target_index in character_sets[character_index + offset]
+        })
+        character_index += len(source_word)
+    return word_links
+
+
+def parse_links(word_line: str, word_count: int) -> List[Set[Tuple[int, int]]]:
+    word_links: List[Set[Tuple[int, int]]] = [set() for _ in range(word_count)]
+    for link in word_line.split("\t")[2].split():
+        source_index, target_index = (int(index) for index in link.split("-", 1))
+        word_links[source_index].add((source_index, target_index))
+    return word_links
+
+
+# Large link sets, repeated links, and target words made up of several source words all bear on the order of links.
+class TestWordAlignment(TestCase):
+    def generate_words(self, random: Random, word_count: int) -> List[str]:
+        return ["".join(random.choice("abcxyz") for _ in range(random.randint(1, 8))) for _ in range(word_count)]
+
+    def generate_line(self, random: Random, is_flipped: bool) -> str:
+        source_words: List[str] = self.generate_words(random, random.randint(1, random.choice([3, 15])))
+        target_words: List[str] = self.generate_words(random, random.randint(1, 40))
+        links: List[str] = []
+        for _ in range(random.randint(0, random.choice([60, 200]))):
+            source_index: int = random.randrange(len(source_words))
+            target_index: int = random.choice([
+                random.randrange(64), random.randrange(64) * random.choice([8, 16, 32, 64]), random.randrange(1500)
+            ])
+            links.append(f"{source_index}-{target_index}" if is_flipped is False else f"{target_index}-{source_index}")
+        fields: List[str] = [" ".join(source_words), " ".join(target_words), " ".join(links)]
+        if is_flipped is True:
+            fields[0], fields[1] = fields[1], fields[0]
+        return "\t".join(fields)
+
+    def generate_path(self, random: Random, source_length: int, target_length: int) -> List[Tuple[int, int]]:
+        character_pairs: List[Tuple[int, int]] = []
+        source_index: int = 0
+        target_index: int = 0
+        while source_index < source_length and target_index < target_length:
+            step: float = random.random()
+            if step < 0.6:
+                character_pairs.append((source_index, target_index))
+            source_index += 1 if step < 0.8 else 0
+            target_index += 1 if step < 0.6 or step >= 0.8 else 0
+        return character_pairs
+
+    def test_lists_links_in_order_of_first_occurrence(self):
+        random: Random = Random(21)
+        for _ in range(2000):
+            is_flipped: bool = random.random() < 0.3
+            source_line: str = self.generate_line(random, is_flipped)
+            reference_alignment: ReferenceWordAlignment = ReferenceWordAlignment(source_line, is_flipped=is_flipped)
+            word_alignment: WordAlignment = WordAlignment(source_line, is_flipped=is_flipped)
+            self.assertEqual(str(reference_alignment), str(word_alignment))
+
+            for _ in range(random.randint(1, 2)):
+                revised_target_line: str = " ".join(self.generate_words(random, random.randint(1, 14)))
+                character_pairs: List[Tuple[int, int]] = self.generate_path(
+                    random, len(word_alignment.get_characters()), len(revised_target_line)
+                )
+                reference_alignment.project(revised_target_line, character_pairs)
+                word_alignment.project(revised_target_line, AlignmentPath.from_pairs(character_pairs))
+                self.assertEqual(str(reference_alignment), str(word_alignment))
+
+    def test_links_match_baseline(self):
+        random: Random = Random(22)
+        for _ in range(1000):
+            source_line: str = self.generate_line(random, False)
+            word_alignment: WordAlignment = WordAlignment(source_line)
+            revised_target_line: str = " ".join(self.generate_words(random, random.randint(1, 14)))
+            character_pairs: List[Tuple[int, int]] = self.generate_path(
+                random, len(word_alignment.get_characters()), len(revised_target_line)
+            )
+            word_alignment.project(revised_target_line, AlignmentPath.from_pairs(character_pairs))
+            self.assertEqual(
+                collect_baseline_links(source_line, [character_pairs], [revised_target_line]),
+                parse_links(str(word_alignment), len(revised_target_line.split()))
+            )
+
+
+if __name__ == "__main__":
+    main()
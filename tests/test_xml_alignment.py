@@ -0,0 +1,182 @@
+from random import Random
+from re import split
+from string import punctuation
+from typing import Callable, Dict, List, Tuple, Union
+from unittest import TestCase, main
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element
+from xml.sax.saxutils import escape, quoteattr
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.modes.xml import XMLAlignment
+from utils.segmentation.interface import DIVIDING_PUNCTUATION, SEGMENTATION_FUNCTIONS
+
+
+def segment_by_characters(string: str, characters: List[str]) -> List[str]:
+    segmentation_regex: str = f"([^{''.join(characters)}]+[{''.join(characters)}][\\s]+)"
+    segments: List[str] = split(segmentation_regex, string)
+    return [segment for segment in segments if segment != '']
+
+
+# The segmenters as they were before their regexes were compiled once.
+BASELINE_SEGMENTATION_FUNCTIONS: Dict[str, Callable] = {
+    "dividing-punctuation": lambda string: segment_by_characters(string, DIVIDING_PUNCTUATION),
+    "identity": lambda string: [string],
+    "punctuation": lambda string: segment_by_characters(string, [character for character in punctuation])
+}
+
+
+class BaselineXMLAlignment:
+    """ Projection and segmentation as they were before the text was indexed and the output streamed. """
+    def __init__(self, source_line: str, segmentation_function: Union[Callable, None]):
+        self.xml: Element = ElementTree.fromstring(source_line)
+        self.segmentation_function: Union[Callable, None] = segmentation_function
+
+    def __str__(self):
+        if self.segmentation_function is not None:
+            self.postprocess(self.xml)
+        return ElementTree.tostring(self.xml, encoding='unicode', method='xml')
+
+    def get_characters(self):
+        return ElementTree.tostring(self.xml, encoding='unicode', method='text')
+
+    def project(self, revised_target_line: str, character_alignment: List[Tuple[int, int]]):
+        subsequences: List[str] = []
+        source_index = target_index = 0
+        for alignment_index, alignment in enumerate(character_alignment):
+            while source_index < alignment[0]:
+                subsequences.append('')
+                source_index += 1
+            subsequences.append(revised_target_line[target_index:(alignment[1] + 1)])
+            source_index += 1
+            target_index = alignment[1] + 1
+
+        while source_index < len(self.get_characters()):
+            subsequences.append('')
+            source_index += 1
+
+        subsequences[-1] += revised_target_line[target_index:]
+
+        # Unlike before, a node without text (whose text is None) is treated as if its text were empty.
+        def visit(node: Element, source_text_index: int):
+            node_length: int = len(node.text or "")
+            node.text = ''.join(subsequences[source_text_index:(source_text_index + node_length)])
+            source_text_index += node_length
+            for child in node:
+                source_text_index = visit(child, source_text_index)
+            if node.tail is not None:
+                tail_length: int = len(node.tail)
+                node.tail = ''.join(subsequences[source_text_index:(source_text_index + tail_length)])
+                source_text_index += tail_length
+            return source_text_index
+
+        visit(self.xml, 0)
+
+    def postprocess(self, current_node: Element, nesting_depth: int = 1, subsequent_children: int = 0):
+        start_tabs: str = "\t" * nesting_depth
+        end_tabs: str = "\t" * (nesting_depth - 1)
+        # As above, a missing text is segmented as if it were empty.
+        segmented_node_text: List[str] = self.segmentation_function(current_node.text or "")
+        current_node.text = "".join([("\n" + start_tabs + segment) for segment in segmented_node_text])
+
+        child_count: int = len(current_node)
+        if child_count > 0:
+            current_node.text += "\n" + start_tabs
+            for current_child_count, child in enumerate(current_node, 1):
+                self.postprocess(child, nesting_depth + 1, child_count - current_child_count)
+        else:
+            current_node.text += "\n" + end_tabs
+
+        if current_node.tail is not None:
+            if subsequent_children > 0:
+                outside_tabs: str = end_tabs
+            else:
+                outside_tabs = "\t" * max(0, nesting_depth - 2)
+
+            segmented_tail_text: List[str] = self.segmentation_function(current_node.tail)
+            current_node.tail = "".join([("\n" + end_tabs + segment) for segment in segmented_tail_text])
+            current_node.tail += "\n" + outside_tabs
+
+
+class TestXMLAlignment(TestCase):
+    def generate_text(self, random: Random) -> str:
+        if random.random() < 0.3:
+            return ""
+        return "".join(
+            random.choice(["a", "b", " ", "Wait. ", "Why? ", "no! ", "x: ", "& ", "<", "«q»", "\t"])
+            for _ in range(random.randint(1, 8))
+        )
+
+    def generate_element(self, random: Random, depth: int = 0, namespace: Union[str, None] = None) -> str:
+        tag: str = random.choice(["p", "s", "w", "note"])
+        if namespace is not None and random.random() < 0.5:
+            tag = f"tei:{tag}"
+        attributes: str = "".join(
+            f" {name}={quoteattr(self.generate_text(random))}"
+            for name in random.sample(["n", "type", "rend"], random.randint(0, 2))
+        )
+        if depth == 0 and namespace is not None:
+            attributes += f' xmlns:tei="{namespace}"'
+
+        parts: List[str] = [escape(self.generate_text(random))]
+        for _ in range(random.choice([0, 0, 1, 2, 3]) if depth < 4 else 0):
+            parts.append(self.generate_element(random, depth + 1, namespace))
+            parts.append(escape(self.generate_text(random)))
+        return f"<{tag}{attributes}>{''.join(parts)}</{tag}>"
+
+    def generate_document(self, random: Random) -> str:
+        return self.generate_element(random, namespace="http://www.tei-c.org/ns/1.0" if random.random() < 0.3 else None)
+
+    def generate_path(self, random: Random, source_length: int, target_length: int) -> List[Tuple[int, int]]:
+        character_pairs: List[Tuple[int, int]] = []
+        source_index: int = 0
+        target_index: int = 0
+        while source_index < source_length and target_index < target_length:
+            step: float = random.random()
+            if step < 0.6:
+                character_pairs.append((source_index, target_index))
+            source_index += 1 if step < 0.8 else 0
+            target_index += 1 if step < 0.6 or step >= 0.8 else 0
+        return character_pairs
+
+    def test_serializer(self):
+        random: Random = Random(20)
+        for _ in range(500):
+            document: str = self.generate_document(random)
+            for segmentation_name in [None] + sorted(SEGMENTATION_FUNCTIONS):
+                baseline_alignment: BaselineXMLAlignment = BaselineXMLAlignment(
+                    document, BASELINE_SEGMENTATION_FUNCTIONS[segmentation_name] if segmentation_name else None
+                )
+                xml_alignment: XMLAlignment = XMLAlignment(
+                    document,
+                    segmentation_function=SEGMENTATION_FUNCTIONS[segmentation_name] if segmentation_name else None
+                )
+                with self.subTest(document=document, segmentation=segmentation_name):
+                    self.assertEqual(str(baseline_alignment), str(xml_alignment))
+
+    def test_projection(self):
+        random: Random = Random(18)
+        for _ in range(500):
+            document: str = self.generate_document(random)
+            baseline_alignment: BaselineXMLAlignment = BaselineXMLAlignment(document, None)
+            xml_alignment: XMLAlignment = XMLAlignment(document, segmentation_function=None)
+            self.assertEqual(baseline_alignment.get_characters(), xml_alignment.get_characters())
+
+            # A second projection starts from the spans that the first one left behind. Documents without text
+            #   have nothing to project.
+            for _ in range(random.randint(1, 2)):
+                if len(xml_alignment.get_characters()) == 0:
+                    break
+                revised_target_line: str = " ".join(self.generate_text(random).split())
+                character_pairs: List[Tuple[int, int]] = self.generate_path(
+                    random, len(xml_alignment.get_characters()), len(revised_target_line)
+                )
+                baseline_alignment.project(revised_target_line, character_pairs)
+                xml_alignment.project(revised_target_line, AlignmentPath.from_pairs(character_pairs))
+                with self.subTest(document=document, revised_target_line=revised_target_line):
+                    self.assertEqual(str(baseline_alignment), str(xml_alignment))
+                    self.assertEqual(baseline_alignment.get_characters(), xml_alignment.get_characters())
+
+
+if __name__ == "__main__":
+    main()
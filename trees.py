@@ -1,11 +1,42 @@
+from argparse import ArgumentParser, Namespace
+from multiprocessing import Pool
+from sys import stdin, stdout
+from typing import TextIO
+
 from utils.algorithms.data_structures.tree import Tree
+from utils.cli.constants import TreesHelpMessage
+
+
+# In parallel, lines are sent to the processes this many at a time.
+DEFAULT_CHUNK_SIZE: int = 64
+
+
+# Each tree is followed by a blank line; lines that do not hold a tree produce no output.
+def format_tree_line(line: str) -> str:
+    tree: Tree = Tree.from_str(line)
+    return f"{tree.pretty_print()}\n\n" if tree.root is not None else ""
 
 
 if __name__ == "__main__":
-    import sys
-    for line in sys.stdin:
-        t = Tree.from_str(line)
-        if t.root is not None:
-            print(t.pretty_print())
-            print()
-            
+    parser: ArgumentParser = ArgumentParser()
+    parser.add_argument("input", type=str, nargs="?", default=None, help=TreesHelpMessage.INPUT.value)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=TreesHelpMessage.CHUNK_SIZE.value)
+    parser.add_argument("--processes", type=int, default=1, help=TreesHelpMessage.PROCESSES.value)
+    args: Namespace = parser.parse_args()
+
+    input_file: TextIO = open(args.input, mode="r", encoding="utf-8") if args.input is not None else stdin
+    if args.chunk_size < 1:
+        raise ValueError("An invalid chunk size was supplied. Please supply a value greater than 0.")
+    elif args.processes > 1:
+        # The trees are printed in the order of their lines, however the work is divided among the processes.
+        with Pool(processes=args.processes) as pool:
+            for formatted_tree in pool.imap(format_tree_line, input_file, chunksize=args.chunk_size):
+                stdout.write(formatted_tree)
+    elif args.processes == 1:
+        for line in input_file:
+            stdout.write(format_tree_line(line))
+    else:
+        raise ValueError("An invalid number of processes was supplied. Please supply a value greater than 0.")
+
+    if args.input is not None:
+        input_file.close()
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from functools import partial
+from hashlib import sha256
+from os import getpid, makedirs, path
+from sqlite3 import Connection, OperationalError, connect
+from time import time
+from typing import Callable, Dict, Sequence, Tuple, Union
+from zlib import compress, decompress
+
+from numpy import frombuffer, int32
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+
+
+# This version is part of every key; it should be raised whenever an engine's output changes for the same input.
+ENGINE_VERSION: int = 1
+CACHE_FILENAME: str = "alignments.sqlite"
+DEFAULT_MEMORY_TIER_SIZE: int = 64 << 20
+# The on-disk tier is only trimmed back to its size limit after this many insertions.
+EVICTION_INTERVAL: int = 256
+
+
+def describe_callable(function: Callable) -> str:
+    if isinstance(function, partial):
+        bound_options: str = ", ".join(
+            f"{option_name}={describe_callable(option_value) if callable(option_value) else repr(option_value)}"
+            for option_name, option_value in sorted(function.keywords.items())
+        )
+        return f"{describe_callable(function.func)}({bound_options})"
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def encode_path(alignment_path: AlignmentPath) -> bytes:
+    return compress(alignment_path.source_indices.tobytes() + alignment_path.target_indices.tobytes())
+
+
+def decode_path(path_bytes: bytes) -> AlignmentPath:
+    indices = frombuffer(decompress(path_bytes), dtype=int32)
+    return AlignmentPath(indices[:(len(indices) // 2)], indices[(len(indices) // 2):])
+
+
+class AlignmentCache:
+    """
+    A content-addressed store of alignment paths, with a bounded in-process LRU tier in front of an SQLite database
+    which every process opens separately, so that the workers of a pool share what any of them has aligned.
+    """
+    def __init__(self, cache_directory: str, disk_tier_size: int, memory_tier_size: int = DEFAULT_MEMORY_TIER_SIZE):
+        self.cache_directory: str = cache_directory
+        self.disk_tier_size: int = disk_tier_size
+        self.memory_tier_size: int = memory_tier_size
+        self.memory_tier: OrderedDict = OrderedDict()
+        self.memory_tier_usage: int = 0
+        self.insertions: int = 0
+        self.connection: Union[Connection, None] = None
+        self.connection_pid: Union[int, None] = None
+
+    # Only the settings travel to pool workers; each worker reopens the database and starts its own memory tier.
+    def __getstate__(self) -> Dict[str, Union[str, int]]:
+        return {
+            "cache_directory": self.cache_directory,
+            "disk_tier_size": self.disk_tier_size,
+            "memory_tier_size": self.memory_tier_size
+        }
+
+    def __setstate__(self, state: Dict[str, Union[str, int]]):
+        self.__init__(state["cache_directory"], state["disk_tier_size"], state["memory_tier_size"])
+
+    @staticmethod
+    def make_key(source: Sequence[str], destination: Sequence[str], cost: Callable, engine: Callable) -> str:
+        key_hash = sha256()
+        for key_part in ("".join(source), "".join(destination), describe_callable(cost), describe_callable(engine),
+                         str(ENGINE_VERSION)):
+            encoded_part: bytes = key_part.encode("utf-8", errors="surrogatepass")
+            key_hash.update(len(encoded_part).to_bytes(8, byteorder="little"))
+            key_hash.update(encoded_part)
+        return key_hash.hexdigest()
+
+    def get_connection(self) -> Connection:
+        if self.connection is None or self.connection_pid != getpid():
+            makedirs(self.cache_directory, exist_ok=True)
+            self.connection = connect(path.join(self.cache_directory, CACHE_FILENAME), timeout=60)
+            self.connection_pid = getpid()
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS alignments "
+                "(key TEXT PRIMARY KEY, path BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS alignments_by_use ON alignments (last_used)")
+            self.connection.commit()
+        return self.connection
+
+    def remember(self, key: str, path_bytes: bytes):
+        if key in self.memory_tier:
+            self.memory_tier.move_to_end(key)
+            return
+
+        self.memory_tier[key] = path_bytes
+        self.memory_tier_usage += len(path_bytes)
+        while self.memory_tier_usage > self.memory_tier_size and len(self.memory_tier) > 0:
+            _, evicted_bytes = self.memory_tier.popitem(last=False)
+            self.memory_tier_usage -= len(evicted_bytes)
+
+    def get(self, key: str) -> Union[AlignmentPath, None]:
+        path_bytes: Union[bytes, None] = self.memory_tier.get(key)
+        if path_bytes is not None:
+            self.memory_tier.move_to_end(key)
+            return decode_path(path_bytes)
+
+        connection: Connection = self.get_connection()
+        row: Union[Tuple[bytes], None] = connection.execute(
+            "SELECT path FROM alignments WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            connection.execute("UPDATE alignments SET last_used = ? WHERE key = ?", (time(), key))
+            connection.commit()
+        except OperationalError:
+            # Another process holds the write lock; the entry just keeps its older timestamp.
+            connection.rollback()
+        self.remember(key, row[0])
+        return decode_path(row[0])
+
+    def put(self, key: str, alignment_path: AlignmentPath):
+        path_bytes: bytes = encode_path(alignment_path)
+        self.remember(key, path_bytes)
+        connection: Connection = self.get_connection()
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO alignments (key, path, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, path_bytes, len(path_bytes), time())
+            )
+            connection.commit()
+        except OperationalError:
+            connection.rollback()
+            return
+
+        self.insertions += 1
+        if self.insertions % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    # The least recently used entries are removed until the database holds at most disk_tier_size bytes of paths.
+    def evict(self):
+        connection: Connection = self.get_connection()
+        try:
+            total_size: int = connection.execute("SELECT COALESCE(SUM(size), 0) FROM alignments").fetchone()[0]
+            if total_size > self.disk_tier_size:
+                connection.execute(
+                    "DELETE FROM alignments WHERE key IN (SELECT key FROM ("
+                    "SELECT key, SUM(size) OVER (ORDER BY last_used DESC) AS newer_size FROM alignments"
+                    ") WHERE newer_size > ?)", (self.disk_tier_size,)
+                )
+            connection.commit()
+        except OperationalError:
+            connection.rollback()
+
+    def close(self):
+        if self.connection is not None and self.connection_pid == getpid():
+            self.evict()
+            self.connection.close()
+        self.connection = None
@@ -0,0 +1,111 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple, Union
+
+from numpy import arange
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+
+
+# Anchors are exact matches of at least this many characters which occur exactly once on either side.
+DEFAULT_ANCHOR_LENGTH: int = 32
+
+
+def find_unique_substrings(text: str, anchor_length: int) -> Dict[str, int]:
+    positions: Dict[str, int] = {}
+    repeated_substrings: Set[str] = set()
+    for position in range(len(text) - anchor_length + 1):
+        substring: str = text[position:(position + anchor_length)]
+        if substring in positions:
+            repeated_substrings.add(substring)
+        else:
+            positions[substring] = position
+
+    for substring in repeated_substrings:
+        del positions[substring]
+    return positions
+
+
+# As in patience diff, we keep the longest chain of matches that is increasing on both sides.
+def find_increasing_chain(matches: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    pile_tops: List[int] = []
+    pile_indices: List[int] = []
+    predecessors: List[int] = []
+    for match_index, (_, destination_position) in enumerate(matches):
+        pile_index: int = bisect_left(pile_tops, destination_position)
+        predecessors.append(pile_indices[pile_index - 1] if pile_index > 0 else -1)
+        if pile_index == len(pile_tops):
+            pile_tops.append(destination_position)
+            pile_indices.append(match_index)
+        else:
+            pile_tops[pile_index] = destination_position
+            pile_indices[pile_index] = match_index
+
+    chain: List[Tuple[int, int]] = []
+    match_index = pile_indices[-1] if len(pile_indices) > 0 else -1
+    while match_index >= 0:
+        chain.append(matches[match_index])
+        match_index = predecessors[match_index]
+    chain.reverse()
+    return chain
+
+
+# Each anchor is a triple (source start, destination start, length); anchors never overlap on either side.
+def find_anchors(source: Sequence[str], destination: Sequence[str], anchor_length: int) -> \
+        List[Tuple[int, int, int]]:
+    source_substrings: Dict[str, int] = find_unique_substrings("".join(source), anchor_length)
+    destination_substrings: Dict[str, int] = find_unique_substrings("".join(destination), anchor_length)
+    matches: List[Tuple[int, int]] = sorted(
+        (source_position, destination_substrings[substring])
+        for substring, source_position in source_substrings.items() if substring in destination_substrings
+    )
+
+    anchors: List[Tuple[int, int, int]] = []
+    source_end: int = 0
+    destination_end: int = 0
+    for source_position, destination_position in find_increasing_chain(matches):
+        if len(anchors) > 0:
+            anchor_source, anchor_destination, current_length = anchors[-1]
+            # Overlapping matches on the same diagonal extend the current anchor.
+            if source_position - anchor_source == destination_position - anchor_destination and \
+                    source_position <= source_end:
+                anchors[-1] = (anchor_source, anchor_destination, source_position + anchor_length - anchor_source)
+                source_end = source_position + anchor_length
+                destination_end = destination_position + anchor_length
+                continue
+
+        if source_position >= source_end and destination_position >= destination_end:
+            anchors.append((source_position, destination_position, anchor_length))
+            source_end = source_position + anchor_length
+            destination_end = destination_position + anchor_length
+    return anchors
+
+
+def align_by_anchors(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                     gap_engine: Callable, anchor_length: int = DEFAULT_ANCHOR_LENGTH,
+                     statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    if anchor_length < 1:
+        raise ValueError(f"The anchor length <{anchor_length}> is too small; it should be at least 1.")
+
+    anchors: List[Tuple[int, int, int]] = find_anchors(source, destination, anchor_length)
+    path_segments: List[AlignmentPath] = []
+    source_start: int = 0
+    destination_start: int = 0
+    anchored_length: int = 0
+    # Anchors are aligned character by character; the gaps between them are aligned with the gap engine.
+    for anchor_source, anchor_destination, current_length in anchors + [(len(source), len(destination), 0)]:
+        gap_path: AlignmentPath = gap_engine(
+            source[source_start:anchor_source], destination[destination_start:anchor_destination], cost, data_type
+        )
+        path_segments.append(gap_path.shift(source_start, destination_start))
+        anchor_offsets: NDArray[int] = arange(current_length)
+        path_segments.append(AlignmentPath(anchor_source + anchor_offsets, anchor_destination + anchor_offsets))
+        source_start = anchor_source + current_length
+        destination_start = anchor_destination + current_length
+        anchored_length += current_length
+
+    if statistics is not None:
+        total_length: int = len(source) + len(destination)
+        statistics["anchor_count"] = len(anchors)
+        statistics["anchor_coverage"] = round(2 * anchored_length / total_length, 4) if total_length > 0 else 0.0
+    return AlignmentPath.concatenate(path_segments)
@@ -0,0 +1,164 @@
+from math import inf
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from numpy import arange, concatenate, cumsum, dtype, full, int8, isfinite, zeros
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.linear_space_edit_distance import align_in_linear_space
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.options.edits import EditOperation
+from utils.algorithms.wavefront_edit_distance import select_edit_operations
+from utils.profiling.phase_profiler import measure_phase
+
+
+# The band first extends this many diagonals beyond the ones between (0, 0) and (n, m); it then doubles as needed.
+INITIAL_BAND_RADIUS: int = 8
+
+
+def get_band_type(data_type: str) -> DTypeLike:
+    # Cells outside the band are treated as unreachable, which requires a type that can represent infinity.
+    band_type: DTypeLike = dtype(data_type) if dtype(data_type).kind == "f" else dtype("float64")
+    return band_type
+
+
+# The band is stored band-major: row i of the band holds chart[i, i + lower_diagonal:i + upper_diagonal + 1],
+#   with one extra (unreachable) entry on either side so that neighboring diagonals never need bounds checks.
+def fill_band(source_ids: NDArray[int], destination_ids: NDArray[int], cost_model: CostModel, lower_diagonal: int,
+              upper_diagonal: int, band_type: DTypeLike) -> Tuple[NDArray[float], NDArray[int]]:
+    source_length: int = len(source_ids)
+    destination_length: int = len(destination_ids)
+    band_shape: Tuple[int, int] = (source_length + 1, upper_diagonal - lower_diagonal + 3)
+    band: NDArray[float] = full(band_shape, inf, dtype=band_type)
+    pointer_band: NDArray[int] = zeros(band_shape, dtype=int8)
+
+    top_columns: NDArray[int] = arange(min(destination_length, upper_diagonal) + 1)
+    band[0, top_columns - lower_diagonal + 1] = concatenate(
+        ([0], cumsum(cost_model.insertion_costs[destination_ids[:top_columns[-1]]], dtype=band_type))
+    )
+    left_rows: NDArray[int] = arange(min(source_length, -lower_diagonal) + 1)
+    band[left_rows, -left_rows - lower_diagonal + 1] = concatenate(
+        ([0], cumsum(cost_model.deletion_costs[source_ids[:left_rows[-1]]], dtype=band_type))
+    )
+
+    for diagonal in range(2, source_length + destination_length + 1):
+        first_row: int = max(1, diagonal - destination_length, -((upper_diagonal - diagonal) // 2))
+        last_row: int = min(source_length, diagonal - 1, (diagonal - lower_diagonal) // 2)
+        if first_row > last_row:
+            continue
+
+        rows: NDArray[int] = arange(first_row, last_row + 1)
+        columns: NDArray[int] = diagonal - rows
+        offsets: NDArray[int] = columns - rows - lower_diagonal + 1
+        row_ids: NDArray[int] = source_ids[rows - 1]
+        column_ids: NDArray[int] = destination_ids[columns - 1]
+        band[rows, offsets], pointer_band[rows, offsets] = select_edit_operations(
+            band[rows - 1, offsets] + cost_model.substitution_costs[row_ids, column_ids],
+            band[rows - 1, offsets + 1] + cost_model.deletion_costs[row_ids],
+            band[rows, offsets - 1] + cost_model.insertion_costs[column_ids]
+        )
+
+    return band, pointer_band
+
+
+# Any path that leaves the band must make enough insertions and deletions to reach the first diagonal outside it
+#   and to come back to the diagonal of (n, m); this gives a lower bound on its cost.
+def compute_exit_cost(source_ids: NDArray[int], destination_ids: NDArray[int], cost_model: CostModel,
+                      lower_diagonal: int, upper_diagonal: int) -> float:
+    minimum_deletion: float = cost_model.deletion_costs[source_ids].min().item()
+    minimum_insertion: float = cost_model.insertion_costs[destination_ids].min().item()
+    final_diagonal: int = len(destination_ids) - len(source_ids)
+    exit_cost: float = inf
+    if upper_diagonal < len(destination_ids):
+        upper_exit: int = upper_diagonal + 1
+        exit_cost = min(exit_cost, upper_exit * minimum_insertion + (upper_exit - final_diagonal) * minimum_deletion)
+    if lower_diagonal > -len(source_ids):
+        lower_exit: int = lower_diagonal - 1
+        exit_cost = min(exit_cost, -lower_exit * minimum_deletion + (final_diagonal - lower_exit) * minimum_insertion)
+    return exit_cost
+
+
+def collect_band_alignment_path(pointer_band: NDArray[int], lower_diagonal: int, source_length: int,
+                                destination_length: int) -> AlignmentPath:
+    source_indices: List[int] = []
+    target_indices: List[int] = []
+    current_row: int = source_length
+    current_column: int = destination_length
+    while current_row > 0 and current_column > 0:
+        pointer: int = pointer_band.item(current_row, current_column - current_row - lower_diagonal + 1)
+        if pointer == EditOperation.SUBSTITUTE:
+            current_row -= 1
+            current_column -= 1
+            source_indices.append(current_row)
+            target_indices.append(current_column)
+        elif pointer == EditOperation.DELETE:
+            current_row -= 1
+        elif pointer == EditOperation.INSERT:
+            current_column -= 1
+        else:
+            raise ValueError(f"A pointer was not stored for <{(current_row, current_column)}>.")
+    return AlignmentPath.from_traceback(source_indices, target_indices)
+
+
+# Each band takes one entry and one pointer per cell, with the extra entry on either side of every row.
+def measure_band(source_length: int, lower_diagonal: int, upper_diagonal: int, band_type: DTypeLike) -> int:
+    return (source_length + 1) * (upper_diagonal - lower_diagonal + 3) * (band_type.itemsize + 1)
+
+
+# Following Ukkonen, we only fill a diagonal band of the chart, doubling its radius until every path leaving the band
+#   provably costs more than the best path inside it. Since such a band contains every optimal path,
+#   the resulting alignment is the same as the one recovered from the full chart. With a memory budget, a band
+#   that would not fit is never allocated; the pair goes to the linear-space engine instead, which finds the same path.
+def align_in_band(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                  memory_budget: Union[int, None] = None,
+                  statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    source_length: int = len(source)
+    destination_length: int = len(destination)
+    if source_length == 0 or destination_length == 0:
+        return AlignmentPath.from_pairs([])
+
+    band_type: DTypeLike = get_band_type(data_type)
+    cost_model: CostModel = compile_cost_model(cost, source, destination, band_type.name)
+    source_ids: NDArray[int] = cost_model.encode(source)
+    destination_ids: NDArray[int] = cost_model.encode(destination)
+
+    band_radius: int = INITIAL_BAND_RADIUS
+    band_passes: int = 0
+    band_cells: int = 0
+    while True:
+        lower_diagonal: int = max(-source_length, min(0, destination_length - source_length) - band_radius)
+        upper_diagonal: int = min(destination_length, max(0, destination_length - source_length) + band_radius)
+        # The previous band is released before the next one (or the linear-space engine's rows) is allocated.
+        band = pointer_band = None
+        if memory_budget is not None and \
+                measure_band(source_length, lower_diagonal, upper_diagonal, band_type) > memory_budget:
+            if not isfinite(cost_model.insertion_costs).all():
+                raise ValueError(f"The band of width <{upper_diagonal - lower_diagonal + 1}> does not fit within "
+                                 f"the memory budget of <{memory_budget}> bytes, and the linear-space engine "
+                                 f"cannot take its place.")
+            if statistics is not None:
+                statistics["band_passes"] = band_passes
+                statistics["band_fallback"] = "hirschberg"
+            return align_in_linear_space(source, destination, cost, data_type, statistics=statistics)
+
+        band, pointer_band = \
+            fill_band(source_ids, destination_ids, cost_model, lower_diagonal, upper_diagonal, band_type)
+        band_passes += 1
+        band_cells += band.size
+
+        total_cost: float = band[source_length, destination_length - source_length - lower_diagonal + 1].item()
+        if lower_diagonal == -source_length and upper_diagonal == destination_length:
+            break
+        elif total_cost < compute_exit_cost(source_ids, destination_ids, cost_model, lower_diagonal, upper_diagonal):
+            break
+        band_radius *= 2
+
+    if statistics is not None:
+        statistics["band_width"] = upper_diagonal - lower_diagonal + 1
+        statistics["band_passes"] = band_passes
+        statistics["cells"] = band_cells
+    with measure_phase("traceback"):
+        alignment_path: AlignmentPath = \
+            collect_band_alignment_path(pointer_band, lower_diagonal, source_length, destination_length)
+    return alignment_path
@@ -0,0 +1,92 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from numpy import arange, cumsum, dtype, int8, intp, zeros
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.wavefront_edit_distance import select_edit_operations
+from utils.algorithms.wf_edit_distance import collect_alignment_path
+from utils.profiling.phase_profiler import measure_phase
+
+
+# By default, pairs are grouped into buckets whose longest sides are within this many characters of one another.
+DEFAULT_BUCKET_WIDTH: int = 16
+
+# Pairs whose charts would have more cells than this are left to the engine rather than batched, since a batch's
+#   charts are allocated all at once (and padded to its longest pair) whatever the engine's own limits.
+MAX_BATCHED_CHART_AREA: int = 1 << 16
+
+
+# Pairs are grouped by the length of their longer side, so that little of each batch's charts is padding.
+def bucket_pairs(sources: Sequence[Sequence[str]], destinations: Sequence[Sequence[str]], bucket_width: int) -> \
+        List[List[int]]:
+    buckets: Dict[int, List[int]] = {}
+    for pair_index, (source, destination) in enumerate(zip(sources, destinations)):
+        bucket_key: int = max(len(source), len(destination)) // bucket_width
+        buckets.setdefault(bucket_key, []).append(pair_index)
+    return [buckets[bucket_key] for bucket_key in sorted(buckets)]
+
+
+def encode_padded(cost_model: CostModel, sequences: Sequence[Sequence[str]]) -> NDArray[int]:
+    # Padding reuses the first symbol; the cells it produces lie beyond each pair's own chart and are never read.
+    padded_ids: NDArray[int] = zeros((len(sequences), max(len(sequence) for sequence in sequences)), dtype=intp)
+    for sequence_index, sequence in enumerate(sequences):
+        padded_ids[sequence_index, :len(sequence)] = cost_model.encode(sequence)
+    return padded_ids
+
+
+# The charts of every pair in the batch are stacked into one (pair x row x column) tensor, padded to the longest
+#   source and destination, and filled one anti-diagonal at a time for all pairs at once. Since a cell only depends
+#   on the cells above and to its left, each pair's own chart is exactly the one the wavefront engine would fill.
+def calculate_batched_edit_distances(sources: Sequence[Sequence[str]], destinations: Sequence[Sequence[str]],
+                                     cost: Callable, data_type: str) -> Tuple[NDArray[float], NDArray[int]]:
+    chart_type: DTypeLike = dtype(data_type)
+    cost_model: CostModel = compile_cost_model(cost, "".join("".join(source) for source in sources),
+                                               "".join("".join(destination) for destination in destinations),
+                                               data_type)
+    source_ids: NDArray[int] = encode_padded(cost_model, sources)
+    destination_ids: NDArray[int] = encode_padded(cost_model, destinations)
+    batch_size, source_length = source_ids.shape
+    destination_length: int = destination_ids.shape[1]
+
+    with measure_phase("allocation"):
+        charts: NDArray[float] = zeros((batch_size, source_length + 1, destination_length + 1), dtype=chart_type)
+        pointer_tables: NDArray[int] = zeros(charts.shape, dtype=int8)
+        charts[:, 1:, 0] = cumsum(cost_model.deletion_costs[source_ids], axis=1, dtype=chart_type)
+        charts[:, 0, 1:] = cumsum(cost_model.insertion_costs[destination_ids], axis=1, dtype=chart_type)
+    for diagonal in range(2, source_length + destination_length + 1):
+        rows: NDArray[int] = arange(max(1, diagonal - destination_length), min(source_length, diagonal - 1) + 1)
+        columns: NDArray[int] = diagonal - rows
+        row_ids: NDArray[int] = source_ids[:, rows - 1]
+        column_ids: NDArray[int] = destination_ids[:, columns - 1]
+        charts[:, rows, columns], pointer_tables[:, rows, columns] = select_edit_operations(
+            charts[:, rows - 1, columns - 1] + cost_model.substitution_costs[row_ids, column_ids],
+            charts[:, rows - 1, columns] + cost_model.deletion_costs[row_ids],
+            charts[:, rows, columns - 1] + cost_model.insertion_costs[column_ids]
+        )
+
+    return charts, pointer_tables
+
+
+def align_batch(sources: Sequence[Sequence[str]], destinations: Sequence[Sequence[str]], cost: Callable,
+                data_type: str) -> List[AlignmentPath]:
+    if len(sources) == 0:
+        return []
+    elif max(len(source) for source in sources) == 0 or max(len(destination) for destination in destinations) == 0:
+        return [AlignmentPath.from_pairs([]) for _ in sources]
+
+    charts, pointer_tables = calculate_batched_edit_distances(sources, destinations, cost, data_type)
+    alignment_paths: List[AlignmentPath] = []
+    with measure_phase("traceback"):
+        for pair_index, (source, destination) in enumerate(zip(sources, destinations)):
+            # Each pair's path is traced back from the corner of its own chart rather than from that of the padding.
+            pair_shape: Tuple[int, int] = (len(source) + 1, len(destination) + 1)
+            alignment_paths.append(
+                collect_alignment_path(
+                    charts[pair_index, :pair_shape[0], :pair_shape[1]],
+                    pointer_tables[pair_index, :pair_shape[0], :pair_shape[1]]
+                )
+            )
+    return alignment_paths
@@ -0,0 +1,157 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from numpy import packbits
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.profiling.phase_profiler import measure_phase
+
+
+# Each column of the edit distance chart is stored as a pair of bit vectors (held in Python's arbitrary-precision
+#   integers, so a whole column is updated by a handful of C-level operations): bit i - 1 of the positive vector
+#   is set when chart[i, j] - chart[i - 1, j] == 1, and bit i - 1 of the negative vector is set when it is -1.
+def build_match_vectors(source_ids: NDArray[int], alphabet_size: int) -> List[int]:
+    match_vectors: List[int] = []
+    for symbol_id in range(alphabet_size):
+        match_bits: bytes = packbits(source_ids == symbol_id, bitorder="little").tobytes()
+        match_vectors.append(int.from_bytes(match_bits, byteorder="little"))
+    return match_vectors
+
+
+# We compute unit-cost Levenshtein distance columns with Myers' bit-vector algorithm, as formulated by Hyyrö.
+def compute_levenshtein_columns(source_ids: NDArray[int], destination_ids: NDArray[int], alphabet_size: int) -> \
+        Tuple[List[int], List[int]]:
+    match_vectors: List[int] = build_match_vectors(source_ids, alphabet_size)
+    mask: int = (1 << len(source_ids)) - 1
+    positive_vector: int = mask
+    negative_vector: int = 0
+    positive_columns: List[int] = [positive_vector]
+    negative_columns: List[int] = [negative_vector]
+    for destination_id in destination_ids.tolist():
+        match_vector: int = match_vectors[destination_id]
+        vertical_change: int = match_vector | negative_vector
+        horizontal_change: int = (((match_vector & positive_vector) + positive_vector) ^ positive_vector) | match_vector
+        positive_horizontal: int = negative_vector | (~(horizontal_change | positive_vector) & mask)
+        negative_horizontal: int = positive_vector & horizontal_change
+        # The top row of the chart always increases by one from column to column.
+        positive_horizontal = ((positive_horizontal << 1) | 1) & mask
+        negative_horizontal = (negative_horizontal << 1) & mask
+        positive_vector = negative_horizontal | (~(vertical_change | positive_horizontal) & mask)
+        negative_vector = positive_horizontal & vertical_change
+        positive_columns.append(positive_vector)
+        negative_columns.append(negative_vector)
+    return positive_columns, negative_columns
+
+
+# When substitutions cost at least as much as a deletion and an insertion, the edit distance is n + m - 2 * LCS;
+#   we compute LCS columns with the bit-parallel algorithm of Crochemore et al., where a zero bit marks a row
+#   at which the LCS grows (and the edit distance therefore shrinks by one).
+def compute_lcs_columns(source_ids: NDArray[int], destination_ids: NDArray[int], alphabet_size: int) -> \
+        Tuple[List[int], List[int]]:
+    match_vectors: List[int] = build_match_vectors(source_ids, alphabet_size)
+    mask: int = (1 << len(source_ids)) - 1
+    lcs_vector: int = mask
+    positive_columns: List[int] = [lcs_vector]
+    negative_columns: List[int] = [0]
+    for destination_id in destination_ids.tolist():
+        match_vector: int = match_vectors[destination_id]
+        lcs_vector = ((lcs_vector + (lcs_vector & match_vector)) | (lcs_vector & ~match_vector)) & mask
+        positive_columns.append(lcs_vector)
+        negative_columns.append(~lcs_vector & mask)
+    return positive_columns, negative_columns
+
+
+def count_bits(value: int) -> int:
+    return bin(value).count("1")
+
+
+def get_column_entry(positive_columns: List[int], negative_columns: List[int], row: int, column: int) -> int:
+    # Since every insertion costs 1, the top row of the chart is simply the column index.
+    row_mask: int = (1 << row) - 1
+    return column + count_bits(positive_columns[column] & row_mask) - count_bits(negative_columns[column] & row_mask)
+
+
+def get_vertical_delta(positive_columns: List[int], negative_columns: List[int], row: int, column: int) -> int:
+    return ((positive_columns[column] >> (row - 1)) & 1) - ((negative_columns[column] >> (row - 1)) & 1)
+
+
+# We follow the same route as collect_alignment_path would over the full chart: at each cell, substitution is
+#   preferred over deletion, and deletion over insertion, whenever they tie.
+def collect_bit_vector_alignment_path(source_ids: NDArray[int], destination_ids: NDArray[int],
+                                      positive_columns: List[int], negative_columns: List[int],
+                                      substitution_cost: Union[int, float]) -> AlignmentPath:
+    source_indices: List[int] = []
+    target_indices: List[int] = []
+    current_row: int = len(source_ids)
+    current_column: int = len(destination_ids)
+    if current_row == 0 or current_column == 0:
+        return AlignmentPath.from_traceback(source_indices, target_indices)
+
+    source_list: List[int] = source_ids.tolist()
+    destination_list: List[int] = destination_ids.tolist()
+    current_cost: int = get_column_entry(positive_columns, negative_columns, current_row, current_column)
+    left_cost: int = get_column_entry(positive_columns, negative_columns, current_row, current_column - 1)
+    while current_row > 0 and current_column > 0:
+        above_cost: int = current_cost - get_vertical_delta(positive_columns, negative_columns, current_row,
+                                                            current_column)
+        diagonal_cost: int = left_cost - get_vertical_delta(positive_columns, negative_columns, current_row,
+                                                            current_column - 1)
+        if source_list[current_row - 1] == destination_list[current_column - 1]:
+            match_cost: Union[int, float] = 0
+        else:
+            match_cost = substitution_cost
+
+        if diagonal_cost + match_cost == current_cost:
+            current_row -= 1
+            current_column -= 1
+            source_indices.append(current_row)
+            target_indices.append(current_column)
+            current_cost = diagonal_cost
+            if current_column > 0:
+                left_cost = get_column_entry(positive_columns, negative_columns, current_row, current_column - 1)
+        elif above_cost + 1 == current_cost:
+            current_row -= 1
+            current_cost = above_cost
+            left_cost = diagonal_cost
+        else:
+            current_column -= 1
+            current_cost = left_cost
+            if current_column > 0:
+                left_cost = get_column_entry(positive_columns, negative_columns, current_row, current_column - 1)
+
+    return AlignmentPath.from_traceback(source_indices, target_indices)
+
+
+def is_bit_parallel_compatible(cost_model: CostModel) -> bool:
+    substitution_cost: Union[int, float, None] = cost_model.get_unit_substitution_cost()
+    return substitution_cost is not None and (substitution_cost == 1 or substitution_cost >= 2)
+
+
+def align_compiled_by_bit_vectors(source: Sequence[str], destination: Sequence[str], cost_model: CostModel,
+                                  statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    substitution_cost: Union[int, float, None] = cost_model.get_unit_substitution_cost()
+    if not is_bit_parallel_compatible(cost_model):
+        raise ValueError("The bit-parallel engine only supports unit-cost Levenshtein and LCS cost functions.")
+
+    source_ids: NDArray[int] = cost_model.encode(source)
+    destination_ids: NDArray[int] = cost_model.encode(destination)
+    if substitution_cost == 1:
+        column_function: Callable = compute_levenshtein_columns
+    else:
+        column_function = compute_lcs_columns
+    positive_columns, negative_columns = column_function(source_ids, destination_ids, len(cost_model.alphabet))
+    with measure_phase("traceback"):
+        alignment_path: AlignmentPath = collect_bit_vector_alignment_path(
+            source_ids, destination_ids, positive_columns, negative_columns, substitution_cost
+        )
+    if statistics is not None:
+        statistics["cells"] = len(source) * len(destination)
+    return alignment_path
+
+
+def align_by_bit_vectors(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                         statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, data_type)
+    return align_compiled_by_bit_vectors(source, destination, cost_model, statistics)
@@ -0,0 +1,125 @@
+from fractions import Fraction
+from math import lcm
+from typing import Callable, List, Sequence, Tuple, Union
+
+from numpy import arange, cumsum, dtype, finfo, float64, iinfo, int64, isfinite, minimum, rint, unique, where, zeros
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.data_structures.packed_pointer_table import PackedPointerTable
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.wavefront_edit_distance import calculate_wavefront_edit_distance, select_edit_operations
+from utils.profiling.phase_profiler import measure_phase
+
+
+# Costs are only scaled to integers when their common denominator is at most this large.
+MAX_COST_SCALE: int = 1 << 12
+COMPACT_TYPES: List[str] = ["int8", "int16", "int32", "int64"]
+
+
+def find_cost_scale(cost_model: CostModel) -> Union[int, None]:
+    cost_scale: int = 1
+    for costs in (cost_model.substitution_costs, cost_model.deletion_costs, cost_model.insertion_costs):
+        for cost in unique(costs[isfinite(costs)]).tolist():
+            if cost < 0:
+                return None
+
+            cost_scale = lcm(cost_scale, Fraction(cost).denominator)
+            if cost_scale > MAX_COST_SCALE:
+                return None
+    return cost_scale
+
+
+# Finite costs are multiplied by their common denominator, and infinite ones become a sentinel that exceeds
+#   any finite path cost. Sums are clipped to the sentinel after every step, so that it behaves like infinity;
+#   the chart type is the narrowest one that can hold the sum of two sentinels.
+def scale_cost_model(cost_model: CostModel, path_length: int) -> Union[Tuple[CostModel, int], None]:
+    cost_scale: Union[int, None] = find_cost_scale(cost_model)
+    if cost_scale is None:
+        return None
+
+    maximum_cost: float = 0
+    for costs in (cost_model.substitution_costs, cost_model.deletion_costs, cost_model.insertion_costs):
+        finite_costs: NDArray[float] = costs[isfinite(costs)]
+        if len(finite_costs) > 0:
+            maximum_cost = max(maximum_cost, finite_costs.max().item())
+    sentinel: int = path_length * int(maximum_cost * cost_scale) + 1
+
+    for compact_type in COMPACT_TYPES:
+        if 2 * sentinel <= iinfo(compact_type).max:
+            chart_type: DTypeLike = dtype(compact_type)
+            break
+    else:
+        return None
+
+    def scale_costs(costs: NDArray[float]) -> NDArray[int]:
+        return where(isfinite(costs), rint(costs.astype(float64) * cost_scale), sentinel).astype(chart_type)
+
+    scaled_model: CostModel = CostModel(
+        cost_model.alphabet, scale_costs(cost_model.substitution_costs), scale_costs(cost_model.deletion_costs),
+        scale_costs(cost_model.insertion_costs)
+    )
+    return scaled_model, sentinel
+
+
+# A wavefront chart of the given type holds every path cost exactly if it can represent every multiple of the cost
+#   scale up to the largest path cost; the compact chart then makes the same comparisons (and chooses the same path).
+#   It only takes less memory if its scaled type, with two bits of pointers, is narrower than that chart's type with
+#   its one-byte pointers.
+def can_replace_chart(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str) -> bool:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, "float64")
+    scaling: Union[Tuple[CostModel, int], None] = scale_cost_model(cost_model, len(source) + len(destination))
+    if scaling is None:
+        return False
+
+    scaled_model, sentinel = scaling
+    cost_scale: int = find_cost_scale(cost_model)
+    chart_type: DTypeLike = dtype(data_type)
+    if 4 * scaled_model.deletion_costs.itemsize + 1 >= 4 * (chart_type.itemsize + 1):
+        return False
+    elif chart_type.kind == "f":
+        return cost_scale & (cost_scale - 1) == 0 and sentinel - 1 <= 2 ** (finfo(chart_type).nmant + 1)
+    else:
+        return cost_scale == 1 and 2 * sentinel <= iinfo(chart_type).max
+
+
+# The chart holds scaled integer costs in the narrowest type that fits, and the pointer table holds two bits per cell.
+#   Compared to a wavefront chart with an int8 pointer table, this takes 4-8 times less memory than a float64 chart,
+#   but only a quarter to a half less than a float16 or float32 chart (and nothing once the scaled costs need a type
+#   as wide as the wavefront chart's). Since every cost is scaled exactly, the comparisons (and so the pointers) are
+#   the same as those of a wavefront chart that holds every path cost exactly; a float16 chart does not once costs
+#   pass 2048, so on lines of several thousand characters the two may choose different paths. Cost functions that
+#   cannot be scaled (e.g., with irrational or negative costs) fall back on the wavefront chart.
+def calculate_compact_edit_distance(source: Sequence[str], destination: Sequence[str], cost: Callable,
+                                    data_type: str) -> Tuple[NDArray[int], Union[NDArray[int], PackedPointerTable]]:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, "float64")
+    scaling: Union[Tuple[CostModel, int], None] = scale_cost_model(cost_model, len(source) + len(destination))
+    if scaling is None:
+        return calculate_wavefront_edit_distance(source, destination, cost, data_type)
+
+    scaled_model, sentinel = scaling
+    chart_type: DTypeLike = scaled_model.deletion_costs.dtype
+    source_ids: NDArray[int] = scaled_model.encode(source)
+    destination_ids: NDArray[int] = scaled_model.encode(destination)
+    with measure_phase("allocation"):
+        chart: NDArray[int] = zeros((len(source) + 1, len(destination) + 1), dtype=chart_type)
+        chart[1:, 0] = minimum(cumsum(scaled_model.deletion_costs[source_ids], dtype=int64), sentinel)
+        chart[0, 1:] = minimum(cumsum(scaled_model.insertion_costs[destination_ids], dtype=int64), sentinel)
+        pointer_table: PackedPointerTable = PackedPointerTable(chart.shape)
+
+    source_length: int = len(source)
+    destination_length: int = len(destination)
+    for diagonal in range(2, source_length + destination_length + 1):
+        rows: NDArray[int] = arange(max(1, diagonal - destination_length), min(source_length, diagonal - 1) + 1)
+        columns: NDArray[int] = diagonal - rows
+        row_ids: NDArray[int] = source_ids[rows - 1]
+        column_ids: NDArray[int] = destination_ids[columns - 1]
+        minimum_totals, pointers = select_edit_operations(
+            chart[rows - 1, columns - 1] + scaled_model.substitution_costs[row_ids, column_ids],
+            chart[rows - 1, columns] + scaled_model.deletion_costs[row_ids],
+            chart[rows, columns - 1] + scaled_model.insertion_costs[column_ids]
+        )
+        chart[rows, columns] = minimum(minimum_totals, sentinel)
+        pointer_table.store(rows, columns, pointers)
+
+    return chart, pointer_table
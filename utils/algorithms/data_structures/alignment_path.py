@@ -0,0 +1,50 @@
+from typing import Iterator, List, Sequence, Tuple
+
+from numpy import array, array_equal, concatenate, int32
+from numpy.typing import NDArray
+
+
+class AlignmentPath:
+    """ A monotone character alignment, stored as two parallel int32 arrays of source and target indices. """
+    def __init__(self, source_indices: NDArray[int], target_indices: NDArray[int]):
+        if len(source_indices) != len(target_indices):
+            raise ValueError(f"The index arrays have different lengths, <{len(source_indices)}> and "
+                             f"<{len(target_indices)}>.")
+        self.source_indices: NDArray[int] = source_indices.astype(int32, copy=False)
+        self.target_indices: NDArray[int] = target_indices.astype(int32, copy=False)
+
+    def __len__(self) -> int:
+        return len(self.source_indices)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.source_indices.tolist(), self.target_indices.tolist())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AlignmentPath):
+            return NotImplemented
+        return array_equal(self.source_indices, other.source_indices) and \
+            array_equal(self.target_indices, other.target_indices)
+
+    def __repr__(self) -> str:
+        return f"AlignmentPath({list(self)})"
+
+    def shift(self, source_offset: int, target_offset: int) -> "AlignmentPath":
+        return AlignmentPath(self.source_indices + source_offset, self.target_indices + target_offset)
+
+    @staticmethod
+    def from_pairs(pairs: Sequence[Tuple[int, int]]) -> "AlignmentPath":
+        pair_array: NDArray[int] = array(pairs, dtype=int32).reshape(len(pairs), 2)
+        return AlignmentPath(pair_array[:, 0], pair_array[:, 1])
+
+    @staticmethod
+    def from_traceback(source_indices: List[int], target_indices: List[int]) -> "AlignmentPath":
+        """ Builds a path from indices collected in reverse order, as a traceback from the final cell produces them. """
+        return AlignmentPath(array(source_indices[::-1], dtype=int32), array(target_indices[::-1], dtype=int32))
+
+    @staticmethod
+    def concatenate(paths: Sequence["AlignmentPath"]) -> "AlignmentPath":
+        if len(paths) == 0:
+            return AlignmentPath.from_pairs([])
+        return AlignmentPath(
+            concatenate([path.source_indices for path in paths]), concatenate([path.target_indices for path in paths])
+        )
@@ -0,0 +1,244 @@
+from array import array
+from typing import Dict, Iterator, List, Union
+
+from utils.algorithms.data_structures.node import Node
+
+
+# The node index that marks the absence of a node (e.g., the parent of the root, or the first child of a leaf).
+NO_NODE: int = -1
+
+
+class CompactTree:
+    """ A tree stored as arrays of node indices (parent, first child, last child, next sibling) and label ids. """
+    def __init__(self):
+        self.labels: List[str] = []
+        self.label_ids: Dict[str, int] = {}
+        self.parents: array = array("i")
+        self.first_children: array = array("i")
+        self.last_children: array = array("i")
+        self.next_siblings: array = array("i")
+        self.node_labels: array = array("i")
+        self.root: int = NO_NODE
+
+    def __str__(self):
+        # As in Node._subtree_str, the pending items are both nodes and the separators and brackets that follow them.
+        pieces: List[str] = []
+        pending_items: List[Union[int, str]] = [self.root] if self.root != NO_NODE else []
+        while len(pending_items) > 0:
+            item: Union[int, str] = pending_items.pop()
+            if isinstance(item, str):
+                pieces.append(item)
+            elif self.first_children[item] == NO_NODE:
+                pieces.append(self.get_label(item))
+            else:
+                pieces.append(f"({self.get_label(item)} ")
+                pending_items.append(")")
+                children: List[int] = self.get_children(item)
+                for child_index in range(len(children) - 1, -1, -1):
+                    pending_items.append(children[child_index])
+                    if child_index > 0:
+                        pending_items.append(" ")
+        return "".join(pieces)
+
+    def intern_label(self, label: str) -> int:
+        label_id: Union[int, None] = self.label_ids.get(label)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.labels.append(label)
+            self.label_ids[label] = label_id
+        return label_id
+
+    def get_label(self, node: int) -> str:
+        return self.labels[self.node_labels[node]]
+
+    def add_node(self, label: str, children: Union[List[int], None] = None) -> int:
+        node: int = len(self.node_labels)
+        for node_array in (self.parents, self.first_children, self.last_children, self.next_siblings):
+            node_array.append(NO_NODE)
+        self.node_labels.append(self.intern_label(label))
+        if children is not None:
+            self.set_children(node, children)
+        return node
+
+    def append_child(self, parent: int, child: int):
+        self.parents[child] = parent
+        self.next_siblings[child] = NO_NODE
+        if self.last_children[parent] == NO_NODE:
+            self.first_children[parent] = child
+        else:
+            self.next_siblings[self.last_children[parent]] = child
+        self.last_children[parent] = child
+
+    # Since this replaces all of a node's children at once, it takes time in their number, but not in that of the
+    #   node's previous children (which are left as they were, to be reattached elsewhere or discarded).
+    def set_children(self, node: int, children: List[int]):
+        self.first_children[node] = children[0] if len(children) > 0 else NO_NODE
+        self.last_children[node] = children[-1] if len(children) > 0 else NO_NODE
+        for child_index, child in enumerate(children):
+            self.parents[child] = node
+            self.next_siblings[child] = children[child_index + 1] if child_index + 1 < len(children) else NO_NODE
+
+    def iterate_children(self, node: int) -> Iterator[int]:
+        child: int = self.first_children[node]
+        while child != NO_NODE:
+            yield child
+            child = self.next_siblings[child]
+
+    def get_children(self, node: int) -> List[int]:
+        return list(self.iterate_children(node))
+
+    # The traversals use an explicit stack rather than recursion, so that deep trees are no problem.
+    def bottom_up(self) -> List[int]:
+        """ List the nodes of the tree bottom-up (children before their parents, from left to right). """
+        nodes: List[int] = []
+        pending_nodes: List[int] = [self.root] if self.root != NO_NODE else []
+        while len(pending_nodes) > 0:
+            node: int = pending_nodes.pop()
+            nodes.append(node)
+            pending_nodes.extend(self.iterate_children(node))
+        # Visiting each node before its children, from right to left, gives the reverse of a postorder traversal.
+        nodes.reverse()
+        return nodes
+
+    def leaves(self) -> List[int]:
+        """ List the leaf nodes of the tree, from left to right. """
+        return [node for node in self.bottom_up() if self.first_children[node] == NO_NODE]
+
+    @staticmethod
+    def from_node(root: Union[Node, None]) -> "CompactTree":
+        compact_tree: CompactTree = CompactTree()
+        if root is None:
+            return compact_tree
+
+        # The nodes are numbered breadth-first, so that the children of each node are numbered consecutively
+        #   and all of the arrays can be filled in a single pass.
+        nodes: List[Node] = [root]
+        parents: List[int] = [NO_NODE]
+        first_children: List[int] = []
+        last_children: List[int] = []
+        next_siblings: List[int] = [NO_NODE]
+        for node_index, node in enumerate(nodes):
+            child_count: int = len(node.children)
+            if child_count == 0:
+                first_children.append(NO_NODE)
+                last_children.append(NO_NODE)
+                continue
+            first_child: int = len(nodes)
+            first_children.append(first_child)
+            last_children.append(first_child + child_count - 1)
+            next_siblings.extend(range(first_child + 1, first_child + child_count))
+            next_siblings.append(NO_NODE)
+            parents.extend([node_index] * child_count)
+            nodes.extend(node.children)
+
+        label_ids: Dict[str, int] = compact_tree.label_ids
+        compact_tree.node_labels = array("i", [label_ids.setdefault(node.label, len(label_ids)) for node in nodes])
+        compact_tree.labels = list(label_ids)
+        compact_tree.parents = array("i", parents)
+        compact_tree.first_children = array("i", first_children)
+        compact_tree.last_children = array("i", last_children)
+        compact_tree.next_siblings = array("i", next_siblings)
+        compact_tree.root = 0
+        return compact_tree
+
+    def to_node(self) -> Union[Node, None]:
+        nodes: List[Union[Node, None]] = [None] * len(self.node_labels)
+        for node in self.bottom_up():
+            nodes[node] = Node(self.get_label(node), [nodes[child] for child in self.iterate_children(node)])
+        return nodes[self.root] if self.root != NO_NODE else None
+
+    def remove_empty(self):
+        """ Remove empty nodes, along with any ancestors that are left without children. """
+        empty_label_id: Union[int, None] = self.label_ids.get("-NONE-")
+        if empty_label_id is None:
+            return
+
+        # Rather than removing nodes one at a time, which means finding each one among its siblings, every node's
+        #   remaining children are determined in a single pass: a node remains if it is not empty and either
+        #   had no children to begin with or still has some.
+        is_kept: Dict[int, bool] = {}
+        for node in self.bottom_up():
+            if self.node_labels[node] == empty_label_id:
+                is_kept[node] = False
+            elif self.first_children[node] == NO_NODE:
+                is_kept[node] = True
+            else:
+                children: List[int] = self.get_children(node)
+                kept_children: List[int] = [child for child in children if is_kept[child] is True]
+                if len(kept_children) < len(children):
+                    self.set_children(node, kept_children)
+                is_kept[node] = len(kept_children) > 0
+        if self.root != NO_NODE and is_kept[self.root] is False:
+            self.root = NO_NODE
+
+    def remove_unit(self):
+        """ Remove unary nodes by fusing them with their parents. """
+        for node in self.bottom_up():
+            child: int = self.first_children[node]
+            if child != NO_NODE and self.next_siblings[child] == NO_NODE and self.first_children[child] != NO_NODE:
+                self.node_labels[node] = self.intern_label(f"{self.get_label(node)}_{self.get_label(child)}")
+                self.set_children(node, self.get_children(child))
+
+    def restore_unit(self):
+        """ Restore the unary nodes that were removed by remove_unit(). """
+        def restore_labels(node: int) -> int:
+            labels: List[str] = self.get_label(node).split("_")
+            if len(labels) == 1:
+                return node
+            self.node_labels[node] = self.intern_label(labels[-1])
+            for label in reversed(labels[:-1]):
+                node = self.add_node(label, [node])
+            return node
+
+        for node in self.bottom_up():
+            if self.first_children[node] != NO_NODE:
+                self.set_children(node, [restore_labels(child) for child in self.get_children(node)])
+        if self.root != NO_NODE:
+            self.root = restore_labels(self.root)
+            self.parents[self.root] = NO_NODE
+
+    def binarize_right(self):
+        """ Binarize into a right-branching structure. """
+        for node in self.bottom_up():
+            children: List[int] = self.get_children(node)
+            if len(children) > 2:
+                virtual_label: str = self.get_label(node) + "*"
+                previous_node: int = children[-1]
+                for child in reversed(children[1:-1]):
+                    previous_node = self.add_node(virtual_label, [child, previous_node])
+                self.set_children(node, [children[0], previous_node])
+
+    def binarize_left(self):
+        """ Binarize into a left-branching structure. """
+        for node in self.bottom_up():
+            children: List[int] = self.get_children(node)
+            if len(children) > 2:
+                virtual_label: str = self.get_label(node) + "*"
+                previous_node: int = children[0]
+                for child in children[1:-1]:
+                    previous_node = self.add_node(virtual_label, [previous_node, child])
+                self.set_children(node, [previous_node, children[-1]])
+
+    binarize = binarize_right
+
+    def unbinarize(self):
+        """ Undo binarization by removing any nodes ending with *. """
+        # Since children come first, the nodes that a virtual node is replaced by have already been spliced into it.
+        is_virtual_label: List[bool] = [label.endswith("*") for label in self.labels]
+        for node in self.bottom_up():
+            children: List[int] = []
+            has_virtual_children: bool = False
+            for child in self.iterate_children(node):
+                if is_virtual_label[self.node_labels[child]] is True:
+                    children.extend(self.iterate_children(child))
+                    has_virtual_children = True
+                else:
+                    children.append(child)
+            if has_virtual_children is True:
+                self.set_children(node, children)
+
+        if self.root != NO_NODE and is_virtual_label[self.node_labels[self.root]] is True:
+            roots: List[int] = self.get_children(self.root)
+            assert len(roots) == 1
+            self.root = roots[0]
+            self.parents[self.root] = NO_NODE
@@ -0,0 +1,18 @@
+from typing import Tuple
+
+from numpy import uint8, zeros
+from numpy.typing import NDArray
+
+
+class PackedPointerTable:
+    """ A pointer table which stores each cell's edit operation in two bits, packing four cells into every byte. """
+    def __init__(self, shape: Tuple[int, int]):
+        self.shape: Tuple[int, int] = shape
+        self.cells: NDArray[int] = zeros((shape[0], (shape[1] + 3) // 4), dtype=uint8)
+
+    def store(self, rows: NDArray[int], columns: NDArray[int], pointers: NDArray[int]):
+        """ Stores pointers for cells which must lie in distinct rows (as those of an anti-diagonal do). """
+        self.cells[rows, columns >> 2] |= (pointers << ((columns & 3) << 1)).astype(uint8)
+
+    def item(self, row: int, column: int) -> int:
+        return (self.cells.item(row, column >> 2) >> ((column & 3) << 1)) & 3
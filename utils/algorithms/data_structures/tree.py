@@ -1,57 +1,63 @@
 from re import compile
 
-from utils.algorithms.data_structures.exceptions import RootDeletedException
-from utils.algorithms.data_structures.node import Node, PrettyPrinter
+from utils.algorithms.data_structures.compact_tree import CompactTree
+from utils.algorithms.data_structures.node import Node
+from utils.serialization.tree_printer import format_tree
 
 
 class Tree:
     def __init__(self, root):
         self.root = root
 
+    # A tree is held either as nodes or, once it has been transformed, as a CompactTree. Each is only converted to
+    #   the other when it is needed, so that consecutive transformations (and writing out their result) use no nodes.
+    @property
+    def root(self):
+        if self.compact_tree is not None:
+            self._root = self.compact_tree.to_node()
+            self.compact_tree = None
+        return self._root
+
+    @root.setter
+    def root(self, root):
+        self._root = root
+        self.compact_tree = None
+
     def __str__(self):
+        if self.compact_tree is not None:
+            return str(self.compact_tree)
         return self.root._subtree_str()
 
     def pretty_print(self):
-        root_printer: PrettyPrinter = self.root._pretty_print()
-        return str(root_printer)
+        return format_tree(self.root)
 
-    interior_node = compile(r"\s*\(([^\s)]*)")
-    close_brace = compile(r"\s*\)")
-    leaf_node = compile(r'\s*([^\s)]+)')
+    # Each token is an opening bracket with its (possibly empty) label, a closing bracket, or a leaf.
+    tree_token = compile(r"\s*(?:\(([^\s)]*)|(\))|([^\s)]+))")
 
     @staticmethod
-    def _scan_tree(s):
-        result = Tree.interior_node.match(s)
-        if result is not None:
-            label = result.group(1)
-            pos = result.end()
-            children = []
-            (child, length) = Tree._scan_tree(s[pos:])
-            while child is not None:
-                children.append(child)
-                pos += length
-                (child, length) = Tree._scan_tree(s[pos:])
-
-            result = Tree.close_brace.match(s[pos:])
-            if result is not None:
-                pos += result.end()
-                return Node(label, children), pos
-            else:
-                return None, 0
-        else:
-            result = Tree.leaf_node.match(s)
-            if result is not None:
-                pos = result.end()
-                label = result.group(1)
-                return Node(label, []), pos
+    def from_str(s):
+        """ Parse the first tree in a string, in a single pass over its tokens. """
+        # The children of each open node are collected on a stack rather than by recursion, so that the string is
+        #   never copied and deep trees cannot exceed the recursion limit. If the string ends before the first tree is
+        #   closed (or begins with a closing bracket), there is no tree; anything after the first tree is ignored.
+        open_nodes = []
+        for token in Tree.tree_token.finditer(s.strip()):
+            opening_label, closing_bracket, leaf_label = token.groups()
+            if opening_label is not None:
+                open_nodes.append((opening_label, []))
+                continue
+            elif leaf_label is not None:
+                node = Node(leaf_label, [])
+            elif len(open_nodes) > 0:
+                label, children = open_nodes.pop()
+                node = Node(label, children)
             else:
-                return None, 0
+                break
 
-    @staticmethod
-    def from_str(s):
-        s = s.strip()
-        (tree, n) = Tree._scan_tree(s)
-        return Tree(tree)
+            if len(open_nodes) == 0:
+                return Tree(node)
+            open_nodes[-1][1].append(node)
+        return Tree(None)
 
     def bottom_up(self):
         """ Traverse the nodes of the tree bottom-up. """
@@ -61,75 +67,36 @@ class Tree:
         """ Traverse the leaf nodes of the tree. """
         return self.root.leaves()
 
+    def transform(self, transformation):
+        """ Apply a transformation of CompactTree to the tree. """
+        # Nodes taken from the tree beforehand are no longer part of it afterwards.
+        if self.compact_tree is None:
+            self.compact_tree = CompactTree.from_node(self._root)
+            self._root = None
+        transformation(self.compact_tree)
+
     def remove_empty(self):
         """ Remove empty nodes. """
-        nodes = list(self.bottom_up())
-        for node in nodes:
-            if node.label == '-NONE-':
-                try:
-                    node.delete_clean()
-                except RootDeletedException:
-                    self.root = None
+        self.transform(CompactTree.remove_empty)
 
     def remove_unit(self):
         """ Remove unary nodes by fusing them with their parents. """
-        nodes = list(self.bottom_up())
-        for node in nodes:
-            if len(node.children) == 1:
-                child = node.children[0]
-                if len(child.children) > 0:
-                    node.label = "%s_%s" % (node.label, child.label)
-                    child.detach()
-                    for grandchild in list(child.children):
-                        node.append_child(grandchild)
+        self.transform(CompactTree.remove_unit)
 
     def restore_unit(self):
         """ Restore the unary nodes that were removed by remove_unit(). """
-        def visit(node):
-            children = [visit(child) for child in node.children]
-            labels = node.label.split('_')
-            node = Node(labels[-1], children)
-            for label in reversed(labels[:-1]):
-                node = Node(label, [node])
-            return node
-        self.root = visit(self.root)
+        self.transform(CompactTree.restore_unit)
 
     def binarize_right(self):
         """ Binarize into a right-branching structure. """
-        nodes = list(self.bottom_up())
-        for node in nodes:
-            if len(node.children) > 2:
-                # create a right-branching structure
-                children = list(node.children)
-                children.reverse()
-                vlabel = node.label + "*"
-                prev = children[0]
-                for child in children[1:-1]:
-                    prev = Node(vlabel, [child, prev])
-                node.append_child(prev)
+        self.transform(CompactTree.binarize_right)
 
     def binarize_left(self):
         """ Binarize into a left-branching structure. """
-        nodes = list(self.bottom_up())
-        for node in nodes:
-            if len(node.children) > 2:
-                vlabel = node.label + "*"
-                children = list(node.children)
-                prev = children[0]
-                for child in children[1:-1]:
-                    prev = Node(vlabel, [prev, child])
-                node.insert_child(0, prev)
+        self.transform(CompactTree.binarize_left)
 
     binarize = binarize_right
 
     def unbinarize(self):
         """ Undo binarization by removing any nodes ending with *. """
-        def visit(node):
-            children = sum([visit(child) for child in node.children], [])
-            if node.label.endswith('*'):
-                return children
-            else:
-                return [Node(node.label, children)]
-        roots = visit(self.root)
-        assert len(roots) == 1
-        self.root = roots[0]
+        self.transform(CompactTree.unbinarize)
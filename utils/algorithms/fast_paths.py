@@ -0,0 +1,137 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from numpy import arange, flatnonzero, frombuffer, uint32
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.edits import EditOperation
+from utils.algorithms.wavefront_edit_distance import calculate_wavefront_edit_distance
+
+
+# Lines reused from a previous run (if any) are not aligned at all, and lines found in the alignment cache (if any)
+#   skip even the fast paths.
+FAST_PATHS: List[str] = ["reused", "cached", "identical", "trimmed", "none"]
+
+
+def encode_code_points(text: str) -> NDArray[int]:
+    return frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=uint32)
+
+
+def measure_common_prefix(source_points: NDArray[int], destination_points: NDArray[int]) -> int:
+    common_length: int = min(len(source_points), len(destination_points))
+    mismatches: NDArray[int] = flatnonzero(source_points[:common_length] != destination_points[:common_length])
+    return mismatches[0].item() if len(mismatches) > 0 else common_length
+
+
+def create_identity_path(start: int, end: int) -> AlignmentPath:
+    identity_indices: NDArray[int] = arange(start, end)
+    return AlignmentPath(identity_indices, identity_indices)
+
+
+# The traceback of the middle section stops as soon as it reaches the common prefix. To continue it, we first retrace
+#   the (usually tiny) corner of the middle section before its first aligned pair to find where it leaves the section.
+#   Inside the common prefix, a character is then matched whenever it equals its counterpart and skipped otherwise,
+#   until the traceback is back on the main diagonal, after which the prefix is aligned to itself.
+def trace_common_prefix(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                        prefix_length: int, middle_path: AlignmentPath, middle_rows: int, middle_columns: int) -> \
+        AlignmentPath:
+    if len(middle_path) > 0:
+        current_row: int = middle_path.source_indices[0].item()
+        current_column: int = middle_path.target_indices[0].item()
+    else:
+        current_row, current_column = middle_rows, middle_columns
+
+    source_indices: List[int] = []
+    target_indices: List[int] = []
+    if current_row > 0 and current_column > 0:
+        _, pointer_table = calculate_wavefront_edit_distance(
+            source[prefix_length:(prefix_length + current_row)],
+            destination[prefix_length:(prefix_length + current_column)], cost, data_type
+        )
+        while current_row > 0 and current_column > 0:
+            pointer: int = pointer_table.item(current_row, current_column)
+            if pointer == EditOperation.SUBSTITUTE:
+                current_row -= 1
+                current_column -= 1
+                source_indices.append(prefix_length + current_row)
+                target_indices.append(prefix_length + current_column)
+            elif pointer == EditOperation.DELETE:
+                current_row -= 1
+            else:
+                current_column -= 1
+
+    current_row += prefix_length
+    current_column += prefix_length
+    while current_row != current_column and current_row > 0 and current_column > 0:
+        if source[current_row - 1] == destination[current_column - 1]:
+            current_row -= 1
+            current_column -= 1
+            source_indices.append(current_row)
+            target_indices.append(current_column)
+        elif current_row > current_column:
+            current_row -= 1
+        else:
+            current_column -= 1
+
+    return AlignmentPath.concatenate([
+        create_identity_path(0, min(current_row, current_column)),
+        AlignmentPath.from_traceback(source_indices, target_indices)
+    ])
+
+
+# The common prefix is measured after the common suffix, so that the two never overlap.
+def measure_common_ends(source_text: str, destination_text: str) -> Tuple[int, int]:
+    source_points: NDArray[int] = encode_code_points(source_text)
+    destination_points: NDArray[int] = encode_code_points(destination_text)
+    suffix_length: int = measure_common_prefix(source_points[::-1], destination_points[::-1])
+    prefix_length: int = measure_common_prefix(
+        source_points[:(len(source_text) - suffix_length)], destination_points[:(len(destination_text) - suffix_length)]
+    )
+    return prefix_length, suffix_length
+
+
+def complete_trimmed_path(source_text: str, destination_text: str, cost: Callable, data_type: str,
+                          prefix_length: int, suffix_length: int, middle_path: AlignmentPath,
+                          statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    source_end: int = len(source_text) - suffix_length
+    destination_end: int = len(destination_text) - suffix_length
+    if prefix_length > 0:
+        prefix_path: AlignmentPath = trace_common_prefix(
+            source_text, destination_text, cost, data_type, prefix_length, middle_path,
+            source_end - prefix_length, destination_end - prefix_length
+        )
+    else:
+        prefix_path = create_identity_path(0, 0)
+
+    if statistics is not None:
+        statistics["fast_path"] = "trimmed" if prefix_length + suffix_length > 0 else "none"
+        statistics["trimmed_prefix"] = prefix_length
+        statistics["trimmed_suffix"] = suffix_length
+    return AlignmentPath.concatenate([
+        prefix_path,
+        middle_path.shift(prefix_length, prefix_length),
+        AlignmentPath(arange(source_end, len(source_text)), arange(destination_end, len(destination_text)))
+    ])
+
+
+# Identical lines are aligned to themselves, and otherwise only the section between the common prefix and suffix
+#   goes through the engine. These shortcuts assume that matching identical characters is free and that the cost
+#   function otherwise behaves like a metric (as all of those in COST_FUNCTIONS do); under those conditions,
+#   they reproduce the path recovered from the full chart.
+def align_with_fast_paths(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                          engine: Callable, statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    source_text: str = "".join(source)
+    destination_text: str = "".join(destination)
+    if source_text == destination_text:
+        if statistics is not None:
+            statistics["fast_path"] = "identical"
+        return create_identity_path(0, len(source_text))
+
+    prefix_length, suffix_length = measure_common_ends(source_text, destination_text)
+    middle_path: AlignmentPath = engine(
+        source[prefix_length:(len(source_text) - suffix_length)],
+        destination[prefix_length:(len(destination_text) - suffix_length)], cost, data_type, statistics=statistics
+    )
+    return complete_trimmed_path(
+        source_text, destination_text, cost, data_type, prefix_length, suffix_length, middle_path, statistics
+    )
@@ -0,0 +1,158 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from numpy import arange, concatenate, cumsum, dtype, empty, int8, isfinite, maximum, minimum, where
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.options.edits import EditOperation
+from utils.algorithms.wavefront_edit_distance import select_edit_operations
+
+
+# Rectangles at most this large are solved directly with a (bounded) pointer table.
+BASE_CASE_AREA: int = 1 << 16
+
+
+def get_working_type(data_type: str) -> str:
+    # Only O(n + m) entries are ever kept, so we can afford the widest type of the requested kind.
+    working_type: str = "float64" if dtype(data_type).kind == "f" else "int64"
+    return working_type
+
+
+# We compute one row of the chart at once: substitutions and deletions only depend on the previous row,
+#   and the chain of insertions along the row is resolved with a prefix minimum over the running insertion costs.
+def compute_chart_row(previous_row: NDArray[float], left_entry: float, substitution_costs: NDArray[float],
+                      deletion_cost: float, insertion_costs: NDArray[float], insertion_sums: NDArray[float]) -> \
+        Tuple[NDArray[float], NDArray[int]]:
+    substitution_totals: NDArray[float] = previous_row[:-1] + substitution_costs
+    deletion_totals: NDArray[float] = previous_row[1:] + deletion_cost
+    best_totals: NDArray[float] = concatenate(([left_entry], minimum(substitution_totals, deletion_totals)))
+    current_row: NDArray[float] = insertion_sums + minimum.accumulate(best_totals - insertion_sums)
+    current_row[0] = left_entry
+
+    _, pointers = select_edit_operations(substitution_totals, deletion_totals, current_row[:-1] + insertion_costs)
+    return current_row, pointers
+
+
+# Each entry of origins records the column at which the traceback from that cell first reaches the middle row.
+def propagate_origins(origins: NDArray[int], pointers: NDArray[int]) -> NDArray[int]:
+    vertical_origins: NDArray[int] = \
+        concatenate((origins[:1], where(pointers == EditOperation.SUBSTITUTE, origins[:-1], origins[1:])))
+    is_insertion: NDArray[bool] = concatenate(([False], pointers == EditOperation.INSERT))
+    origin_positions: NDArray[int] = maximum.accumulate(where(is_insertion, 0, arange(len(origins))))
+    return vertical_origins[origin_positions]
+
+
+class LinearSpaceAligner:
+    def __init__(self, source_ids: NDArray[int], destination_ids: NDArray[int], cost_model: CostModel):
+        self.source_ids: NDArray[int] = source_ids
+        self.destination_ids: NDArray[int] = destination_ids
+        self.cost_model: CostModel = cost_model
+        self.path_segments: List[AlignmentPath] = []
+
+    def compute_rows(self, top_row: NDArray[float], left_column: NDArray[float], row_start: int, row_end: int,
+                     column_start: int, column_end: int):
+        destination_ids: NDArray[int] = self.destination_ids[column_start:column_end]
+        insertion_costs: NDArray[float] = self.cost_model.insertion_costs[destination_ids]
+        insertion_sums: NDArray[float] = concatenate(([0], cumsum(insertion_costs, dtype=insertion_costs.dtype)))
+        current_row: NDArray[float] = top_row
+        for row in range(row_start, row_end):
+            source_id: int = self.source_ids[row]
+            current_row, pointers = compute_chart_row(
+                current_row, left_column[row - row_start + 1],
+                self.cost_model.substitution_costs[source_id, destination_ids],
+                self.cost_model.deletion_costs[source_id], insertion_costs, insertion_sums
+            )
+            yield current_row, pointers
+
+    # The rectangle covers source[row_start:row_end] and destination[column_start:column_end];
+    #   its top row and left column of chart entries are given, and its traceback runs corner to corner.
+    def align_rectangle(self, top_row: NDArray[float], left_column: NDArray[float], row_start: int, row_end: int,
+                        column_start: int, column_end: int):
+        height: int = row_end - row_start
+        width: int = column_end - column_start
+        if height == 0 or width == 0:
+            return
+        elif height == 1 or height * width <= BASE_CASE_AREA:
+            self.trace_rectangle(top_row, left_column, row_start, row_end, column_start, column_end)
+            return
+
+        middle: int = height // 2
+        middle_row: NDArray[float] = top_row
+        origins: NDArray[int] = arange(width + 1)
+        for row_offset, (current_row, pointers) in \
+                enumerate(self.compute_rows(top_row, left_column, row_start, row_end, column_start, column_end), 1):
+            if row_offset == middle:
+                middle_row = current_row
+            elif row_offset > middle:
+                origins = propagate_origins(origins, pointers)
+        crossing: int = origins[width].item()
+
+        # The lower rectangle also needs the chart entries along its left column, so we sweep its rows once more.
+        lower_left_column: NDArray[float] = empty(height - middle + 1, dtype=middle_row.dtype)
+        lower_left_column[0] = middle_row[crossing]
+        lower_rows = self.compute_rows(
+            middle_row[:(crossing + 1)], left_column[middle:], row_start + middle, row_end,
+            column_start, column_start + crossing
+        )
+        for row_offset, (current_row, _) in enumerate(lower_rows, 1):
+            lower_left_column[row_offset] = current_row[-1]
+
+        self.align_rectangle(
+            top_row[:(crossing + 1)], left_column[:(middle + 1)], row_start, row_start + middle,
+            column_start, column_start + crossing
+        )
+        self.align_rectangle(
+            middle_row[crossing:], lower_left_column, row_start + middle, row_end,
+            column_start + crossing, column_end
+        )
+
+    def trace_rectangle(self, top_row: NDArray[float], left_column: NDArray[float], row_start: int, row_end: int,
+                        column_start: int, column_end: int):
+        pointer_table: NDArray[int] = empty((row_end - row_start, column_end - column_start), dtype=int8)
+        rows = self.compute_rows(top_row, left_column, row_start, row_end, column_start, column_end)
+        for row_offset, (_, pointers) in enumerate(rows):
+            pointer_table[row_offset] = pointers
+
+        source_indices: List[int] = []
+        target_indices: List[int] = []
+        current_row, current_column = pointer_table.shape
+        while current_row > 0 and current_column > 0:
+            pointer: int = pointer_table.item(current_row - 1, current_column - 1)
+            if pointer == EditOperation.SUBSTITUTE:
+                current_row -= 1
+                current_column -= 1
+                source_indices.append(current_row)
+                target_indices.append(current_column)
+            elif pointer == EditOperation.DELETE:
+                current_row -= 1
+            elif pointer == EditOperation.INSERT:
+                current_column -= 1
+            else:
+                raise ValueError(f"The edit operation <{pointer}> is not supported.")
+        self.path_segments.append(
+            AlignmentPath.from_traceback(source_indices, target_indices).shift(row_start, column_start)
+        )
+
+
+# This follows Hirschberg's divide-and-conquer approach, so only O(n + m) chart entries are held at any time.
+#   Rather than choosing any optimal midpoint, we find the column at which collect_alignment_path's traceback
+#   would cross the middle row, so the resulting path is the same as the one recovered from a full chart.
+def align_in_linear_space(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                          statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    working_type: DTypeLike = dtype(get_working_type(data_type))
+    cost_model: CostModel = compile_cost_model(cost, source, destination, working_type.name)
+    if not isfinite(cost_model.insertion_costs).all():
+        raise ValueError("The linear-space engine requires every insertion cost to be finite.")
+
+    source_ids: NDArray[int] = cost_model.encode(source)
+    destination_ids: NDArray[int] = cost_model.encode(destination)
+    top_row: NDArray[float] = \
+        concatenate(([0], cumsum(cost_model.insertion_costs[destination_ids], dtype=working_type)))
+    left_column: NDArray[float] = \
+        concatenate(([0], cumsum(cost_model.deletion_costs[source_ids], dtype=working_type)))
+
+    aligner: LinearSpaceAligner = LinearSpaceAligner(source_ids, destination_ids, cost_model)
+    aligner.align_rectangle(top_row, left_column, 0, len(source_ids), 0, len(destination_ids))
+    return AlignmentPath.concatenate(aligner.path_segments)
@@ -1,6 +1,11 @@
+from functools import partial
 from math import inf
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Sequence, Tuple, Union
 
+from numpy import array, dtype, equal, full, where
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.options.cost_models import CostModel, collect_alphabet, tabulate_cost_model
 from utils.algorithms.options.edits import EditOperation
 from utils.algorithms.wf_edit_distance import calculate_minimum_edit_distance
 
@@ -74,9 +79,9 @@ def dual_levenshtein_cost_function(current_input: Union[str, None], proposed_out
             cost = 0.0
         else:
             cost_function, table_type = COST_FUNCTIONS["levenshtein"]
-            edit_distance, _ = \
+            edit_distance_chart, _ = \
                 calculate_minimum_edit_distance(current_input, proposed_output, cost_function, table_type)
-            cost: float = edit_distance / max(len(current_input), len(proposed_output))
+            cost: float = edit_distance_chart[-1, -1].item() / max(len(current_input), len(proposed_output))
     else:
         raise ValueError(f"Invalid move <{move}> provided. Please try again with a valid move.")
     return cost
@@ -100,6 +105,28 @@ def procrustes_levenshtein_function(current_input: Union[str, None], proposed_ou
     return cost
 
 
+def compile_uniform_cost_model(alphabet: Sequence[str], data_type: str, substitution_cost: int = 1) -> CostModel:
+    table_type: DTypeLike = dtype(data_type)
+    symbols: NDArray[str] = array(alphabet, dtype=object)
+    substitution_costs: NDArray[int] = where(
+        equal.outer(symbols, symbols), 0, substitution_cost
+    ).astype(table_type).reshape(len(alphabet), len(alphabet))
+    indel_costs: NDArray[int] = full(len(alphabet), 1, dtype=table_type)
+    return CostModel(alphabet, substitution_costs, indel_costs, indel_costs.copy())
+
+
+def compile_procrustes_levenshtein_model(alphabet: Sequence[str], data_type: str, space_penalty: float = 0.5) -> \
+        CostModel:
+    table_type: DTypeLike = dtype(data_type)
+    symbols: NDArray[str] = array(alphabet, dtype=object)
+    is_space: NDArray[bool] = array([symbol.isspace() for symbol in alphabet], dtype=bool)
+    substitution_costs: NDArray[float] = where(
+        equal.outer(symbols, symbols), 0, where(is_space[:, None] | is_space[None, :], inf, 1)
+    ).astype(table_type).reshape(len(alphabet), len(alphabet))
+    indel_costs: NDArray[float] = where(is_space, space_penalty, 1).astype(table_type)
+    return CostModel(alphabet, substitution_costs, indel_costs, indel_costs.copy())
+
+
 COST_FUNCTIONS: Dict[str, Tuple[Callable, str]] = {
     "debug": (debug_levenshtein_cost_function, "int"),
     "dual": (dual_levenshtein_cost_function, "float"),
@@ -109,6 +136,23 @@ COST_FUNCTIONS: Dict[str, Tuple[Callable, str]] = {
 }
 
 
+# Cost functions with a known structure declare how to compile themselves directly;
+#   all others (e.g., debug and dual) are derived by tabulating the cost function over the alphabet.
+COST_MODEL_COMPILERS: Dict[Callable, Callable] = {
+    lcs_cost_function: partial(compile_uniform_cost_model, substitution_cost=2),
+    levenshtein_cost_function: partial(compile_uniform_cost_model, substitution_cost=1),
+    procrustes_levenshtein_function: compile_procrustes_levenshtein_model
+}
+
+
+def compile_cost_model(cost: Callable, source: Sequence[str], destination: Sequence[str], data_type: str) -> \
+        CostModel:
+    alphabet: List[str] = collect_alphabet(source, destination)
+    compiler: Callable = COST_MODEL_COMPILERS.get(cost, partial(tabulate_cost_model, cost=cost))
+    cost_model: CostModel = compiler(alphabet, data_type)
+    return cost_model
+
+
 def get_cost_function(cost_function_name: str) -> Tuple[Callable, str]:
     try:
         cost_function, data_type = COST_FUNCTIONS[cost_function_name]
@@ -0,0 +1,78 @@
+from typing import Callable, Dict, List, Sequence, Union
+
+from numpy import all as array_all, array, diagonal, dtype, eye, intp, ones, unique
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.options.edits import EditOperation
+
+
+# A cost model is a cost function compiled for the alphabet of a single pair of sequences:
+#   each symbol receives an integer identifier, substitution costs are stored in a dense (symbol x symbol) matrix,
+#   and deletion and insertion costs are stored in vectors indexed by symbol.
+class CostModel:
+    def __init__(self, alphabet: Sequence[str], substitution_costs: NDArray[float], deletion_costs: NDArray[float],
+                 insertion_costs: NDArray[float]):
+        self.alphabet: List[str] = list(alphabet)
+        self.symbol_ids: Dict[str, int] = {symbol: index for index, symbol in enumerate(self.alphabet)}
+        self.substitution_costs: NDArray[float] = substitution_costs
+        self.deletion_costs: NDArray[float] = deletion_costs
+        self.insertion_costs: NDArray[float] = insertion_costs
+
+    def encode(self, sequence: Sequence[str]) -> NDArray[int]:
+        return array([self.symbol_ids[symbol] for symbol in sequence], dtype=intp)
+
+    # A model is unit-cost when matches are free, every insertion and deletion costs 1,
+    #   and every mismatched substitution costs the same amount; that amount is returned (or None otherwise).
+    def get_unit_substitution_cost(self) -> Union[int, float, None]:
+        if not (array_all(self.deletion_costs == 1) and array_all(self.insertion_costs == 1)):
+            return None
+        elif not array_all(diagonal(self.substitution_costs) == 0):
+            return None
+
+        mismatch_costs: NDArray[float] = unique(self.substitution_costs[~eye(len(self.alphabet), dtype=bool)])
+        if len(mismatch_costs) == 0:
+            substitution_cost: Union[int, float, None] = 1
+        elif len(mismatch_costs) == 1:
+            substitution_cost = mismatch_costs[0].item()
+        else:
+            substitution_cost = None
+        return substitution_cost
+
+    # A path costs as much as its substitutions, plus the deletion of every source symbol that it leaves unaligned
+    #   and the insertion of every destination symbol that it leaves unaligned.
+    def measure_path_cost(self, source: Sequence[str], destination: Sequence[str], alignment_path: AlignmentPath) -> \
+            float:
+        source_ids: NDArray[int] = self.encode(source)
+        destination_ids: NDArray[int] = self.encode(destination)
+        deleted: NDArray[bool] = ones(len(source_ids), dtype=bool)
+        deleted[alignment_path.source_indices] = False
+        inserted: NDArray[bool] = ones(len(destination_ids), dtype=bool)
+        inserted[alignment_path.target_indices] = False
+        path_cost: float = self.substitution_costs[
+            source_ids[alignment_path.source_indices], destination_ids[alignment_path.target_indices]
+        ].sum().item() + self.deletion_costs[source_ids[deleted]].sum().item() + \
+            self.insertion_costs[destination_ids[inserted]].sum().item()
+        return path_cost
+
+
+def collect_alphabet(source: Sequence[str], destination: Sequence[str]) -> List[str]:
+    alphabet: List[str] = sorted(set(source) | set(destination))
+    return alphabet
+
+
+# Any legacy cost function can be compiled by calling it once per symbol (or pair of symbols) in the alphabet.
+def tabulate_cost_model(alphabet: Sequence[str], data_type: str, cost: Callable) -> CostModel:
+    table_type: DTypeLike = dtype(data_type)
+    substitution_costs: NDArray[float] = array(
+        [[cost(source_symbol, destination_symbol, EditOperation.SUBSTITUTE) for destination_symbol in alphabet]
+         for source_symbol in alphabet],
+        dtype=table_type
+    ).reshape(len(alphabet), len(alphabet))
+    deletion_costs: NDArray[float] = array(
+        [cost(symbol, None, EditOperation.DELETE) for symbol in alphabet], dtype=table_type
+    )
+    insertion_costs: NDArray[float] = array(
+        [cost(None, symbol, EditOperation.INSERT) for symbol in alphabet], dtype=table_type
+    )
+    return CostModel(alphabet, substitution_costs, deletion_costs, insertion_costs)
@@ -0,0 +1,130 @@
+from functools import partial
+from inspect import signature
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from utils.algorithms.anchored_alignment import DEFAULT_ANCHOR_LENGTH, align_by_anchors
+from utils.algorithms.banded_edit_distance import align_in_band
+from utils.algorithms.bit_parallel_edit_distance import align_by_bit_vectors, align_compiled_by_bit_vectors, \
+    is_bit_parallel_compatible
+from utils.algorithms.compact_edit_distance import calculate_compact_edit_distance, can_replace_chart
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.linear_space_edit_distance import align_in_linear_space
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.planner import StrategyEstimate, choose_strategy, estimate_anchor_index, estimate_strategies, \
+    format_memory_size
+from utils.algorithms.wavefront_edit_distance import calculate_wavefront_edit_distance
+from utils.algorithms.windowed_alignment import DEFAULT_WINDOW_LENGTH, align_in_windows
+from utils.algorithms.wf_edit_distance import calculate_minimum_edit_distance, collect_alignment_path
+from utils.profiling.phase_profiler import measure_phase
+
+
+# Each engine takes a source, a destination, a cost function, and a chart data type and returns the alignment path.
+#   Engines may also record details about their work in an optional statistics dictionary.
+def align_by_chart(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                   chart_function: Callable, statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    d_table, pointer_table = chart_function(source, destination, cost, data_type)
+    with measure_phase("traceback"):
+        alignment_path: AlignmentPath = collect_alignment_path(d_table, pointer_table)
+    if statistics is not None:
+        statistics["chart_type"] = d_table.dtype.name
+        statistics["cells"] = d_table.size
+    return alignment_path
+
+
+# Charts with at least this many cells are stored compactly by the auto engine, as long as that saves memory and
+#   chooses the same path; below it, the setup costs more than the smaller chart saves.
+COMPACT_CHART_AREA: int = 1 << 16
+
+
+# Unit-cost comparisons (e.g., Levenshtein and LCS) go to the bit-parallel engine; all others use the wavefront,
+#   with compact storage for large charts whose costs it holds exactly.
+def align_automatically(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                        statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, data_type)
+    if is_bit_parallel_compatible(cost_model):
+        engine_name: str = "bit-parallel"
+        alignment_path: AlignmentPath = align_compiled_by_bit_vectors(source, destination, cost_model, statistics)
+    elif (len(source) + 1) * (len(destination) + 1) >= COMPACT_CHART_AREA and \
+            can_replace_chart(source, destination, cost, data_type):
+        engine_name = "compact"
+        alignment_path = align_by_chart(
+            source, destination, cost, data_type, calculate_compact_edit_distance, statistics=statistics
+        )
+    else:
+        engine_name = "wavefront"
+        alignment_path = align_by_chart(
+            source, destination, cost, data_type, calculate_wavefront_edit_distance, statistics=statistics
+        )
+
+    if statistics is not None:
+        statistics["engine"] = engine_name
+    return alignment_path
+
+
+# Before each alignment, the planner estimates what every strategy would cost for this pair and hands the pair
+#   to the fastest one that fits within the memory budget (if any is given).
+def align_by_plan(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                  memory_budget: Union[int, None] = None, anchor_length: int = DEFAULT_ANCHOR_LENGTH,
+                  window_length: int = DEFAULT_WINDOW_LENGTH, excluded_strategies: Tuple[str, ...] = (),
+                  statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, data_type)
+    estimates: List[StrategyEstimate] = [
+        estimate for estimate in estimate_strategies(source, destination, cost_model, data_type, anchor_length,
+                                                     window_length)
+        if estimate.strategy not in excluded_strategies
+    ]
+    chosen_estimate: StrategyEstimate = choose_strategy(estimates, memory_budget)
+    if statistics is not None:
+        statistics["strategy"] = chosen_estimate.strategy
+        statistics["estimated_memory"] = format_memory_size(chosen_estimate.memory)
+        statistics["estimated_seconds"] = round(chosen_estimate.seconds, 4)
+
+    if chosen_estimate.strategy == "anchored":
+        # The gaps between anchors are planned in turn, within what the index of substrings leaves of the budget;
+        #   they are never anchored again, since a gap without anchors would otherwise be planned indefinitely.
+        gap_budget: Union[int, None] = memory_budget - estimate_anchor_index(
+            len(source), len(destination), anchor_length
+        ) if memory_budget is not None else None
+        gap_engine: Callable = partial(
+            align_by_plan, memory_budget=gap_budget, window_length=window_length, excluded_strategies=("anchored",)
+        )
+        planned_engine: Callable = partial(align_by_anchors, gap_engine=gap_engine, anchor_length=anchor_length)
+    else:
+        planned_engine = configure_engine(
+            ENGINES[chosen_estimate.strategy], anchor_length=anchor_length, memory_budget=memory_budget,
+            window_length=window_length
+        )
+    return planned_engine(source, destination, cost, data_type, statistics=statistics)
+
+
+ENGINES: Dict[str, Callable] = {
+    "anchored": partial(align_by_anchors, gap_engine=align_automatically),
+    "auto": align_automatically,
+    "banded": align_in_band,
+    "bit-parallel": align_by_bit_vectors,
+    "compact": partial(align_by_chart, chart_function=calculate_compact_edit_distance),
+    "hirschberg": align_in_linear_space,
+    "planned": align_by_plan,
+    "sequential": partial(align_by_chart, chart_function=calculate_minimum_edit_distance),
+    "wavefront": partial(align_by_chart, chart_function=calculate_wavefront_edit_distance),
+    "windowed": partial(align_in_windows, window_engine=align_automatically)
+}
+
+
+def get_engine(engine_name: str) -> Callable:
+    try:
+        engine: Callable = ENGINES[engine_name]
+    except KeyError:
+        raise ValueError(f"The alignment engine <{engine_name}> is not recognized.")
+    return engine
+
+
+# Options (e.g., anchor_length) are only bound to the engines that accept them.
+def configure_engine(engine: Callable, **engine_options) -> Callable:
+    accepted_options: Dict[str, Any] = {
+        option_name: option_value for option_name, option_value in engine_options.items()
+        if option_name in signature(engine).parameters
+    }
+    configured_engine: Callable = partial(engine, **accepted_options) if len(accepted_options) > 0 else engine
+    return configured_engine
@@ -0,0 +1,173 @@
+from collections import Counter
+from math import ceil
+from typing import Dict, List, Sequence, Tuple, Union
+
+from numpy import dtype, isfinite
+from numpy.typing import DTypeLike
+
+from utils.algorithms.anchored_alignment import DEFAULT_ANCHOR_LENGTH
+from utils.algorithms.banded_edit_distance import INITIAL_BAND_RADIUS, get_band_type
+from utils.algorithms.bit_parallel_edit_distance import is_bit_parallel_compatible
+from utils.algorithms.compact_edit_distance import scale_cost_model
+from utils.algorithms.linear_space_edit_distance import BASE_CASE_AREA
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.windowed_alignment import DEFAULT_WINDOW_LENGTH
+
+
+MEMORY_UNITS: Dict[str, int] = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+# Chart-filling engines take roughly this long per anti-diagonal (for NumPy dispatch) and per cell, respectively;
+#   the figures were measured on lines of 500 to 3000 characters, and only their relative sizes matter to the planner.
+DIAGONAL_SECONDS: float = 25e-6
+CELL_SECONDS: Dict[str, float] = {
+    "banded": 25e-9,
+    "compact": 25e-9,
+    "hirschberg": 40e-9,
+    "wavefront": 20e-9
+}
+BIT_PARALLEL_COLUMN_SECONDS: float = 4e-6
+BIT_PARALLEL_CELL_SECONDS: float = 0.5e-9
+ANCHOR_POSITION_SECONDS: float = 3e-6
+
+
+class StrategyEstimate:
+    """ The predicted peak memory (in bytes) and running time (in seconds) of one strategy for one pair. """
+    def __init__(self, strategy: str, memory: int, seconds: float, is_exact: bool = True):
+        self.strategy: str = strategy
+        self.memory: int = memory
+        self.seconds: float = seconds
+        self.is_exact: bool = is_exact
+
+    def __repr__(self) -> str:
+        return f"{self.strategy} ({format_memory_size(self.memory)}, {self.seconds:.3f}s)"
+
+
+def parse_memory_size(memory_text: str) -> int:
+    memory_text = memory_text.strip().upper().removesuffix("B")
+    unit: str = memory_text[-1] if len(memory_text) > 0 and memory_text[-1] in MEMORY_UNITS else ""
+    try:
+        memory_size: int = int(float(memory_text[:(len(memory_text) - len(unit))]) * MEMORY_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"The memory size <{memory_text}> is not recognized; it should look like 512M or 2G.")
+    return memory_size
+
+
+def format_memory_size(memory_size: int) -> str:
+    for unit in ("T", "G", "M", "K"):
+        if memory_size >= MEMORY_UNITS[unit]:
+            return f"{memory_size / MEMORY_UNITS[unit]:.1f}{unit}"
+    return f"{memory_size}B"
+
+
+# The anchored engine's index keeps every substring of anchor_length characters (with its position) on either side.
+def estimate_anchor_index(source_length: int, destination_length: int, anchor_length: int) -> int:
+    return (source_length + destination_length) * (anchor_length + 80)
+
+
+# Since every edit changes the count of at most two characters, half of the difference between the two texts'
+#   character counts is a lower bound on the number of edits, which in turn bounds the width of the band.
+def estimate_band(source: Sequence[str], destination: Sequence[str]) -> Tuple[int, int]:
+    count_difference: Counter = Counter(source)
+    count_difference.subtract(Counter(destination))
+    edit_bound: int = max(abs(len(source) - len(destination)),
+                          sum(abs(count) for count in count_difference.values()) // 2)
+    band_radius: int = INITIAL_BAND_RADIUS
+    band_passes: int = 1
+    while band_radius < edit_bound and band_radius < max(len(source), len(destination)):
+        band_radius *= 2
+        band_passes += 1
+    return abs(len(source) - len(destination)) + 2 * band_radius + 1, band_passes
+
+
+def estimate_full_chart(source_length: int, destination_length: int, cost_model: CostModel, data_type: str) -> \
+        List[StrategyEstimate]:
+    cell_count: int = (source_length + 1) * (destination_length + 1)
+    diagonal_seconds: float = (source_length + destination_length) * DIAGONAL_SECONDS
+    if is_bit_parallel_compatible(cost_model):
+        column_memory: int = 2 * (destination_length + 1) * (source_length // 8 + 32)
+        bit_parallel_seconds: float = destination_length * BIT_PARALLEL_COLUMN_SECONDS + \
+            source_length * destination_length * BIT_PARALLEL_CELL_SECONDS
+        return [StrategyEstimate("bit-parallel", column_memory, bit_parallel_seconds)]
+
+    estimates: List[StrategyEstimate] = [
+        StrategyEstimate("wavefront", cell_count * (dtype(data_type).itemsize + 1),
+                         diagonal_seconds + cell_count * CELL_SECONDS["wavefront"])
+    ]
+    scaling: Union[Tuple[CostModel, int], None] = scale_cost_model(cost_model, source_length + destination_length)
+    if scaling is not None:
+        compact_itemsize: int = scaling[0].deletion_costs.dtype.itemsize
+        estimates.append(
+            StrategyEstimate("compact", cell_count * compact_itemsize + cell_count // 4,
+                             diagonal_seconds + cell_count * CELL_SECONDS["compact"])
+        )
+    return estimates
+
+
+def estimate_strategies(source: Sequence[str], destination: Sequence[str], cost_model: CostModel, data_type: str,
+                        anchor_length: int = DEFAULT_ANCHOR_LENGTH, window_length: int = DEFAULT_WINDOW_LENGTH) -> \
+        List[StrategyEstimate]:
+    source_length: int = len(source)
+    destination_length: int = len(destination)
+    diagonal_seconds: float = (source_length + destination_length) * DIAGONAL_SECONDS
+    estimates: List[StrategyEstimate] = estimate_full_chart(source_length, destination_length, cost_model, data_type)
+
+    # Besides its base cases, the linear-space engine keeps a handful of rows and columns of 64-bit entries.
+    is_linear_space_compatible: bool = isfinite(cost_model.insertion_costs).all().item()
+    linear_space_memory: int = BASE_CASE_AREA * 9 + 48 * (source_length + destination_length)
+
+    # The band is estimated from a lower bound on its width, although it may have to grow as wide as the chart:
+    #   within a budget, it falls back on the linear-space engine as soon as the next band would not fit, so it never
+    #   needs more than the larger of the two (nor, in any case, more than the widest band).
+    band_type: DTypeLike = get_band_type(data_type)
+    band_width, band_passes = estimate_band(source, destination)
+    band_cells: int = (source_length + 1) * (min(band_width, source_length + destination_length + 1) + 2)
+    band_memory: int = (source_length + 1) * (source_length + destination_length + 3) * (band_type.itemsize + 1)
+    if is_linear_space_compatible is True:
+        band_memory = min(band_memory, max(band_cells * (band_type.itemsize + 1), linear_space_memory))
+    estimates.append(
+        StrategyEstimate("banded", band_memory, band_passes * (diagonal_seconds + band_cells * CELL_SECONDS["banded"]))
+    )
+
+    if is_linear_space_compatible is True:
+        estimates.append(
+            StrategyEstimate("hirschberg", linear_space_memory,
+                             diagonal_seconds + source_length * destination_length * CELL_SECONDS["hirschberg"])
+        )
+
+    # The approximate strategies are only estimated for the part of their work that does not depend on the texts:
+    #   the windowed engine's windows, and the anchored engine's index of substrings. The anchored engine's gaps are
+    #   planned in turn, within what the index leaves of the budget; as no gap is longer than the pair itself, they fit
+    #   whenever the index and the smallest of the other strategies do.
+    window_count: int = max(1, ceil(max(source_length, destination_length) / max(1, window_length // 2)))
+    window_length = min(window_length, max(source_length, destination_length))
+    window_estimate: StrategyEstimate = min(
+        estimate_full_chart(window_length, window_length, cost_model, data_type), key=lambda estimate: estimate.seconds
+    )
+    estimates.append(
+        StrategyEstimate("windowed", window_estimate.memory + 8 * (source_length + destination_length),
+                         window_count * window_estimate.seconds, is_exact=False)
+    )
+    anchored_memory: int = estimate_anchor_index(source_length, destination_length, anchor_length) + \
+        min(estimate.memory for estimate in estimates)
+    estimates.append(
+        StrategyEstimate("anchored", anchored_memory,
+                         (source_length + destination_length) * ANCHOR_POSITION_SECONDS, is_exact=False)
+    )
+    return estimates
+
+
+# The planner prefers the fastest exact strategy that fits within the memory budget; if none does, it falls back
+#   on the fastest approximate one that fits. Failing that, it stops before anything is allocated.
+def choose_strategy(estimates: List[StrategyEstimate], memory_budget: Union[int, None]) -> StrategyEstimate:
+    fitting_estimates: List[StrategyEstimate] = [
+        estimate for estimate in estimates if memory_budget is None or estimate.memory <= memory_budget
+    ]
+    if len(fitting_estimates) == 0:
+        smallest_estimate: StrategyEstimate = min(estimates, key=lambda estimate: estimate.memory)
+        raise ValueError(f"No alignment strategy fits within the memory budget of "
+                         f"<{format_memory_size(memory_budget)}>; the smallest, <{smallest_estimate}>, needs more.")
+
+    chosen_estimate: StrategyEstimate = min(
+        fitting_estimates, key=lambda estimate: (not estimate.is_exact, estimate.seconds)
+    )
+    return chosen_estimate
@@ -0,0 +1,68 @@
+from typing import Callable, Sequence, Tuple
+
+from numpy import arange, cumsum, dtype, minimum, where, zeros
+from numpy.typing import DTypeLike, NDArray
+
+from utils.algorithms.options.cost_functions import compile_cost_model
+from utils.algorithms.options.cost_models import CostModel
+from utils.algorithms.options.edits import EditOperation
+from utils.algorithms.wf_edit_distance import initialize_pointer_table
+from utils.profiling.phase_profiler import measure_phase
+
+
+# The edges of the chart are running sums of deletion and insertion costs, just as in initialize_chart;
+#   accumulating in the chart's own type keeps the sums identical to the cell-by-cell version.
+def initialize_compiled_chart(cost_model: CostModel, source_ids: NDArray[int], destination_ids: NDArray[int],
+                              data_type: str) -> NDArray[float]:
+    chart_type: DTypeLike = dtype(data_type)
+    new_chart: NDArray[float] = zeros((len(source_ids) + 1, len(destination_ids) + 1), chart_type)
+    new_chart[1:, 0] = cumsum(cost_model.deletion_costs[source_ids], dtype=chart_type)
+    new_chart[0, 1:] = cumsum(cost_model.insertion_costs[destination_ids], dtype=chart_type)
+    return new_chart
+
+
+# We fill the same chart as Wagner and Fischer's algorithm, but one anti-diagonal at a time:
+#   every cell on anti-diagonal i + j only depends on the two anti-diagonals before it.
+def calculate_wavefront_edit_distance(source: Sequence[str], destination: Sequence[str], cost: Callable,
+                                      data_type: str) -> Tuple[NDArray[float], NDArray[int]]:
+    cost_model: CostModel = compile_cost_model(cost, source, destination, data_type)
+    source_ids: NDArray[int] = cost_model.encode(source)
+    destination_ids: NDArray[int] = cost_model.encode(destination)
+    with measure_phase("allocation"):
+        chart: NDArray[float] = initialize_compiled_chart(cost_model, source_ids, destination_ids, data_type)
+        pointer_table: NDArray[int] = initialize_pointer_table(source, destination)
+
+    source_length: int = len(source)
+    destination_length: int = len(destination)
+    for diagonal in range(2, source_length + destination_length + 1):
+        rows: NDArray[int] = arange(max(1, diagonal - destination_length), min(source_length, diagonal - 1) + 1)
+        columns: NDArray[int] = diagonal - rows
+        compute_diagonal_edit_costs(
+            chart, pointer_table, rows, columns,
+            cost_model.substitution_costs[source_ids[rows - 1], destination_ids[columns - 1]],
+            cost_model.deletion_costs[source_ids[rows - 1]], cost_model.insertion_costs[destination_ids[columns - 1]]
+        )
+
+    return chart, pointer_table
+
+
+def compute_diagonal_edit_costs(chart: NDArray[float], pointer_table: NDArray[int], rows: NDArray[int],
+                                columns: NDArray[int], substitution_costs: NDArray[float],
+                                deletion_costs: NDArray[float], insertion_costs: NDArray[float]):
+    chart[rows, columns], pointer_table[rows, columns] = select_edit_operations(
+        chart[rows - 1, columns - 1] + substitution_costs,
+        chart[rows - 1, columns] + deletion_costs,
+        chart[rows, columns - 1] + insertion_costs
+    )
+
+
+def select_edit_operations(substitution_totals: NDArray[float], deletion_totals: NDArray[float],
+                           insertion_totals: NDArray[float]) -> Tuple[NDArray[float], NDArray[int]]:
+    # As with argmin, the first minimal operation (in EDIT_OPERATIONS order) wins any tie.
+    pointers: NDArray[int] = where(
+        (substitution_totals <= deletion_totals) & (substitution_totals <= insertion_totals),
+        EditOperation.SUBSTITUTE,
+        where(deletion_totals <= insertion_totals, EditOperation.DELETE, EditOperation.INSERT)
+    )
+    minimum_totals: NDArray[float] = minimum(minimum(substitution_totals, deletion_totals), insertion_totals)
+    return minimum_totals, pointers
@@ -3,7 +3,9 @@ from typing import Callable, List, Sequence, Tuple
 from numpy import argmin, dtype, zeros
 from numpy.typing import NDArray, DTypeLike
 
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
 from utils.algorithms.options.edits import EditOperation, EDIT_OPERATIONS
+from utils.profiling.phase_profiler import measure_phase
 
 
 # We initialize the chart in accordance with Wagner and Fischer's Algorithm X.
@@ -42,8 +44,9 @@ def fill_columns(destination: Sequence, chart: NDArray[float], cost: Callable, c
 # We perform the main edit distance algorithm presented in Fischer and Wagner 1974.
 def calculate_minimum_edit_distance(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str) \
         -> Tuple[NDArray[float], NDArray[int]]:
-    chart: NDArray[float] = initialize_chart(source, destination, cost, data_type)
-    pointer_table: NDArray[int] = initialize_pointer_table(source, destination)
+    with measure_phase("allocation"):
+        chart: NDArray[float] = initialize_chart(source, destination, cost, data_type)
+        pointer_table: NDArray[int] = initialize_pointer_table(source, destination)
     for i in range(1, len(source) + 1):
         for j in range(1, len(destination) + 1):
             compute_edit_cost(source, destination, chart, pointer_table, cost, i, j)
@@ -65,32 +68,27 @@ def compute_edit_cost(source: Sequence, destination: Sequence, chart: NDArray[fl
     pointer_table[(row, column)] = EDIT_OPERATIONS[minimum_cost_index]
 
 
-def collect_alignment_path(d_table: NDArray[float], pointer_table: NDArray[int]) -> List[Tuple[int, int]]:
-    alignment_path: List[Tuple[int, int]] = []
-
-    goal_entry: Tuple[int, int] = d_table.shape
-    goal_rows, goal_columns = goal_entry
-    goal_entry = (goal_rows - 1, goal_columns - 1)
-
-    current_entry: Tuple[int, int] = goal_entry
-    edge_index: int = 0
-    while edge_index not in current_entry:
-        current_row, current_column = current_entry
-        if pointer_table[current_row][current_column] != 0:
-            if pointer_table[current_row][current_column] == EditOperation.SUBSTITUTE:
-                previous_row: int = current_row - 1
-                previous_column: int = current_column - 1
-                alignment_path.insert(0, (previous_row, previous_column))
-            elif pointer_table[current_row][current_column] == EditOperation.DELETE:
-                previous_row: int = current_row - 1
-                previous_column: int = current_column
-            elif pointer_table[current_row][current_column] == EditOperation.INSERT:
-                previous_row: int = current_row
-                previous_column: int = current_column - 1
-            else:
-                raise ValueError(f"The edit operation <{pointer_table[current_row][current_column]}> is not supported.")
-            current_entry = (previous_row, previous_column)
+def collect_alignment_path(d_table: NDArray[float], pointer_table: NDArray[int]) -> AlignmentPath:
+    source_indices: List[int] = []
+    target_indices: List[int] = []
+
+    goal_rows, goal_columns = d_table.shape
+    current_row: int = goal_rows - 1
+    current_column: int = goal_columns - 1
+    while current_row > 0 and current_column > 0:
+        pointer: int = pointer_table.item(current_row, current_column)
+        if pointer == EditOperation.SUBSTITUTE:
+            current_row -= 1
+            current_column -= 1
+            source_indices.append(current_row)
+            target_indices.append(current_column)
+        elif pointer == EditOperation.DELETE:
+            current_row -= 1
+        elif pointer == EditOperation.INSERT:
+            current_column -= 1
+        elif pointer == 0:
+            raise ValueError(f"A pointer was not stored for <{(current_row, current_column)}>.")
         else:
-            raise ValueError(f"A pointer was not stored for <{current_entry}>.")
+            raise ValueError(f"The edit operation <{pointer}> is not supported.")
 
-    return alignment_path
+    return AlignmentPath.from_traceback(source_indices, target_indices)
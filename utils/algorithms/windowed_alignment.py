@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from numpy import flatnonzero
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+
+
+# Each window covers at most this many characters on either side; only the first half of it is kept.
+DEFAULT_WINDOW_LENGTH: int = 4096
+
+# A window without a seam is doubled at most this many times; past that, it is cut at its far corner instead.
+MAX_WINDOW_DOUBLINGS: int = 3
+
+
+# The seam is the last pair of identical characters within the kept half of the window. Stitching the next window
+#   to it is safe as long as both windows agree on how the text around it aligns.
+def find_window_seam(source_window: Sequence[str], destination_window: Sequence[str], window_path: AlignmentPath,
+                     kept_length: int) -> int:
+    kept_indices: NDArray[int] = flatnonzero(
+        (window_path.source_indices < kept_length) & (window_path.target_indices < kept_length)
+    )
+    for path_index in kept_indices[::-1].tolist():
+        if source_window[window_path.source_indices[path_index]] == \
+                destination_window[window_path.target_indices[path_index]]:
+            return path_index
+    return -1
+
+
+def select_overlap(path: AlignmentPath, source_end: int, destination_end: int) -> List[Tuple[int, int]]:
+    overlap_indices: NDArray[int] = flatnonzero(
+        (path.source_indices < source_end) & (path.target_indices < destination_end)
+    )
+    return list(zip(path.source_indices[overlap_indices].tolist(), path.target_indices[overlap_indices].tolist()))
+
+
+# Long documents are aligned window by window: after each window is aligned, its path is kept up to a seam
+#   in the window's first half, and the next window starts right after that seam. The windows thus overlap,
+#   and each seam is checked by comparing how the two windows around it align their shared text up to three quarters
+#   of the earlier window; disagreements are counted in the statistics, as they mark where the stitched path
+#   most likely differs from the one for the whole document (which it is not guaranteed to match even where the
+#   windows agree). A window without any seam is doubled until it finds one, up to MAX_WINDOW_DOUBLINGS times;
+#   past that, its whole path is kept and the next window starts where both of its sides end, which is counted as
+#   a forced seam.
+def align_in_windows(source: Sequence[str], destination: Sequence[str], cost: Callable, data_type: str,
+                     window_engine: Callable, window_length: int = DEFAULT_WINDOW_LENGTH,
+                     statistics: Union[Dict[str, Any], None] = None) -> AlignmentPath:
+    if window_length < 2:
+        raise ValueError(f"The window length <{window_length}> is too small; it should be at least 2.")
+
+    path_segments: List[AlignmentPath] = []
+    source_start: int = 0
+    destination_start: int = 0
+    current_length: int = window_length
+    window_count: int = 0
+    seam_disagreements: int = 0
+    forced_seams: int = 0
+    unchecked_path: Union[AlignmentPath, None] = None
+    check_ends: Tuple[int, int] = (0, 0)
+    while source_start < len(source) and destination_start < len(destination):
+        source_end: int = min(len(source), source_start + current_length)
+        destination_end: int = min(len(destination), destination_start + current_length)
+        source_window: Sequence[str] = source[source_start:source_end]
+        destination_window: Sequence[str] = destination[destination_start:destination_end]
+        window_path: AlignmentPath = window_engine(source_window, destination_window, cost, data_type)
+        window_count += 1
+
+        if unchecked_path is not None:
+            shifted_path: AlignmentPath = window_path.shift(source_start, destination_start)
+            if select_overlap(unchecked_path, *check_ends) != select_overlap(shifted_path, *check_ends):
+                seam_disagreements += 1
+            unchecked_path = None
+
+        if source_end == len(source) and destination_end == len(destination):
+            path_segments.append(window_path.shift(source_start, destination_start))
+            break
+
+        seam_index: int = find_window_seam(source_window, destination_window, window_path, current_length // 2)
+        if seam_index < 0 and current_length < window_length << MAX_WINDOW_DOUBLINGS:
+            current_length *= 2
+            continue
+        elif seam_index < 0:
+            path_segments.append(window_path.shift(source_start, destination_start))
+            forced_seams += 1
+            source_start, destination_start = source_end, destination_end
+            current_length = window_length
+            continue
+
+        seam_source: int = window_path.source_indices[seam_index].item()
+        seam_destination: int = window_path.target_indices[seam_index].item()
+        path_segments.append(
+            AlignmentPath(
+                window_path.source_indices[:(seam_index + 1)], window_path.target_indices[:(seam_index + 1)]
+            ).shift(source_start, destination_start)
+        )
+        unchecked_path = AlignmentPath(
+            window_path.source_indices[(seam_index + 1):], window_path.target_indices[(seam_index + 1):]
+        ).shift(source_start, destination_start)
+        check_ends = (source_start + 3 * current_length // 4, destination_start + 3 * current_length // 4)
+        source_start += seam_source + 1
+        destination_start += seam_destination + 1
+        current_length = window_length
+
+    if statistics is not None:
+        statistics["window_count"] = window_count
+        statistics["seam_disagreements"] = seam_disagreements
+        statistics["forced_seams"] = forced_seams
+    stitched_path: AlignmentPath = AlignmentPath.concatenate(path_segments)
+    return stitched_path
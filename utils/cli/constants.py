@@ -7,12 +7,65 @@ class HelpMessage(Enum):
     TARGET = "the filepath of the target of alignment--where tagged data is lacking"
 
     # Optional Arguments
+    ANCHOR_LENGTH = "sets the minimum length of the exact matches used as anchors by the anchored engine"
+    BATCH_SIZE = "if positive, aligns lines this many at a time with a batched kernel, grouped by length; " \
+                 "lines with charts of more than 65536 cells still go through the engine"
+    BUCKET_WIDTH = "sets how close in length (in characters) the lines aligned in the same batch must be"
+    CACHE_DIR = "if given, stores alignments in a cache in this directory and reuses them for repeated lines"
+    CACHE_SIZE = "limits the size (e.g., 512M, 2G) of the alignment cache on disk"
+    CHUNK_SIZE = "if positive, splits each file into chunks of this many lines (or zipped pairs), " \
+                 "which are aligned in parallel by the processes given in --processes"
     COST_FUNCTION = "indicates the cost function that procrustes will use for alignment"
+    ENGINE = "selects the algorithm used to compute the alignment (e.g., anchored, auto, banded, bit-parallel, " \
+             "compact, hirschberg, planned, sequential, wavefront, windowed)"
     FLIP = "if true, operates on target side instead of source"
+    LINKS = "indicates the links (in Pharaoh format) between source and other side, one line per sentence, " \
+            "when word alignments are given as separate streams; requires --other-side"
+    MEMORY_BUDGET = "limits the memory (e.g., 512M, 2G) that each alignment may use; requires the planned engine " \
+                    "(which auto then switches to) and cannot be combined with --batch-size"
     MODE = "designates the format that the source and target should take"
+    OTHER_SIDE = "indicates the text of the other side of word alignments given as separate streams, " \
+                 "one line per sentence; requires --links"
     OUTPUT = "indicates the filepath where the output (or outputs) of the alignment process should be stored"
+    OUTPUT_TEXT = "if given with separate word streams, writes the projected side's text here, " \
+                  "one line per sentence, to go along with the projected links in --output"
+    PREVIOUS_OUTPUT = "indicates the output (or outputs) of a previous run, whose projections are reused " \
+                      "for every line pair that has not changed since (with the same settings)"
     PROCESSES = "determines the number of processes that will be used in alignment; " \
-                "currently only applicable to multi-file, independent alignments"
+                "files are aligned in parallel, as are their chunks when --chunk-size is given"
+    PROFILE = "if given, times each phase of alignment (per file and over the whole run) and writes the results to " \
+              "this path as JSON"
     SEGMENTER = "selects how text will be divided up in the output postprocessing"
+    STATISTICS = "if true, outputs statistics about each alignment (e.g., lengths, band widths) to stderr"
+    STREAM = "if true, aligns each XML document (with --mode xml and --zipper file) as it is read, " \
+             "writing it out piece by piece, so that memory does not grow with its length"
     VERBOSE = "if true, outputs intermediate results of alignment to stderr"
+    WINDOW_LENGTH = "sets the number of characters on either side of each window aligned by the windowed engine"
+    WRITE_INDEX = "if true, writes an index of the projections next to each output (as with --previous-output), " \
+                  "so that a later run can reuse them"
     ZIPPER = "chooses what objects (e.g., lines, files) will be paired and how pairing will occur"
+
+
+class BenchmarkHelpMessage(Enum):
+    # Required Arguments
+    BASELINE = "the filepath of the benchmark results to compare against"
+    CANDIDATE = "the filepath of the benchmark results to check for regressions"
+    OUTPUT = "the filepath where the benchmark results will be stored as JSON"
+
+    # Optional Arguments
+    CASES = "selects the synthetic corpora (mode and zipper) to benchmark"
+    COST_FUNCTIONS = "selects the cost functions to benchmark"
+    NOISE = "sets the probability (between 0 and 1) with which each token of a synthetic target is changed"
+    REPEATS = "sets how many times each benchmark is run; the fastest run is recorded"
+    SAMPLE_SIZE = "sets how many pairs of each corpus are used to time the individual stages of alignment"
+    SEED = "sets the seed from which the synthetic corpora are generated"
+    THRESHOLD = "sets the relative slowdown (e.g., 0.1 for 10%%) beyond which a benchmark is flagged as a regression"
+
+
+class TreesHelpMessage(Enum):
+    # Positional Arguments
+    INPUT = "the filepath of the trees to print, one per line; by default, they are read from stdin"
+
+    # Optional Arguments
+    CHUNK_SIZE = "sets how many lines are sent to each process at a time when printing in parallel"
+    PROCESSES = "determines the number of processes that will print trees; their order is kept either way"
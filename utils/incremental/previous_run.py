@@ -0,0 +1,99 @@
+from hashlib import sha256
+from heapq import merge
+from typing import Any, Callable, Dict, List, TextIO, Tuple, Type, Union
+
+from utils.algorithms.alignment_cache import ENGINE_VERSION, describe_callable
+
+
+# Each output is accompanied by an index of its projections, in a file named after it with this suffix.
+INDEX_SUFFIX: str = ".index"
+
+
+# Whatever changes the projection of a pair, besides its content, is part of every key; a previous run that used other
+#   settings thus has no projection to offer.
+#   In batch mode, short lines go through the batched kernel rather than the engine.
+def describe_settings(alignment_type: Type, alignment_kwargs: Dict[str, Any], cost: Callable, engine: Callable,
+                      zip_function: Callable, is_batched: bool = False) -> str:
+    segmentation_function: Union[Callable, None] = alignment_kwargs["segmentation_function"]
+    return "; ".join((
+        f"mode={describe_callable(alignment_type)}",
+        f"flip={alignment_kwargs['is_flipped']}",
+        f"segmenter={describe_callable(segmentation_function) if segmentation_function is not None else None}",
+        f"cost={describe_callable(cost)}",
+        f"engine={describe_callable(engine)}",
+        f"batched={is_batched}",
+        f"zipper={describe_callable(zip_function)}",
+        f"version={ENGINE_VERSION}"
+    ))
+
+
+# With separate word streams, a source line is made up of several fields, which are keyed as tab-separated input is.
+def make_pair_key(source_line: Union[str, Tuple[str, ...]], target_line: str, settings: str) -> bytes:
+    pair_hash = sha256()
+    for key_part in (settings, source_line if isinstance(source_line, str) else "\t".join(source_line), target_line):
+        encoded_part: bytes = key_part.encode("utf-8", errors="surrogatepass")
+        pair_hash.update(len(encoded_part).to_bytes(8, byteorder="little"))
+        pair_hash.update(encoded_part)
+    return pair_hash.digest()
+
+
+class ProjectionIndex:
+    """ The keys of the pairs whose projections an output holds, in order, with the number of lines each one spans. """
+    def __init__(self, output_filepath: str, settings: str):
+        self.settings: str = settings
+        self.index_file: TextIO = open(f"{output_filepath}{INDEX_SUFFIX}", mode="w+", encoding="utf-8")
+        # Pairs are keyed as they are read, and their entries are written along with their projections.
+        self.pending_keys: Dict[int, bytes] = {}
+
+    def add_chunk(self, line_chunk: List[Tuple[int, str, str]]):
+        for line_index, source_line, target_line in line_chunk:
+            self.pending_keys[line_index] = make_pair_key(source_line, target_line, self.settings)
+
+    def record(self, line_index: int, projection: str):
+        line_count: int = projection.count("\n") + 1
+        self.index_file.write(f"{self.pending_keys.pop(line_index).hex()}\t{line_count}\n")
+
+    def close(self):
+        self.index_file.close()
+
+
+class PreviousRun:
+    """ The projections written by an earlier run, indexed by the content of the line pairs that produced them. """
+    def __init__(self, output_filepath: str, settings: str):
+        self.settings: str = settings
+        self.projections: Dict[bytes, str] = {}
+        with open(output_filepath, mode="r", encoding="utf-8", newline="\n") as output_file, \
+                open(f"{output_filepath}{INDEX_SUFFIX}", mode="r", encoding="utf-8") as index_file:
+            # A projection may span several lines of the output (e.g., a segmented XML document), as its index records.
+            previous_lines: List[str] = [line.removesuffix("\n") for line in output_file]
+            line_start: int = 0
+            for index_line in index_file:
+                pair_key, line_count = index_line.split("\t")
+                line_end: int = line_start + int(line_count)
+                self.projections[bytes.fromhex(pair_key)] = "\n".join(previous_lines[line_start:line_end])
+                line_start = line_end
+
+        if line_start != len(previous_lines):
+            raise ValueError(f"The previous output, <{output_filepath}>, has <{len(previous_lines)}> lines, "
+                             f"but its index accounts for <{line_start}>.")
+
+    # A projection only depends on the content of its pair (and the settings), so any pair that also occurred in
+    #   the previous run (whether at the same position or not) reuses its projection. Only the rest need to be aligned.
+    def split_chunk(self, line_chunk: List[Tuple[int, str, str]]) -> \
+            Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Tuple[int, str, str]]]:
+        reused_results: List[Tuple[int, str, Dict[str, Any]]] = []
+        remaining_chunk: List[Tuple[int, str, str]] = []
+        for line_index, source_line, target_line in line_chunk:
+            projection: Union[str, None] = \
+                self.projections.get(make_pair_key(source_line, target_line, self.settings))
+            if projection is not None:
+                reused_results.append((line_index, projection, {"fast_path": "reused"}))
+            else:
+                remaining_chunk.append((line_index, source_line, target_line))
+        return reused_results, remaining_chunk
+
+
+def merge_chunk_results(reused_results: List[Tuple[int, str, Dict[str, Any]]],
+                        aligned_results: List[Tuple[int, str, Dict[str, Any]]]) -> \
+        List[Tuple[int, str, Dict[str, Any]]]:
+    return list(merge(reused_results, aligned_results, key=lambda chunk_result: chunk_result[0]))
@@ -1,5 +1,7 @@
 from abc import abstractmethod
 
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+
 
 class Alignment:
     @abstractmethod
@@ -11,5 +13,5 @@ class Alignment:
         return NotImplementedError
 
     @abstractmethod
-    def project(self, revised_target_line: str, character_alignment):
+    def project(self, revised_target_line: str, character_alignment: AlignmentPath):
         raise NotImplementedError
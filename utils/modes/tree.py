@@ -1,5 +1,11 @@
 from typing import List, Tuple
 
+from numpy import arange, array, concatenate, cumsum, int64, maximum, searchsorted, zeros
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.data_structures.exceptions import RootDeletedException
+from utils.algorithms.data_structures.node import Node
 from utils.algorithms.data_structures.tree import Tree
 from utils.modes.alignment import Alignment
 
@@ -7,23 +13,74 @@ from utils.modes.alignment import Alignment
 class TreeAlignment(Alignment):
     def __init__(self, source_line: str, **alignment_kwargs):
         super().__init__()
-        self.tree = Tree.from_str(source_line)
-        self.characters = " ".join(n.label for n in self.tree.leaves())
-        label_index: int = 0
-        for node in self.tree.bottomup():
-            if len(node.children) == 0:
-                if label_index > 0:
-                    label_index += 1   # space
-                node.span = (label_index, label_index + len(node.label))
-                label_index += len(node.label)
-            else:
-                node.span = (node.children[0].span[0], node.children[-1].span[-1])
+        self.tree: Tree = Tree.from_str(source_line)
+        if self.tree.root is None:
+            raise ValueError(f"The tree <{source_line.strip()}> could not be parsed.")
+        self.index_spans()
 
     def __str__(self):
-        return str(self.tree)
+        return str(self.tree) if self.tree.root is not None else ""
+
+    # The tree's text is its leaves, separated by single spaces. Each node's span is the slice of that text which
+    #   its leaves cover; the nodes are visited bottom-up with an explicit stack, so that deep trees are no problem.
+    def index_spans(self):
+        self.leaf_nodes: List[Node] = []
+        character_index: int = 0
+        pending_nodes: List[Tuple[Node, bool]] = [(self.tree.root, False)] if self.tree.root is not None else []
+        while len(pending_nodes) > 0:
+            node, is_expanded = pending_nodes.pop()
+            if len(node.children) == 0:
+                if len(self.leaf_nodes) > 0:
+                    character_index += 1   # space
+                node.span = (character_index, character_index + len(node.label))
+                character_index += len(node.label)
+                self.leaf_nodes.append(node)
+            elif is_expanded is True:
+                node.span = (node.children[0].span[0], node.children[-1].span[1])
+            else:
+                pending_nodes.append((node, True))
+                pending_nodes.extend((child, False) for child in reversed(node.children))
+        self.characters: str = " ".join(leaf.label for leaf in self.leaf_nodes)
 
     def get_characters(self):
         return self.characters
 
-    def project(self, revised_target_line: str, character_alignment: List[Tuple[int, int]]):
-        raise NotImplementedError
+    def project(self, revised_target_line: str, character_alignment: AlignmentPath):
+        # As in XMLAlignment, each source character receives the slice of the target ending just after its aligned
+        #   character, so that each leaf's span maps to a contiguous slice of the target, in order.
+        #   Every target token then goes to the leaf whose slice it starts in; inserted tokens thus go to the right.
+        source_length: int = len(self.characters)
+        if source_length == 0:
+            return
+
+        target_ends: NDArray[int] = zeros(source_length, dtype=int64)
+        target_ends[character_alignment.source_indices] = character_alignment.target_indices + 1
+        target_ends = maximum.accumulate(target_ends)
+        target_ends[-1] = len(revised_target_line)
+
+        leaf_starts: NDArray[int] = array([leaf.span[0] for leaf in self.leaf_nodes], dtype=int64)
+        projected_starts: NDArray[int] = concatenate(([0], target_ends)).astype(int64)[leaf_starts]
+        target_tokens: List[str] = revised_target_line.split()
+        token_lengths: NDArray[int] = array([len(token) + 1 for token in target_tokens], dtype=int64)
+        token_starts: NDArray[int] = cumsum(token_lengths) - token_lengths
+        token_leaves: NDArray[int] = searchsorted(projected_starts, token_starts, side="right") - 1
+        token_offsets: List[int] = searchsorted(token_leaves, arange(len(self.leaf_nodes) + 1)).tolist()
+
+        # Constituents keep their place in the tree, and so span the tokens of their leaves. A leaf that receives
+        #   several tokens is followed by new leaves for the rest, while one that receives none is removed,
+        #   along with any constituents that are left empty. Leaves are visited right to left, so that inserting
+        #   or removing one leaves the positions of those still to be visited unchanged.
+        for leaf_index in reversed(range(len(self.leaf_nodes))):
+            leaf: Node = self.leaf_nodes[leaf_index]
+            leaf_tokens: List[str] = target_tokens[token_offsets[leaf_index]:token_offsets[leaf_index + 1]]
+            if len(leaf_tokens) == 0:
+                try:
+                    leaf.delete_clean()
+                except RootDeletedException:
+                    self.tree.root = None
+            else:
+                leaf.label = leaf_tokens[0]
+                if leaf.parent is not None:
+                    for token_index, token in enumerate(leaf_tokens[1:], 1):
+                        leaf.parent.insert_child(leaf.order + token_index, Node(token, []))
+        self.index_spans()
@@ -1,73 +1,123 @@
 from collections import defaultdict
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
+from numpy import arange, array, concatenate, cumsum, full, int32, int64, repeat, stack, unique, zeros
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
 from utils.modes.alignment import Alignment
 
 
+# Words are separated by single spaces, so the word that each character belongs to (or -1, for a space)
+#   follows from the words' lengths alone.
+def locate_word_characters(word_lengths: NDArray[int]) -> NDArray[int]:
+    if len(word_lengths) == 0:
+        return full(0, -1, dtype=int32)
+    word_positions: NDArray[int] = repeat(arange(len(word_lengths), dtype=int32), word_lengths + 1)[:-1]
+    word_positions[(cumsum(word_lengths + 1) - 1)[:-1]] = -1
+    return word_positions
+
+
 class WordAlignment(Alignment):
-    def __init__(self, source_line: str, is_flipped: bool = False, **alignment_kwargs):
+    # The source line holds both sides' text and their links, separated by tabs. When these are read from separate
+    #   streams instead (see zip_word_streams), it is given as a tuple of the three fields, and only the projected
+    #   links are written back out, so that they can go to a stream of their own.
+    def __init__(self, source_line: Union[str, Tuple[str, str, str]], is_flipped: bool = False, **alignment_kwargs):
         super().__init__()
         self.is_flipped = is_flipped
+        self.has_separate_fields: bool = not isinstance(source_line, str)
 
-        fields = source_line.split("\t")
+        fields = source_line.split("\t") if self.has_separate_fields is False else source_line
         self.source_words = fields[0].split()
         self.target_words = fields[1].split()
         if is_flipped is True:
             self.source_words, self.target_words = self.target_words, self.source_words
 
-        alignment = defaultdict(set)
+        alignment = defaultdict(list)
         for a in fields[2].split():
             source_index, target_index = a.split('-', 1)
             source_index, target_index = int(source_index), int(target_index)
             if self.is_flipped is True:
                 source_index, target_index = target_index, source_index
-            alignment[source_index].add(target_index)
+            alignment[source_index].append(target_index)
 
-        # Convert to character alignment (on source side)
-        self.source_characters = []
-        self.alignment = defaultdict(set)
-        for source_index, source_word in enumerate(self.source_words):
-            if source_index > 0:
-                self.source_characters.append(" ")
-            for target_index in alignment[source_index]:
-                for source_character_index in \
-                        range(len(self.source_characters), len(self.source_characters) + len(source_word)):
-                    self.alignment[source_character_index].add(target_index)
-            self.source_characters.extend(source_word)
+        # The links are stored as one link set per source word, in CSR form: the links of set i are
+        #   link_indices[link_offsets[i]:link_offsets[i + 1]], in the order in which they were first given.
+        #   Each character then refers to the link set of its word (or to -1, if there is none).
+        word_links: List[List[int]] = [
+            list(dict.fromkeys(alignment.get(source_index, ()))) for source_index in range(len(self.source_words))
+        ]
+        self.link_offsets: NDArray[int] = concatenate(
+            ([0], cumsum([len(links) for links in word_links], dtype=int64))
+        ).astype(int32)
+        self.link_indices: NDArray[int] = array(
+            [target_index for links in word_links for target_index in links], dtype=int32
+        )
+        self.source_characters = " ".join(self.source_words)
+        word_positions: NDArray[int] = \
+            locate_word_characters(array([len(source_word) for source_word in self.source_words], dtype=int64))
+        # Spaces (at -1) look up the final entry, which is always False.
+        has_links: NDArray[bool] = concatenate((self.link_offsets[1:] > self.link_offsets[:-1], [False]))
+        word_positions[~has_links[word_positions]] = -1
+        self.character_links: NDArray[int] = word_positions
 
     def __str__(self):
         # Convert back to word alignment (on source side)
-        alignment = []
-        source_character_index: int = 0
-        for source_index, source_word in enumerate(self.source_words):
-            if source_index > 0:
-                source_character_index += 1
-            word_alignment = set()
-            for source_span_index in range(source_character_index, source_character_index + len(source_word)):
-                word_alignment |= self.alignment[source_span_index]
-            alignment.extend((source_index, target_index) for target_index in word_alignment)
-            source_character_index += len(source_word)
+        source_indices, target_indices = self.collect_word_alignments()
+        alignment = list(zip(source_indices.tolist(), target_indices.tolist()))
 
-        if self.is_flipped is False:
+        if self.has_separate_fields is True:
+            return " ".join(
+                "%s-%s" % ((source_index, target_index) if self.is_flipped is False else (target_index, source_index))
+                for (source_index, target_index) in alignment
+            )
+        elif self.is_flipped is False:
             return "%s\t%s\t%s" % (
-                "".join(self.source_characters),
+                self.source_characters,
                 " ".join(self.target_words),
                 " ".join("%s-%s" % (source_index, target_index) for (source_index, target_index) in alignment)
             )
         else:
             return "%s\t%s\t%s" % (
                 " ".join(self.target_words),
-                "".join(self.source_characters),
+                self.source_characters,
                 " ".join("%s-%s" % (target_index, source_index) for (source_index, target_index) in alignment)
             )
 
+    # Each word's links are those of its characters, in the order in which they first occur: the characters are read
+    #   left to right, and each one's links in the order in which they were given for its original word.
+    def collect_word_alignments(self) -> Tuple[NDArray[int], NDArray[int]]:
+        word_positions: NDArray[int] = \
+            locate_word_characters(array([len(source_word) for source_word in self.source_words], dtype=int64))
+        word_positions = word_positions[:len(self.character_links)]
+        linked_positions: NDArray[bool] = (word_positions >= 0) & (self.character_links[:len(word_positions)] >= 0)
+        character_words: NDArray[int] = word_positions[linked_positions]
+        character_sets: NDArray[int] = self.character_links[:len(word_positions)][linked_positions]
+        if len(character_words) == 0:
+            return zeros(0, dtype=int32), zeros(0, dtype=int32)
+
+        # Each link set is expanded once for every word whose characters refer to it, in the order of first reference;
+        #   links that the word already has from an earlier set are then dropped.
+        _, first_references = unique(stack((character_words, character_sets), axis=1), axis=0, return_index=True)
+        first_references.sort()
+        reference_words: NDArray[int] = character_words[first_references]
+        reference_sets: NDArray[int] = character_sets[first_references]
+        link_counts: NDArray[int] = self.link_offsets[reference_sets + 1] - self.link_offsets[reference_sets]
+        link_positions: NDArray[int] = arange(link_counts.sum()) + \
+            repeat(self.link_offsets[reference_sets] - (cumsum(link_counts) - link_counts), link_counts)
+        link_words: NDArray[int] = repeat(reference_words, link_counts)
+        link_targets: NDArray[int] = self.link_indices[link_positions]
+        _, first_links = unique(stack((link_words, link_targets), axis=1), axis=0, return_index=True)
+        first_links.sort()
+        return link_words[first_links], link_targets[first_links]
+
     def get_characters(self):
         return self.source_characters
 
-    def project(self, revised_target_line: str, character_alignment: List[Tuple[int, int]]):
-        alignment = defaultdict(set)
-        for source_character_index, target_character_index in character_alignment:
-            alignment[target_character_index] |= self.alignment[source_character_index]
-        self.alignment = alignment
+    def project(self, revised_target_line: str, character_alignment: AlignmentPath):
+        # Since each target character is aligned to at most one source character, it simply takes over its links.
+        target_links: NDArray[int] = full(len(revised_target_line), -1, dtype=int32)
+        target_links[character_alignment.target_indices] = self.character_links[character_alignment.source_indices]
+        self.character_links = target_links
         self.source_characters = revised_target_line
         self.source_words = revised_target_line.split()
@@ -1,8 +1,14 @@
+from io import StringIO
 from typing import Callable, List, Tuple, Union
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
 
+from numpy import array, concatenate, int64, maximum, zeros
+from numpy.typing import NDArray
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
 from utils.modes.alignment import Alignment
+from utils.serialization.xml_writer import write_segmented_xml
 
 
 class XMLAlignment(Alignment):
@@ -10,70 +16,72 @@ class XMLAlignment(Alignment):
         super().__init__()
         self.xml: Element = ElementTree.fromstring(source_line)
         self.segmentation_function: Union[Callable, None] = alignment_kwargs["segmentation_function"]
+        self.index_text()
 
     def __str__(self):
-        if self.segmentation_function is not None:
-            self.postprocess(self.xml)
-        resulting_xml: str = ElementTree.tostring(self.xml, encoding='unicode', method='xml')
-        return resulting_xml
-
-    def get_characters(self):
-        return ElementTree.tostring(self.xml, encoding='unicode', method='text')
-
-    def project(self, revised_target_line: str, character_alignment: List[Tuple[int, int]]):
-        # Inserted characters arbitrarily go to the right, except for appended characters, which go to the left.
-        subsequences: List[str] = []
-        source_index = target_index = 0
-        for alignment_index, alignment in enumerate(character_alignment):
-            while source_index < alignment[0]:
-                subsequences.append('')
-                source_index += 1
-            subsequences.append(revised_target_line[target_index:(alignment[1] + 1)])
-            source_index += 1
-            target_index = alignment[1] + 1
+        if self.segmentation_function is None:
+            return ElementTree.tostring(self.xml, encoding='unicode', method='xml')
 
-        while source_index < len(self.get_characters()):
-            subsequences.append('')
-            source_index += 1
+        # Segmented text is written out as the tree is traversed, without changing the tree itself.
+        output_buffer: StringIO = StringIO()
+        write_segmented_xml(self.xml, output_buffer.write, self.segmentation_function)
+        return output_buffer.getvalue()
 
-        subsequences[-1] += revised_target_line[target_index:]
+    # The document's text is indexed once, in the order that serializing it as text would produce: each nonempty text
+    #   or tail is a segment, recorded with its node, whether it is a tail, and its span in the concatenated text.
+    def index_text(self):
+        text_parts: List[str] = []
+        self.segment_nodes: List[Tuple[Element, bool]] = []
+        segment_ends: List[int] = []
+        text_length: int = 0
 
-        def visit(node: Element, source_text_index: int):
-            node_length: int = len(node.text)
-            node.text = ''.join(subsequences[source_text_index:(source_text_index + node_length)])
-            source_text_index += node_length
+        def visit(node: Element):
+            nonlocal text_length
+            if node.text:
+                text_parts.append(node.text)
+                text_length += len(node.text)
+                self.segment_nodes.append((node, False))
+                segment_ends.append(text_length)
             for child in node:
-                source_text_index = visit(child, source_text_index)
-            if node.tail is not None:
-                tail_length: int = len(node.tail)
-                node.tail = ''.join(subsequences[source_text_index:(source_text_index + tail_length)])
-                source_text_index += tail_length
-            return source_text_index
+                visit(child)
+            if node.tail:
+                text_parts.append(node.tail)
+                text_length += len(node.tail)
+                self.segment_nodes.append((node, True))
+                segment_ends.append(text_length)
+
+        visit(self.xml)
+        self.characters: str = "".join(text_parts)
+        self.segment_ends: NDArray[int] = array(segment_ends, dtype=int64)
+        self.segment_starts: NDArray[int] = concatenate(([0], self.segment_ends[:-1])).astype(int64)
 
-        visit(self.xml, 0)
+    def get_characters(self):
+        return self.characters
 
-    def postprocess(self, current_node: Element, nesting_depth: int = 1, subsequent_children: int = 0):
-        start_tabs: str = "\t" * nesting_depth
-        end_tabs: str = "\t" * (nesting_depth - 1)
-        segmented_node_text: List[str] = self.segmentation_function(current_node.text)
-        current_node.text = "".join([("\n" + start_tabs + segment) for segment in segmented_node_text])
+    def project(self, revised_target_line: str, character_alignment: AlignmentPath):
+        # Inserted characters arbitrarily go to the right, except for appended characters, which go to the left.
+        #   Each source character thus receives the slice of the target ending just after its aligned character
+        #   (or an empty slice, if it is unaligned), and the final source character also receives the remainder.
+        source_length: int = len(self.characters)
+        if source_length == 0:
+            return
 
-        child_count: int = len(current_node)
-        if child_count > 0:
-            current_node.text += "\n" + start_tabs
-            for current_child_count, child in enumerate(current_node, 1):
-                self.postprocess(child, nesting_depth + 1, child_count - current_child_count)
-        else:
-            current_node.text += "\n" + end_tabs
+        target_ends: NDArray[int] = zeros(source_length, dtype=int64)
+        target_ends[character_alignment.source_indices] = character_alignment.target_indices + 1
+        target_ends = maximum.accumulate(target_ends)
+        target_ends[-1] = len(revised_target_line)
 
-        if current_node.tail is not None:
-            if subsequent_children > 0:
-                outside_tabs: str = end_tabs
-            elif subsequent_children == 0:
-                outside_tabs: str = "\t" * max(0, nesting_depth - 2)
+        # The characters of any segment are contiguous, so they map to a contiguous slice of the target,
+        #   which starts where the previous segment's slice ends. (A segment may be empty after an earlier projection.)
+        projected_ends: NDArray[int] = concatenate(([0], target_ends)).astype(int64)[self.segment_ends]
+        projected_starts: NDArray[int] = concatenate(([0], projected_ends[:-1])).astype(int64)
+        for (node, is_tail), target_start, target_end in \
+                zip(self.segment_nodes, projected_starts.tolist(), projected_ends.tolist()):
+            if is_tail is True:
+                node.tail = revised_target_line[target_start:target_end]
             else:
-                raise ValueError(f"The number of subsequent children, <{subsequent_children}>, is invalid.")
+                node.text = revised_target_line[target_start:target_end]
 
-            segmented_tail_text: List[str] = self.segmentation_function(current_node.tail)
-            current_node.tail = "".join([("\n" + end_tabs + segment) for segment in segmented_tail_text])
-            current_node.tail += "\n" + outside_tabs
+        # Since the segments now hold the whole target, in order, the index only needs new spans.
+        self.characters = revised_target_line
+        self.segment_starts, self.segment_ends = projected_starts, projected_ends
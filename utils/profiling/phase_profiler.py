@@ -0,0 +1,98 @@
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from time import perf_counter, process_time
+from typing import Any, Dict, Iterator, List, Union
+
+
+PHASES: List[str] = ["zipping", "parsing", "allocation", "fill", "traceback", "projection", "serialization", "write"]
+# Each of these per-line statistics is summed over the lines of a file (and of the run), where it is present.
+LINE_COUNTERS: List[str] = ["source_length", "target_length", "cells", "edit_cost"]
+
+
+class PhaseProfiler:
+    """ The wall and CPU time spent in each phase of alignment, along with totals of per-line statistics. """
+    def __init__(self):
+        self.phase_times: Dict[str, List[float]] = {}
+        self.nested_times: List[List[float]] = []
+        self.line_totals: Counter = Counter()
+        self.data_types: Counter = Counter()
+
+    # Phases may be nested (e.g., allocation within fill); each phase is only credited with the time that was not
+    #   spent in the phases nested within it, so that the times of all phases add up to the time that was measured.
+    @contextmanager
+    def measure(self, phase_name: str) -> Iterator[None]:
+        self.nested_times.append([0.0, 0.0])
+        start_wall_time: float = perf_counter()
+        start_cpu_time: float = process_time()
+        try:
+            yield
+        finally:
+            wall_time: float = perf_counter() - start_wall_time
+            cpu_time: float = process_time() - start_cpu_time
+            nested_wall_time, nested_cpu_time = self.nested_times.pop()
+            phase_totals: List[float] = self.phase_times.setdefault(phase_name, [0.0, 0.0, 0])
+            phase_totals[0] += wall_time - nested_wall_time
+            phase_totals[1] += cpu_time - nested_cpu_time
+            phase_totals[2] += 1
+            if len(self.nested_times) > 0:
+                self.nested_times[-1][0] += wall_time
+                self.nested_times[-1][1] += cpu_time
+
+    def record_line(self, line_statistics: Dict[str, Any]):
+        self.line_totals["lines"] += 1
+        for counter_name in LINE_COUNTERS:
+            if counter_name in line_statistics:
+                self.line_totals[counter_name] += line_statistics[counter_name]
+        if "data_type" in line_statistics:
+            self.data_types[line_statistics["data_type"]] += 1
+
+    def merge(self, profile: Dict[str, Any]):
+        for phase_name, phase_report in profile["phases"].items():
+            phase_totals: List[float] = self.phase_times.setdefault(phase_name, [0.0, 0.0, 0])
+            phase_totals[0] += phase_report["wall_seconds"]
+            phase_totals[1] += phase_report["cpu_seconds"]
+            phase_totals[2] += phase_report["calls"]
+        self.line_totals.update(profile["lines"])
+        self.data_types.update(profile["data_types"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered_phases: List[str] = [phase_name for phase_name in PHASES if phase_name in self.phase_times] + \
+            sorted(phase_name for phase_name in self.phase_times if phase_name not in PHASES)
+        return {
+            "phases": {
+                phase_name: {
+                    "wall_seconds": round(self.phase_times[phase_name][0], 6),
+                    "cpu_seconds": round(self.phase_times[phase_name][1], 6),
+                    "calls": self.phase_times[phase_name][2]
+                }
+                for phase_name in ordered_phases
+            },
+            "lines": dict(self.line_totals),
+            "data_types": dict(self.data_types)
+        }
+
+
+# The engines record their phases with whichever profiler is active in the current process (if any),
+#   so that profiling needs no changes to their signatures and costs next to nothing when it is off.
+ACTIVE_PROFILER: Union[PhaseProfiler, None] = None
+
+
+def activate_profiler(profiler: Union[PhaseProfiler, None]) -> Union[PhaseProfiler, None]:
+    global ACTIVE_PROFILER
+    previous_profiler: Union[PhaseProfiler, None] = ACTIVE_PROFILER
+    ACTIVE_PROFILER = profiler
+    return previous_profiler
+
+
+def measure_phase(phase_name: str, profiler: Union[PhaseProfiler, None] = None) -> AbstractContextManager:
+    profiler = profiler if profiler is not None else ACTIVE_PROFILER
+    return profiler.measure(phase_name) if profiler is not None else nullcontext()
+
+
+def measure_iteration(iterator: Iterator, phase_name: str, profiler: Union[PhaseProfiler, None] = None) -> Iterator:
+    while True:
+        with measure_phase(phase_name, profiler):
+            item: Any = next(iterator, StopIteration)
+        if item is StopIteration:
+            return
+        yield item
@@ -1,5 +1,5 @@
 from functools import partial
-from re import split
+from re import Pattern, compile
 from string import punctuation
 from typing import Callable, Dict, List
 
@@ -11,21 +11,30 @@ def identity_segmentation(string: str) -> List[str]:
     return [string]
 
 
-def segment_by_characters(string: str, characters: List[str]) -> List[str]:
+# Text is split after each dividing character that is followed by whitespace (which stays with its segment).
+def compile_segmentation_regex(characters: List[str]) -> Pattern:
     if len(characters) == 0:
         raise ValueError("No characters provided.")
-    else:
-        segmentation_regex: str = f"([^{''.join(characters)}]+[{''.join(characters)}][\s]+)"
-        segments: List[str] = split(segmentation_regex, string)
-        segments = [segment for segment in segments if segment != '']
+    return compile(rf"([^{''.join(characters)}]+[{''.join(characters)}][\s]+)")
+
+
+def segment_by_regex(string: str, segmentation_regex: Pattern) -> List[str]:
+    return [segment for segment in segmentation_regex.split(string) if segment != '']
 
-    return segments
+
+def segment_by_characters(string: str, characters: List[str]) -> List[str]:
+    return segment_by_regex(string, compile_segmentation_regex(characters))
 
 
+# The built-in segmenters compile their regexes once, rather than on every call.
 SEGMENTATION_FUNCTIONS: Dict[str, Callable] = {
-    "dividing-punctuation": partial(segment_by_characters, characters=DIVIDING_PUNCTUATION),
+    "dividing-punctuation": partial(
+        segment_by_regex, segmentation_regex=compile_segmentation_regex(DIVIDING_PUNCTUATION)
+    ),
     "identity": identity_segmentation,
-    "punctuation": partial(segment_by_characters, characters=[character for character in punctuation])
+    "punctuation": partial(
+        segment_by_regex, segmentation_regex=compile_segmentation_regex([character for character in punctuation])
+    )
 }
 
 
@@ -0,0 +1,153 @@
+from operator import sub
+from typing import Dict, List, Tuple
+
+from utils.algorithms.data_structures.node import Node
+
+
+# Where the line joining a node to its children meets the node itself, each of these characters takes the place of
+#   the one before it.
+EDGE_JUNCTIONS: Dict[str, str] = {'─': '┴', '┬': '┼', '┌': '├', '┐': '┤'}
+
+
+class SubtreeLayout:
+    """ Where a printed subtree's label, edge, and children go, and which columns each of its rows spans. """
+    # Treebanks may hold a great many nodes; each layout is kept to as few objects as possible, since it is
+    #   allocating them that printing a large tree mostly comes down to.
+    __slots__ = (
+        "label", "children", "column", "root", "width", "lefts", "rights", "label_column", "edge_column", "edge"
+    )
+
+    def __init__(self, label: str, children: Tuple["SubtreeLayout", ...]):
+        self.label: str = label
+        self.children: Tuple[SubtreeLayout, ...] = children
+        # The subtree's left edge and the column its parent's edge meets it at, relative to its parent's left edge.
+        self.column: int = 0
+        self.root: int = 0
+        self.width: int = 0
+        # Each row's first and last column (exclusive), relative to the subtree's left edge, from the top down.
+        self.lefts: List[int] = []
+        self.rights: List[int] = []
+        self.label_column: int = 0
+        self.edge_column: int = 0
+        self.edge: str = ""
+
+    # Each child's subtree is placed as close to its left sibling's as it can be while leaving a space on every row
+    #   that both span; the layout of each only depends on the rows' extents, which are updated in place.
+    def place_children(self):
+        # The first child (often the only one) simply starts at the left edge, taking its rows as they are.
+        first_child: SubtreeLayout = self.children[0]
+        lefts, rights = first_child.lefts, first_child.rights
+        self.lefts, self.rights, self.width = lefts, rights, first_child.width
+        for child_index in range(1, len(self.children)):
+            child: SubtreeLayout = self.children[child_index]
+            child_lefts, child_rights = child.lefts, child.rights
+            if self.width > 0:
+                # Only the rows that both span constrain the column; map() stops at the end of the shorter of the two.
+                min_space: int = self.width + min(map(sub, child_lefts, rights))
+                child.column = self.width + max(-1, 1 - min_space)
+
+            shared_rows: int = min(len(lefts), len(child_lefts))
+            if child.column == 0:
+                rights[:shared_rows] = child_rights[:shared_rows]
+                lefts.extend(child_lefts[shared_rows:])
+                rights.extend(child_rights[shared_rows:])
+            else:
+                rights[:shared_rows] = [child.column + right for right in child_rights[:shared_rows]]
+                lefts.extend([child.column + left for left in child_lefts[shared_rows:]])
+                rights.extend([child.column + right for right in child_rights[shared_rows:]])
+            self.width = max(self.width, child.column + child.width)
+
+    # The label is centered over its children's roots (and shifts them to the right if it would otherwise stick out
+    #   on the left); below it, the edge joins it to each of them.
+    def place_root(self):
+        label_length: int = len(self.label)
+        if len(self.children) == 0:
+            self.root = label_length // 2
+            self.lefts, self.rights = [0], [label_length]
+            self.width = label_length
+            return
+
+        first_root: int = self.children[0].column + self.children[0].root
+        last_root: int = self.children[-1].column + self.children[-1].root
+        new_root: int = (first_root + last_root) // 2
+        self.label_column = new_root - (label_length - 1) // 2
+        if self.label_column < 0:
+            shift: int = -self.label_column
+            self.label_column = 0
+            self.lefts = [left + shift for left in self.lefts]
+            self.rights = [right + shift for right in self.rights]
+            for child in self.children:
+                child.column += shift
+            first_root += shift
+            new_root += shift
+            last_root += shift
+            self.width += shift
+
+        self.edge_column = first_root
+        if len(self.children) == 1:
+            self.root = first_root
+            self.edge = '│'
+        else:
+            edge_characters: List[str] = ['─'] * (last_root - first_root + 1)
+            edge_characters[0] = '┌'
+            for child_index in range(1, len(self.children) - 1):
+                child: SubtreeLayout = self.children[child_index]
+                edge_characters[child.column + child.root - first_root] = '┬'
+            edge_characters[-1] = '┐'
+            # The junction with the label lies under its center, which the edge always spans.
+            junction: int = min(max(new_root - first_root, 0), len(edge_characters) - 1)
+            edge_characters[junction] = EDGE_JUNCTIONS[edge_characters[junction]]
+            self.root = new_root
+            self.edge = "".join(edge_characters)
+
+        self.lefts[0:0] = [self.label_column, self.edge_column]
+        self.rights[0:0] = [self.label_column + label_length, self.edge_column + len(self.edge)]
+        self.width = max(self.width, self.label_column + label_length, self.edge_column + len(self.edge))
+
+
+# The layout is computed bottom-up, in a single pass; each subtree's position is only fixed relative to its parent's.
+def lay_out_tree(root: Node) -> SubtreeLayout:
+    completed_layouts: List[SubtreeLayout] = []
+    for node in root.bottom_up():
+        child_count: int = len(node.children)
+        if child_count > 0:
+            layout: SubtreeLayout = SubtreeLayout(node.label, tuple(completed_layouts[-child_count:]))
+            del completed_layouts[-child_count:]
+            layout.place_children()
+        else:
+            layout = SubtreeLayout(node.label, ())
+        layout.place_root()
+        completed_layouts.append(layout)
+    return completed_layouts[0]
+
+
+# Each row is assembled once, from the pieces that fall on it; within a row, the pieces are visited left to right.
+def render_layout(root_layout: SubtreeLayout) -> str:
+    row_columns: List[List[int]] = [[] for _ in range(len(root_layout.lefts))]
+    row_pieces: List[List[str]] = [[] for _ in range(len(root_layout.lefts))]
+    pending_layouts: List[Tuple[SubtreeLayout, int, int]] = [(root_layout, 0, 0)]
+    while len(pending_layouts) > 0:
+        layout, column, row = pending_layouts.pop()
+        row_columns[row].append(column + layout.label_column)
+        row_pieces[row].append(layout.label)
+        if len(layout.children) > 0:
+            row_columns[row + 1].append(column + layout.edge_column)
+            row_pieces[row + 1].append(layout.edge)
+            for child_index in range(len(layout.children) - 1, -1, -1):
+                child: SubtreeLayout = layout.children[child_index]
+                pending_layouts.append((child, column + child.column, row + 2))
+
+    lines: List[str] = []
+    for columns, pieces in zip(row_columns, row_pieces):
+        line_pieces: List[str] = []
+        line_end: int = 0
+        for piece_column, piece in zip(columns, pieces):
+            line_pieces.append(" " * (piece_column - line_end))
+            line_pieces.append(piece)
+            line_end = piece_column + len(piece)
+        lines.append("".join(line_pieces))
+    return "\n".join(lines)
+
+
+def format_tree(root: Node) -> str:
+    return render_layout(lay_out_tree(root))
@@ -0,0 +1,57 @@
+from typing import Any, Callable, Dict, List, Union
+from xml.etree.ElementTree import Element, _escape_attrib, _escape_cdata, _namespaces
+
+
+# ElementTree's own escaping and namespace prefixes are used, so that the output is exactly what ElementTree.tostring
+#   would give for the same tree, after its text had been segmented and indented.
+def format_segmented_text(text: Union[str, None], segmentation_function: Callable, segment_tabs: str,
+                          closing_tabs: str) -> str:
+    segments: List[str] = segmentation_function(text if text is not None else "")
+    return "".join([f"\n{segment_tabs}{segment}" for segment in segments] + [f"\n{closing_tabs}"])
+
+
+def write_start_tag(node: Element, write: Callable[[str], Any], qnames: Dict[str, str],
+                    namespaces: Union[Dict[str, str], None] = None):
+    write(f"<{qnames.get(node.tag, node.tag)}")
+    if namespaces is not None:
+        for namespace_uri, prefix in sorted(namespaces.items(), key=lambda namespace: namespace[1]):
+            write(f' xmlns{":" + prefix if prefix else ""}="{_escape_attrib(namespace_uri)}"')
+    for attribute_name, attribute_value in node.items():
+        write(f' {qnames.get(attribute_name, attribute_name)}="{_escape_attrib(attribute_value)}"')
+    write(">")
+
+
+# Each node's text is divided into segments, each on its own line and indented one tab deeper than the node;
+#   the node's tail is indented at the node's own depth, and followed by the indentation of whatever comes next.
+def write_segmented_element(node: Element, write: Callable[[str], Any], segmentation_function: Callable,
+                            qnames: Dict[str, str], namespaces: Union[Dict[str, str], None] = None,
+                            nesting_depth: int = 1, subsequent_children: int = 0):
+    start_tabs: str = "\t" * nesting_depth
+    end_tabs: str = "\t" * (nesting_depth - 1)
+    child_count: int = len(node)
+    write_start_tag(node, write, qnames, namespaces)
+    write(_escape_cdata(
+        format_segmented_text(node.text, segmentation_function, start_tabs, start_tabs if child_count > 0 else end_tabs)
+    ))
+    for current_child_count, child in enumerate(node, 1):
+        write_segmented_element(
+            child, write, segmentation_function, qnames, None, nesting_depth + 1, child_count - current_child_count
+        )
+    write(f"</{qnames.get(node.tag, node.tag)}>")
+
+    if node.tail is not None:
+        outside_tabs: str = end_tabs if subsequent_children > 0 else "\t" * max(0, nesting_depth - 2)
+        write(_escape_cdata(format_segmented_text(node.tail, segmentation_function, end_tabs, outside_tabs)))
+
+
+def write_segmented_xml(root: Element, write: Callable[[str], Any], segmentation_function: Callable):
+    qnames, namespaces = _namespaces(root)
+    write_segmented_element(root, write, segmentation_function, qnames, namespaces)
+
+
+# A streamed document is written a piece at a time: its root's start tag and text (whose indentation depends on whether
+#   any children follow), then each child of the root as it is completed, and finally the root's end tag.
+def write_segmented_root_start(root: Element, write: Callable[[str], Any], segmentation_function: Callable,
+                               has_children: bool):
+    write_start_tag(root, write, {})
+    write(_escape_cdata(format_segmented_text(root.text, segmentation_function, "\t", "\t" if has_children else "")))
@@ -0,0 +1,308 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, TextIO, Tuple, Union
+from xml.etree import ElementTree
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from numpy import int32, searchsorted, zeros
+
+from utils.algorithms.data_structures.alignment_path import AlignmentPath
+from utils.algorithms.fast_paths import align_with_fast_paths
+from utils.algorithms.windowed_alignment import DEFAULT_WINDOW_LENGTH, MAX_WINDOW_DOUBLINGS, find_window_seam
+from utils.profiling.phase_profiler import measure_phase
+from utils.serialization.xml_writer import write_segmented_element, write_segmented_root_start
+from utils.zipping.interface import iterate_normalized_blocks, iterate_token_blocks
+
+
+# Streamed inputs are read in smaller blocks than whole files are, since each block of the source is parsed into
+#   elements (which take up much more memory than its text) before any of it can be aligned.
+STREAM_BLOCK_SIZE: int = 1 << 16
+
+
+class StreamingXMLSource:
+    """ An XML document that is parsed one block at a time, whose text becomes available as soon as it is complete. """
+    def __init__(self, source_file: TextIO):
+        self.blocks: Iterator[str] = iterate_normalized_blocks(source_file, STREAM_BLOCK_SIZE)
+        self.parser: XMLPullParser = XMLPullParser(events=("start", "end"))
+        self.root: Union[Element, None] = None
+        self.is_exhausted: bool = False
+
+        # The text or tail that is still being parsed; it is complete as soon as the parser reports its next event.
+        self.open_slot: Union[Tuple[Element, bool], None] = None
+        self.depth: int = 0
+        # The text that has not been aligned yet, starting at text_offset within the document's text.
+        self.text: str = ""
+        self.text_offset: int = 0
+        # Each nonempty text or tail (with its node and whether it is a tail), along with the end of its span;
+        #   as in XMLAlignment, the spans are contiguous and in document order.
+        self.segments: Deque[Tuple[Element, bool, int]] = deque()
+        # The pieces of the output (the root's start tag, each of its children, and its end tag), along with the end of
+        #   the text that must be projected before they can be written and whether another child follows them.
+        self.output_items: Deque[Tuple[str, Element, int, bool]] = deque()
+
+    @property
+    def text_end(self) -> int:
+        return self.text_offset + len(self.text)
+
+    def close_slot(self, is_followed_by_child: bool):
+        if self.open_slot is None:
+            return
+        node, is_tail = self.open_slot
+        slot_text: Union[str, None] = node.tail if is_tail is True else node.text
+        if slot_text:
+            self.text += slot_text
+            self.segments.append((node, is_tail, self.text_end))
+        # The root's start tag is ready once its text is, and any of its children is once that child's tail is.
+        if node is self.root:
+            self.output_items.append(("open", node, self.text_end, is_followed_by_child))
+        elif is_tail is True and self.depth == 1:
+            self.output_items.append(("child", node, self.text_end, is_followed_by_child))
+        self.open_slot = None
+
+    def read(self) -> bool:
+        with measure_phase("zipping"):
+            block: Union[str, None] = next(self.blocks, None)
+        if block is None:
+            self.parser.close()
+            return False
+
+        with measure_phase("parsing"):
+            self.parser.feed(block)
+            for event, node in self.parser.read_events():
+                self.close_slot(event == "start")
+                if event == "start":
+                    if node.tag[:1] == "{" or any(attribute[:1] == "{" for attribute in node.attrib):
+                        raise ValueError(f"The namespaced element <{node.tag}> cannot be streamed.")
+                    if self.root is None:
+                        self.root = node
+                    self.depth += 1
+                    self.open_slot = (node, False)
+                elif node is self.root:
+                    self.output_items.append(("close", node, self.text_end, False))
+                    self.depth -= 1
+                    self.is_exhausted = True
+                else:
+                    self.depth -= 1
+                    self.open_slot = (node, True)
+        return True
+
+    def fill(self, text_end: int):
+        while self.text_end < text_end and self.is_exhausted is False:
+            if self.read() is False:
+                raise ValueError("The streamed source ended before its root element was closed.")
+
+    def trim(self, text_start: int):
+        self.text = self.text[(text_start - self.text_offset):]
+        self.text_offset = text_start
+
+
+class StreamingTarget:
+    """ A target whose normalized text is read one block at a time. """
+    def __init__(self, target_file: TextIO):
+        self.blocks: Iterator[str] = iterate_token_blocks(target_file, STREAM_BLOCK_SIZE)
+        self.is_exhausted: bool = False
+        self.text: str = ""
+        self.text_offset: int = 0
+
+    @property
+    def text_end(self) -> int:
+        return self.text_offset + len(self.text)
+
+    def fill(self, text_end: Union[int, None] = None):
+        while (text_end is None or self.text_end < text_end) and self.is_exhausted is False:
+            with measure_phase("zipping"):
+                block: Union[str, None] = next(self.blocks, None)
+            if block is None:
+                self.is_exhausted = True
+            else:
+                self.text += block
+
+    def trim(self, text_start: int):
+        self.text = self.text[(text_start - self.text_offset):]
+        self.text_offset = text_start
+
+
+class StreamingXMLProjector:
+    """ Projects a streamed XML document onto a streamed target, writing out each piece of it once it is projected. """
+    def __init__(self, source: StreamingXMLSource, target: StreamingTarget, output_file: TextIO,
+                 segmentation_function: Union[Callable, None] = None):
+        self.source: StreamingXMLSource = source
+        self.target: StreamingTarget = target
+        self.output_file: TextIO = output_file
+        self.segmentation_function: Union[Callable, None] = segmentation_function
+        # Everything before these offsets (in the source's and target's text) has already been projected.
+        self.projected_source_end: int = 0
+        self.projected_target_end: int = 0
+        # The end of the target slice that a source character receives when it is not aligned to anything.
+        self.settled_target_end: int = 0
+
+    # As in XMLAlignment.project, a segment's slice of the target ends just after the last target character aligned
+    #   within it (or where the previous segment's slice ended), and the final segment also receives the rest
+    #   of the target. Only the segments ending at or before settled_end are projected, since the alignment of later
+    #   characters may still change; the path is given relative to the two offsets.
+    def settle(self, window_path: AlignmentPath, source_offset: int, target_offset: int, settled_end: int,
+               is_final: bool):
+        with measure_phase("projection"):
+            while len(self.source.segments) > 0:
+                node, is_tail, segment_end = self.source.segments[0]
+                is_last_segment: bool = self.source.is_exhausted is True and segment_end == self.source.text_end
+                if segment_end > settled_end or (is_last_segment is True and is_final is False):
+                    break
+
+                aligned_count: int = \
+                    searchsorted(window_path.source_indices, segment_end - 1 - source_offset, side="right").item()
+                segment_target_end: int = self.settled_target_end
+                if aligned_count > 0:
+                    segment_target_end = max(
+                        segment_target_end, target_offset + window_path.target_indices[aligned_count - 1].item() + 1
+                    )
+                if is_last_segment is True:
+                    segment_target_end = self.target.text_end
+
+                projected_text: str = self.target.text[
+                    (self.projected_target_end - self.target.text_offset):
+                    (segment_target_end - self.target.text_offset)
+                ]
+                if is_tail is True:
+                    node.tail = projected_text
+                else:
+                    node.text = projected_text
+                self.source.segments.popleft()
+                self.projected_source_end = segment_end
+                self.projected_target_end = segment_target_end
+
+            if len(window_path) > 0:
+                self.settled_target_end = max(
+                    self.settled_target_end, target_offset + window_path.target_indices[-1].item() + 1
+                )
+        self.write_ready_items()
+
+    # Each child of the root is written (and dropped from the tree) as soon as all of its text has been projected,
+    #   so that only the children still being aligned are kept in memory.
+    def write_ready_items(self):
+        while len(self.source.output_items) > 0:
+            item_kind, node, item_end, is_followed_by_child = self.source.output_items[0]
+            if item_end > self.projected_source_end:
+                break
+
+            self.source.output_items.popleft()
+            if self.segmentation_function is not None:
+                # Segmented text is written out directly, as each piece is traversed.
+                with measure_phase("serialization"):
+                    if item_kind == "open":
+                        write_segmented_root_start(
+                            node, self.output_file.write, self.segmentation_function, is_followed_by_child
+                        )
+                    elif item_kind == "close":
+                        self.output_file.write(f"</{node.tag}>")
+                    else:
+                        write_segmented_element(
+                            node, self.output_file.write, self.segmentation_function, {}, None, 2,
+                            1 if is_followed_by_child is True else 0
+                        )
+            else:
+                with measure_phase("serialization"):
+                    if item_kind == "open" and len(node) == 0 and not node.text:
+                        # A root without any (projected) text or children is written as an empty element. Its text
+                        #   was only complete once the root ended, so its end tag is next, and is dropped.
+                        self.source.output_items.popleft()
+                        item_text: str = ElementTree.tostring(node, encoding="unicode", method="xml")
+                    elif item_kind == "open":
+                        # The root's start tag and text are written on their own; its children and end tag follow.
+                        root_shell: Element = Element(node.tag, node.attrib)
+                        root_shell.text = node.text
+                        item_text = ElementTree.tostring(root_shell, encoding="unicode", short_empty_elements=False)
+                        item_text = item_text[:-len(f"</{node.tag}>")]
+                    elif item_kind == "close":
+                        item_text = f"</{node.tag}>"
+                    else:
+                        item_text = ElementTree.tostring(node, encoding="unicode", method="xml")
+                with measure_phase("write"):
+                    self.output_file.write(item_text)
+
+            if item_kind == "child":
+                self.source.root.remove(node)
+
+
+# The document is aligned window by window, as in the windowed engine: each window's path is kept up to a seam
+#   in its first half (or in full, at a forced seam), the segments that end before the seam are projected, and the
+#   next window starts right after it.
+#   Only the current window, the text of the segments and children that are still pending, and one block of either
+#   input are kept in memory, however long the document is; the alignment may thus differ from that of the whole
+#   document (as with the windowed engine), but the tags and the target's text are preserved exactly.
+def project_xml_stream(source_file: TextIO, target_file: TextIO, output_file: TextIO, cost: Callable,
+                       get_data_type: Callable, engine: Callable, window_length: int = DEFAULT_WINDOW_LENGTH,
+                       segmentation_function: Union[Callable, None] = None,
+                       statistics: Union[Dict[str, Any], None] = None):
+    if window_length < 2:
+        raise ValueError(f"The window length <{window_length}> is too small; it should be at least 2.")
+
+    source: StreamingXMLSource = StreamingXMLSource(source_file)
+    target: StreamingTarget = StreamingTarget(target_file)
+    projector: StreamingXMLProjector = StreamingXMLProjector(source, target, output_file, segmentation_function)
+    source_start: int = 0
+    target_start: int = 0
+    current_length: int = window_length
+    window_count: int = 0
+    forced_seams: int = 0
+    final_path: AlignmentPath = AlignmentPath(zeros(0, dtype=int32), zeros(0, dtype=int32))
+    while True:
+        # One more character than the window needs is read, so that a window reaching the end of either text is known
+        #   to do so (and to be final, for both).
+        source.fill(source_start + current_length + 1)
+        target.fill(target_start + current_length + 1)
+        source_end: int = min(source.text_end, source_start + current_length)
+        target_end: int = min(target.text_end, target_start + current_length)
+        if source_start == source_end or target_start == target_end:
+            break
+
+        source_window: str = source.text[(source_start - source.text_offset):(source_end - source.text_offset)]
+        target_window: str = target.text[(target_start - target.text_offset):(target_end - target.text_offset)]
+        with measure_phase("fill"):
+            window_path: AlignmentPath = align_with_fast_paths(
+                source_window, target_window, cost, get_data_type(source_window, target_window), engine
+            )
+        window_count += 1
+
+        if source.is_exhausted is True and source_end == source.text_end and \
+                target.is_exhausted is True and target_end == target.text_end:
+            final_path = window_path
+            break
+
+        seam_index: int = find_window_seam(source_window, target_window, window_path, current_length // 2)
+        if seam_index < 0 and current_length < window_length << MAX_WINDOW_DOUBLINGS:
+            current_length *= 2
+            continue
+        elif seam_index < 0:
+            projector.settle(window_path, source_start, target_start, source_end, False)
+            forced_seams += 1
+            source_start, target_start = source_end, target_end
+            source.trim(source_start)
+            target.trim(projector.projected_target_end)
+            current_length = window_length
+            continue
+
+        kept_path: AlignmentPath = AlignmentPath(
+            window_path.source_indices[:(seam_index + 1)], window_path.target_indices[:(seam_index + 1)]
+        )
+        seam_source: int = source_start + window_path.source_indices[seam_index].item()
+        projector.settle(kept_path, source_start, target_start, seam_source + 1, False)
+        source_start = seam_source + 1
+        target_start += window_path.target_indices[seam_index].item() + 1
+        source.trim(source_start)
+        target.trim(projector.projected_target_end)
+        current_length = window_length
+
+    # Once the target runs out, the rest of the source receives nothing but the rest of the target, which goes to
+    #   the final segment; the former is projected as it is read, whereas the latter is read in full.
+    while source.is_exhausted is False:
+        source.fill(source.text_end + 1)
+        projector.settle(final_path, source_start, target_start, source.text_end, False)
+        source.trim(source.text_end)
+    target.fill()
+    projector.settle(final_path, source_start, target_start, source.text_end, True)
+
+    if statistics is not None:
+        statistics["source_length"] = source.text_end
+        statistics["target_length"] = target.text_end
+        statistics["window_count"] = window_count
+        statistics["forced_seams"] = forced_seams
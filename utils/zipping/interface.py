@@ -1,32 +1,84 @@
+from itertools import zip_longest
 from re import sub
-from typing import Callable, Dict, List, TextIO, Tuple
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
 
 
 EXTENDED_WHITESPACE_REGEX: str = "[\r\n\t]+"
 WHITESPACE_REDUCTION_REGEX: str = r"[\s]{2,}"
 
 
-def zip_by_file(first_file: TextIO, second_file: TextIO) -> List[Tuple[str, str]]:
-    zipped_content: List[Tuple[str, str]] = []
-    first_lines: List[str] = first_file.readlines()
-    second_lines: List[str] = second_file.readlines()
+# Files are read in blocks of this many characters rather than all at once.
+READ_BLOCK_SIZE: int = 1 << 20
 
-    first_full_text: str = "".join(first_lines)
-    second_full_text: str = "".join(second_lines)
 
+def normalize_whitespace(text: str) -> str:
     # We remove all non-space whitespace.
-    first_full_text = sub(EXTENDED_WHITESPACE_REGEX, " ", first_full_text)
-    second_full_text = sub(EXTENDED_WHITESPACE_REGEX, " ", second_full_text)
+    text = sub(EXTENDED_WHITESPACE_REGEX, " ", text)
 
     # We then resolve the fact that additional spaces between tokens may have been added due to this,
     #   removing them such that at most one space exists between adjacent tokens.
-    first_full_text = sub(WHITESPACE_REDUCTION_REGEX, " ", first_full_text)
-    second_full_text = sub(WHITESPACE_REDUCTION_REGEX, " ", second_full_text)
+    text = sub(WHITESPACE_REDUCTION_REGEX, " ", text)
+    return text
+
+
+# Whitespace is normalized one block at a time as the file is read. Since a run of whitespace may continue
+#   into the next block, each block's trailing whitespace is held back and normalized along with that block.
+def iterate_normalized_blocks(file: TextIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    held_text: str = ""
+    while True:
+        block: str = file.read(block_size)
+        if len(block) == 0:
+            yield normalize_whitespace(held_text)
+            break
+
+        current_text: str = held_text + block
+        content_length: int = len(current_text.rstrip())
+        yield normalize_whitespace(current_text[:content_length])
+        held_text = current_text[content_length:]
+
+
+def read_normalized_text(file: TextIO) -> str:
+    return "".join(iterate_normalized_blocks(file))
+
 
-    zipped_content.append((first_full_text, second_full_text))
+# The blocks join up to the file's tokens separated by single spaces, just as " ".join(text.split()) would give.
+#   Since a token may continue into the next block, each block's last token is held back unless whitespace follows it.
+def iterate_token_blocks(file: TextIO, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    held_token: str = ""
+    separator: str = ""
+    while True:
+        block: str = file.read(block_size)
+        if len(block) == 0:
+            if len(held_token) > 0:
+                yield separator + held_token
+            break
+
+        current_text: str = held_token + block
+        tokens: List[str] = current_text.split()
+        held_token = tokens.pop() if len(tokens) > 0 and not current_text[-1].isspace() else ""
+        if len(tokens) > 0:
+            yield separator + " ".join(tokens)
+            separator = " "
+
+
+# Each file is read and normalized one block at a time, but the result is still a single pair of whole documents,
+#   which are held in memory and aligned as one; see utils.streaming for documents too long for that.
+def zip_by_file(first_file: TextIO, second_file: TextIO) -> List[Tuple[str, str]]:
+    zipped_content: List[Tuple[str, str]] = [(read_normalized_text(first_file), read_normalized_text(second_file))]
     return zipped_content
 
 
+# Word alignments may also come as three separate streams, as aligners such as fast_align write them: one side's text,
+#   the other side's text, and the links between them (in Pharaoh format), each with one sentence per line.
+#   These are read in lockstep and never joined together; each line yields its three fields.
+def zip_word_streams(source_file: TextIO, other_file: TextIO, links_file: TextIO) -> Iterator[Tuple[str, str, str]]:
+    for line_index, (source_line, other_line, links_line) in \
+            enumerate(zip_longest(source_file, other_file, links_file)):
+        if source_line is None or other_line is None or links_line is None:
+            raise ValueError(f"The word alignment streams differ in length as of line <{line_index}>.")
+        yield source_line.rstrip("\r\n"), other_line.rstrip("\r\n"), links_line.rstrip("\r\n")
+
+
 ZIPPERS: Dict[str, Callable] = {
     "file": zip_by_file,
     "line": zip